@@ -0,0 +1,145 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Dict, Optional
+import openai
+import time
+from agents import Agent, RunConfig, RunHooks, Runner
+from agents.usage import Usage
+from openai.types.responses import ResponseTextDeltaEvent
+from national_agentic_ai_hackathon_2025_backend.context.global_context import GlobalContext
+from national_agentic_ai_hackathon_2025_backend.utils.metrics import Metrics
+from national_agentic_ai_hackathon_2025_backend.utils.tracing import Tracer
+from national_agentic_ai_hackathon_2025_backend.utils.deadline import Deadline, DeadlineExceeded
+from national_agentic_ai_hackathon_2025_backend.utils.circuit_breaker import CircuitBreaker
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.model_policy import ModelPolicy
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.model_fixtures import FixtureModelProvider
+from national_agentic_ai_hackathon_2025_backend._debug import Logger
+
+
+def _is_openai_failure(error: BaseException) -> bool:
+    # Connection errors, timeouts, 5xx and rate limits; bad requests and model output errors don't count
+    return isinstance(error, (openai.APIConnectionError, openai.InternalServerError, openai.RateLimitError))
+
+
+def openai_breaker() -> CircuitBreaker:
+    """The breaker every agent run goes through."""
+    return CircuitBreaker.get("openai", is_failure=_is_openai_failure)
+
+
+_usage_sink: ContextVar[Optional[Usage]] = ContextVar("usage_sink", default=None)
+
+
+@contextmanager
+def collect_usage(usage: Optional[Usage] = None):
+    """
+    Add the usage of every model call that finishes inside the block (and in
+    tasks started from it) to ``usage`` (a new Usage if not given). Counted
+    per call, so a run cancelled part-way still reports its finished turns.
+    """
+    usage = usage if usage is not None else Usage()
+    token = _usage_sink.set(usage)
+    try:
+        yield usage
+    finally:
+        _usage_sink.reset(token)
+
+
+class _UsageHooks(RunHooks):
+    async def on_llm_end(self, context, agent, response) -> None:
+        sink = _usage_sink.get()
+        if sink is not None and response.usage is not None:
+            sink.add(response.usage)
+
+
+_usage_hooks = _UsageHooks()
+
+
+class BaseAgent(Agent[GlobalContext]):
+    """
+    Common run plumbing for workflow agents.
+
+    Agents are built once per process (see ``AgentRegistry``) and must not hold
+    per-request state: the request's GlobalContext is only passed to ``Runner.run``.
+    """
+    metrics_key: str = "agent"
+    fallback_response: str = "Sorry, I am unable to process your request at the moment."
+
+    def _run_config(self):
+        """(tier, RunConfig) chosen by ModelPolicy for this run; (None, None) keeps the default model."""
+        tier, reason, model = ModelPolicy.select(self.metrics_key)
+        if tier is None:
+            return None, None
+        Metrics.increment(f"model.{tier}.runs")
+        Metrics.increment(f"model.{tier}.{reason}")
+        Tracer.annotate(model_tier=tier, model_reason=reason, model=model or "default")
+        provider = FixtureModelProvider.get()
+        if provider is not None:
+            # Keep the tier choice but serve it from the fixture file
+            return tier, RunConfig(model=provider.model_for(self.metrics_key, model))
+        return tier, RunConfig(model=model) if model else None
+
+    def _record_tier(self, tier, usage, seconds: float) -> None:
+        if tier is not None:
+            Metrics.record_usage(f"model.{tier}", usage)
+            Metrics.observe(f"model.{tier}", seconds)
+
+    async def _run(self, raw_message: str, context: GlobalContext):
+        with Tracer.span(self.metrics_key, agent=self.name), openai_breaker().guard():
+            tier, run_config = self._run_config()
+            start = time.perf_counter()
+            result = await Deadline.wait_for(
+                Runner.run(self, raw_message, context=context, run_config=run_config, hooks=_usage_hooks), stage=self.metrics_key
+            )
+            usage = result.context_wrapper.usage
+            Metrics.record_usage(self.metrics_key, usage)
+            self._record_tier(tier, usage, time.perf_counter() - start)
+            Tracer.annotate(requests=usage.requests, input_tokens=usage.input_tokens, output_tokens=usage.output_tokens)
+            return result.final_output
+
+    async def stream(self, raw_message: str, context: GlobalContext) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run the agent with ``Runner.run_streamed`` and yield stream events:
+        ``token`` (text delta), ``tool_call`` and finally ``done`` carrying the
+        full response. On failure an ``error`` event is emitted and ``done``
+        carries ``fallback_response``; clients should treat ``done`` as final.
+        If the request deadline passes mid-stream, ``done`` carries the text
+        streamed so far followed by ``fallback_response``.
+        """
+        Logger.info(f"{self.name} streaming message: {raw_message}")
+        streamed = []
+        with Tracer.span(self.metrics_key, agent=self.name, streamed=True) as span:
+            result = None
+            try:
+                with openai_breaker().guard():
+                    tier, run_config = self._run_config()
+                    start = time.perf_counter()
+                    result = Runner.run_streamed(self, raw_message, context=context, run_config=run_config, hooks=_usage_hooks)
+                    events = result.stream_events()
+                    while True:
+                        try:
+                            event = await Deadline.wait_for(events.__anext__(), stage=self.metrics_key)
+                        except StopAsyncIteration:
+                            break
+                        if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+                            streamed.append(event.data.delta)
+                            yield {"event": "token", "delta": event.data.delta}
+                        elif event.type == "run_item_stream_event" and event.name == "tool_called":
+                            raw_item = event.item.raw_item
+                            yield {"event": "tool_call", "tool": getattr(raw_item, "name", None) or getattr(raw_item, "type", "tool")}
+                Metrics.record_usage(self.metrics_key, result.context_wrapper.usage)
+                self._record_tier(tier, result.context_wrapper.usage, time.perf_counter() - start)
+                response = str(result.final_output)
+            except DeadlineExceeded as e:
+                Logger.warning(f"{self.name} stream hit the request deadline: {e}")
+                span.status, span.error = "deadline", str(e)
+                if result is not None:
+                    result.cancel()
+                partial = "".join(streamed).strip()
+                response = f"{partial}\n\n{self.fallback_response}" if partial else self.fallback_response
+                yield {"event": "error", "message": self.fallback_response}
+            except Exception as e:
+                Logger.error(f"Error streaming {self.name}: {e}")
+                span.status, span.error = "error", str(e)
+                yield {"event": "error", "message": self.fallback_response}
+                response = self.fallback_response
+        yield {"event": "done", "response": response}
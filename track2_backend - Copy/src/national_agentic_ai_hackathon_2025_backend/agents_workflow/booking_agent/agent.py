@@ -5,22 +5,28 @@ from national_agentic_ai_hackathon_2025_backend.tools.RAG.police import police_f
 from national_agentic_ai_hackathon_2025_backend.tools.location.get_location import get_location_info
 from national_agentic_ai_hackathon_2025_backend.tools.location.get_nearest_location import get_nearest_place
 from national_agentic_ai_hackathon_2025_backend.tools.email.booking_email_tool import create_booking_email_tool
-from agents import Agent , Runner 
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.base import BaseAgent
+from national_agentic_ai_hackathon_2025_backend.utils.deadline import DeadlineExceeded
+from national_agentic_ai_hackathon_2025_backend.utils.circuit_breaker import CircuitOpenError
+from national_agentic_ai_hackathon_2025_backend.context.global_context import GlobalContext
 
-class BookingAgent(Agent):
-    def __init__(self,context):
-        self.context=context
+class BookingAgent(BaseAgent):
+    metrics_key = "agent.booking"
+
+    def __init__(self):
         super().__init__(
             name="Booking Agent",
             instructions=get_booking_instructions,
             tools=self._get_all_tools()
         )
 
-    async def run(self, raw_message: str):
+    async def run(self, raw_message: str, context: GlobalContext):
         Logger.info(f"Clinic Agent received message: {raw_message}")
         try:
-            result = await Runner.run(self, raw_message, context=self.context)
-            return result.final_output
+            return await self._run(raw_message, context)
+
+        except (DeadlineExceeded, CircuitOpenError):
+            raise
 
         except Exception as e:
             Logger.error(f"Error running clinic agent: {e}")
@@ -28,9 +34,9 @@ class BookingAgent(Agent):
 
     def _get_all_tools(self):
         return [
-            health_facility_tool(self.context),
-            police_facility_tool(self.context),
+            health_facility_tool(),
+            police_facility_tool(),
             get_nearest_place,
             get_location_info,
-            create_booking_email_tool(self.context),
+            create_booking_email_tool(),
         ]
\ No newline at end of file
@@ -1,5 +1,5 @@
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.prompt_template import InstructionTemplate
 from agents import Agent, RunContextWrapper
-from national_agentic_ai_hackathon_2025_backend.utils._helpers import _get_current_time
 from national_agentic_ai_hackathon_2025_backend.context.global_context import GlobalContext
 
 AGENT_BOOKING_INSTRUCTIONS = """
@@ -77,16 +77,8 @@ Only use these tools when necessary and when the patient explicitly or implicitl
 
 """
 
+BOOKING_TEMPLATE = InstructionTemplate("booking", AGENT_BOOKING_INSTRUCTIONS)
+
 
 def get_booking_instructions(context: RunContextWrapper[GlobalContext], agent: Agent) -> str:
-    # Handle case where coordinates might be None
-    coordinates_text = ""
-    if context.context.coordinates is not None:
-        coordinates_text = context.context.coordinates.formatted_coordinates or ""
-
-    return AGENT_BOOKING_INSTRUCTIONS.format(
-        user_context=context.context.user.formatted_user,
-        chat_history=context.context.chat_history.formatted_messages,
-        current_time=_get_current_time(),
-        coordinates=coordinates_text
-    )
+    return BOOKING_TEMPLATE.render_for(context)
@@ -1,5 +1,5 @@
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.prompt_template import InstructionTemplate
 from agents import RunContextWrapper, Agent
-from national_agentic_ai_hackathon_2025_backend.utils._helpers import _get_current_time
 from national_agentic_ai_hackathon_2025_backend.context.global_context import GlobalContext
 
 
@@ -150,12 +150,8 @@ For immediate assistance:
 If this is not an emergency, please try again later when the system is restored. Your safety is our priority."
 """
 
+CATASTROPHIC_TEMPLATE = InstructionTemplate("catastrophic", CATASTROPHIC_AGENT_INSTRUCTIONS)
 
-def get_catastrophic_instructions(wrapper: RunContextWrapper[GlobalContext], agent: Agent) -> str:
-    return CATASTROPHIC_AGENT_INSTRUCTIONS.format(
-        user_context=wrapper.context.user_context if hasattr(wrapper.context, 'user_context') else "",
-        chat_history=wrapper.context.chat_history if hasattr(wrapper.context, 'chat_history') else "",
-        current_time=_get_current_time(),
 
-        coordinates=getattr(wrapper.context.coordinates,"formatted_coordinates","")
-    )
+def get_catastrophic_instructions(wrapper: RunContextWrapper[GlobalContext], agent: Agent) -> str:
+    return CATASTROPHIC_TEMPLATE.render_for(wrapper)
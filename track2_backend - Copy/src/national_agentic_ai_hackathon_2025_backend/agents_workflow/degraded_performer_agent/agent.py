@@ -1,28 +1,35 @@
 from national_agentic_ai_hackathon_2025_backend._debug import Logger
 from national_agentic_ai_hackathon_2025_backend.agents_workflow.degraded_performer_agent.instructions import get_degraded_performer_instructions
 from national_agentic_ai_hackathon_2025_backend.tools.RAG.faqs import get_faqs
-from agents import Agent , Runner 
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.base import BaseAgent
+from national_agentic_ai_hackathon_2025_backend.utils.deadline import DeadlineExceeded
+from national_agentic_ai_hackathon_2025_backend.utils.circuit_breaker import CircuitOpenError
+from national_agentic_ai_hackathon_2025_backend.context.global_context import GlobalContext
 
-class DegradedPerformerAgent(Agent):
-    def __init__(self,context):
-        self.context=context
+class DegradedPerformerAgent(BaseAgent):
+    metrics_key = "agent.degraded"
+    fallback_response = "Sorry, I am unable to process your request at the moment due to system limitations."
+
+    def __init__(self):
         super().__init__(
             name="Degraded Performer Agent",
             instructions=get_degraded_performer_instructions,
             tools=self._get_all_tools()
         )
 
-    async def run(self, raw_message: str) -> str:
+    async def run(self, raw_message: str, context: GlobalContext) -> str:
         Logger.info(f"Degraded Performer Agent received message: {raw_message}")
         try:
-            result = await Runner.run(self, raw_message, context=self.context)
-            return result.final_output
+            return await self._run(raw_message, context)
+
+        except (DeadlineExceeded, CircuitOpenError):
+            raise
 
         except Exception as e:
             Logger.error(f"Error running degraded performer agent: {e}")
-            return "Sorry, I am unable to process your request at the moment due to system limitations."
+            return self.fallback_response
 
     def _get_all_tools(self):
         return [
-            get_faqs(self.context)
+            get_faqs()
         ]
\ No newline at end of file
@@ -1,4 +1,4 @@
-from national_agentic_ai_hackathon_2025_backend.utils._helpers import _get_current_time
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.prompt_template import InstructionTemplate
 
 
 DEGRADED_PERFORMER_AGENT_INSTRUCTIONS = """
@@ -60,11 +60,8 @@ You are a **Degraded Performer Agent** that provides simplified, lightweight res
 
 """
 
+DEGRADED_PERFORMER_TEMPLATE = InstructionTemplate("degraded", DEGRADED_PERFORMER_AGENT_INSTRUCTIONS)
+
 
 def get_degraded_performer_instructions(wrapper, agent) -> str:
-    return DEGRADED_PERFORMER_AGENT_INSTRUCTIONS.format(
-        user_context=wrapper.context.user_context if hasattr(wrapper.context, 'user_context') else "",
-        chat_history=wrapper.context.chat_history if hasattr(wrapper.context, 'chat_history') else "",
-        current_time=_get_current_time(),
-        coordinates=wrapper.context.coordinates.formatted_coordinates if hasattr(wrapper.context, 'coordinates') else ""
-    )
+    return DEGRADED_PERFORMER_TEMPLATE.render_for(wrapper)
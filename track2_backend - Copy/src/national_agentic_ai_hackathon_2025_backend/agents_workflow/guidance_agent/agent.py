@@ -1,11 +1,15 @@
 from national_agentic_ai_hackathon_2025_backend._debug import Logger
 from national_agentic_ai_hackathon_2025_backend.agents_workflow.guidance_agent.guidance_instruction import get_guidance_instructions
 from national_agentic_ai_hackathon_2025_backend.agents_workflow.guidance_agent.output_type import GuidanceOutputType
-from agents import Agent , Runner 
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.base import BaseAgent
+from national_agentic_ai_hackathon_2025_backend.utils.deadline import DeadlineExceeded
+from national_agentic_ai_hackathon_2025_backend.utils.circuit_breaker import CircuitOpenError
+from national_agentic_ai_hackathon_2025_backend.context.global_context import GlobalContext
 
-class GuidanceAgent(Agent):
-    def __init__(self,context):
-        self.context=context
+class GuidanceAgent(BaseAgent):
+    metrics_key = "agent.guidance"
+
+    def __init__(self):
         super().__init__(
             name="Guidance Agent",
             instructions=get_guidance_instructions,
@@ -13,11 +17,13 @@ class GuidanceAgent(Agent):
             output_type=GuidanceOutputType
         )
 
-    async def run(self, raw_message: str) -> GuidanceOutputType:
+    async def run(self, raw_message: str, context: GlobalContext) -> GuidanceOutputType:
         Logger.info(f"Medical Agent received message: {raw_message}")
         try:
-            result = await Runner.run(self, raw_message, context=self.context)
-            return result.final_output
+            return await self._run(raw_message, context)
+
+        except (DeadlineExceeded, CircuitOpenError):
+            raise
 
         except Exception as e:
             Logger.error(f"Error running medical agent: {e}")
@@ -1,4 +1,4 @@
-from national_agentic_ai_hackathon_2025_backend.utils._helpers import _get_current_time
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.prompt_template import InstructionTemplate
 from agents import Agent, RunContextWrapper
 
 GUIDANCE_AGENT_INSTRUCTIONS = """
@@ -52,10 +52,8 @@ Your primary responsibility is to **understand the user's intent** and either an
   - If general → mark `is_critical = False`.  
 """
 
+GUIDANCE_TEMPLATE = InstructionTemplate("guidance", GUIDANCE_AGENT_INSTRUCTIONS)
+
 
 def get_guidance_instructions(wrapper: RunContextWrapper, agent: Agent) -> str:
-    return GUIDANCE_AGENT_INSTRUCTIONS.format(
-        user_context=wrapper.context.user.formatted_user,
-        chat_history=wrapper.context.chat_history.formatted_messages,
-        current_time=_get_current_time(),
-    )
+    return GUIDANCE_TEMPLATE.render_for(wrapper)
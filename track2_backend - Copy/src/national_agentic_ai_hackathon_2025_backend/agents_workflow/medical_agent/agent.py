@@ -4,30 +4,37 @@ from national_agentic_ai_hackathon_2025_backend.tools.RAG.hospital import health
 from national_agentic_ai_hackathon_2025_backend.tools.location.get_location import get_location_info
 from national_agentic_ai_hackathon_2025_backend.tools.location.get_nearest_location import get_nearest_place
 from national_agentic_ai_hackathon_2025_backend.agents_workflow.booking_agent.agent import BookingAgent
-from agents import Agent, Runner 
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.base import BaseAgent
+from national_agentic_ai_hackathon_2025_backend.utils.deadline import DeadlineExceeded
+from national_agentic_ai_hackathon_2025_backend.utils.circuit_breaker import CircuitOpenError
+from national_agentic_ai_hackathon_2025_backend.context.global_context import GlobalContext
+from typing import Optional
 
-class MedicalAgent(Agent):
-    def __init__(self,context):
-        self.context=context
+class MedicalAgent(BaseAgent):
+    metrics_key = "agent.medical"
+    fallback_response = "Sorry, I am unable to process your medical request at the moment."
+
+    def __init__(self, booking_agent: Optional[BookingAgent] = None):
         super().__init__(
             name="Medical Agent",
             instructions=get_medical_instructions,
-            tools=self._get_all_tools()
+            tools=self._get_all_tools(booking_agent or BookingAgent())
         )
 
-    async def run(self, raw_message: str):
+    async def run(self, raw_message: str, context: GlobalContext):
         Logger.info(f"Medical Agent received message: {raw_message}")
         try:
-            result = await Runner.run(self, raw_message, context=self.context)
-            return result.final_output
+            return await self._run(raw_message, context)
+        except (DeadlineExceeded, CircuitOpenError):
+            raise
+
         except Exception as e:
             Logger.error(f"Error running medical agent: {e}")
-            return "Sorry, I am unable to process your medical request at the moment."
+            return self.fallback_response
 
-    def _get_all_tools(self):
-        booking_agent = BookingAgent(self.context)
+    def _get_all_tools(self, booking_agent: BookingAgent):
         return [
-            health_facility_tool(self.context),
+            health_facility_tool(),
             get_location_info,
             get_nearest_place,
             booking_agent.as_tool(
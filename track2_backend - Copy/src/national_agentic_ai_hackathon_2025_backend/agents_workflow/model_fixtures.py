@@ -0,0 +1,365 @@
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+from collections import defaultdict
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from agents import Model, ModelResponse, set_tracing_disabled
+from agents.models.multi_provider import MultiProvider
+from agents.usage import Usage
+from openai.types.responses import (
+    Response,
+    ResponseCompletedEvent,
+    ResponseOutputItem,
+    ResponseOutputItemDoneEvent,
+    ResponseTextDeltaEvent,
+    ResponseUsage,
+)
+from openai.types.responses.response_usage import InputTokensDetails, OutputTokensDetails
+from pydantic import TypeAdapter
+from national_agentic_ai_hackathon_2025_backend.config import Config
+from national_agentic_ai_hackathon_2025_backend.utils.metrics import Metrics
+from national_agentic_ai_hackathon_2025_backend._debug import Logger
+
+DEFAULT_FIXTURES_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "model_fixtures.jsonl")
+
+_output_item = TypeAdapter(ResponseOutputItem)
+
+
+class FixtureMissingError(Exception):
+    """Replay mode found no recorded response for an agent turn."""
+
+
+def _input_items(input: Any) -> List[Dict[str, Any]]:
+    if isinstance(input, str):
+        return [{"role": "user", "content": input}]
+    return [item if isinstance(item, dict) else item.model_dump(mode="json") for item in input]
+
+
+def _turn(items: List[Dict[str, Any]]) -> int:
+    """Model calls already made in this run: one per batch of tool results fed back."""
+    # Results of parallel calls arrive together, after the calls, so count runs rather than items
+    turn = 0
+    previous = None
+    for item in items:
+        kind = item.get("type")
+        if kind == "function_call_output" and previous != "function_call_output":
+            turn += 1
+        previous = kind
+    return turn
+
+
+def _fingerprint(items: List[Dict[str, Any]]) -> str:
+    """Hash of what the model was asked: user messages and tool results, not the per-request context block."""
+    relevant = []
+    for item in items:
+        if item.get("role") == "user":
+            relevant.append(["user", item.get("content")])
+        elif item.get("type") == "function_call_output":
+            relevant.append(["tool", item.get("output")])
+    return hashlib.sha256(json.dumps(relevant, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+
+def _last_user_message(items: List[Dict[str, Any]]) -> str:
+    for item in reversed(items):
+        if item.get("role") == "user":
+            content = item.get("content")
+            return content if isinstance(content, str) else json.dumps(content, default=str)
+    return ""
+
+
+def _usage_to_dict(usage: Usage) -> Dict[str, int]:
+    return {
+        "input_tokens": usage.input_tokens,
+        "output_tokens": usage.output_tokens,
+        "total_tokens": usage.total_tokens,
+        "cached_tokens": getattr(usage.input_tokens_details, "cached_tokens", 0) or 0,
+    }
+
+
+def _response_usage(recorded: Dict[str, int]) -> ResponseUsage:
+    # model_construct: the details models gain required fields across openai releases
+    return ResponseUsage.model_construct(
+        input_tokens=recorded.get("input_tokens", 0),
+        output_tokens=recorded.get("output_tokens", 0),
+        total_tokens=recorded.get("total_tokens", 0),
+        input_tokens_details=InputTokensDetails.model_construct(cached_tokens=recorded.get("cached_tokens", 0)),
+        output_tokens_details=OutputTokensDetails.model_construct(reasoning_tokens=0),
+    )
+
+
+class FixtureStore:
+    """
+    JSON lines file of recorded model responses, one per agent turn:
+    ``{"agent", "turn", "key", "input", "output", "usage", "latency_s", "model"}``.
+
+    Lookups try the exact request (same user messages and tool results)
+    first, then the same last user message, then the agent's wildcard
+    entries for that turn (seeds with neither ``key`` nor ``input``, which
+    answer any message). Hand-written seeds may leave out ``key`` and match
+    on ``input`` only. With MODEL_REPLAY_STRICT=false a request nothing
+    matches falls back to any recording of that agent and turn, picked by a
+    hash of the request so the same message always replays the same
+    response, and counted as ``replay.fallback``; by default it has no
+    fixture.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._exact: Dict[Tuple[str, int, str], Dict[str, Any]] = {}
+        self._by_input: Dict[Tuple[str, int, str], Dict[str, Any]] = {}
+        self._wildcard: Dict[Tuple[str, int], List[Dict[str, Any]]] = defaultdict(list)
+        self._by_turn: Dict[Tuple[str, int], List[Dict[str, Any]]] = defaultdict(list)
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        self._index(json.loads(line))
+            Logger.info(f"Loaded {len(self)} model fixtures from {path}")
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._by_turn.values())
+
+    def _index(self, entry: Dict[str, Any]) -> None:
+        if entry.get("key"):
+            self._exact[(entry["agent"], entry["turn"], entry["key"])] = entry
+        if entry.get("input"):
+            self._by_input.setdefault((entry["agent"], entry["turn"], entry["input"]), entry)
+        if not entry.get("key") and not entry.get("input"):
+            self._wildcard[(entry["agent"], entry["turn"])].append(entry)
+        self._by_turn[(entry["agent"], entry["turn"])].append(entry)
+
+    def lookup(self, agent: str, turn: int, key: str, message: str = "") -> Optional[Dict[str, Any]]:
+        entry = self._exact.get((agent, turn, key)) or self._by_input.get((agent, turn, message))
+        if entry is not None:
+            return entry
+        entries = self._wildcard.get((agent, turn))
+        if not entries:
+            if Config.get_bool("MODEL_REPLAY_STRICT", True):
+                return None
+            entries = self._by_turn.get((agent, turn))
+            if not entries:
+                return None
+            Metrics.increment("replay.fallback")
+        return entries[int(key, 16) % len(entries)]
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        self._index(entry)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def recorded_messages(path: str, agents: Tuple[str, ...] = ("agent.guidance", "agent.triage")) -> List[str]:
+    """Distinct user messages recorded for ``agents`` (by default the first-stage ones), for load generators."""
+    messages: List[str] = []
+    if not os.path.exists(path):
+        return messages
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if entry["agent"] in agents and entry.get("input") and entry["input"] not in messages:
+                messages.append(entry["input"])
+    return messages
+
+
+class RecordingModel(Model):
+    """Passes calls through to the real model and appends each response to the fixture file."""
+
+    def __init__(self, agent: str, inner: Model, model_name: Optional[str], store: FixtureStore) -> None:
+        self.agent = agent
+        self.inner = inner
+        self.model_name = model_name
+        self.store = store
+
+    def _record(self, input: Any, output: List[Any], usage: Usage, latency: float) -> None:
+        items = _input_items(input)
+        self.store.append({
+            "agent": self.agent,
+            "turn": _turn(items),
+            "key": _fingerprint(items),
+            "input": _last_user_message(items),
+            "output": [item.model_dump(mode="json", exclude_none=True) for item in output],
+            "usage": _usage_to_dict(usage),
+            "latency_s": round(latency, 3),
+            "model": self.model_name,
+        })
+
+    async def get_response(self, system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs) -> ModelResponse:
+        start = time.perf_counter()
+        response = await self.inner.get_response(
+            system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs
+        )
+        self._record(input, response.output, response.usage, time.perf_counter() - start)
+        return response
+
+    async def stream_response(self, system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs) -> AsyncIterator[Any]:
+        start = time.perf_counter()
+        async for event in self.inner.stream_response(
+            system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs
+        ):
+            if isinstance(event, ResponseCompletedEvent):
+                usage = event.response.usage
+                self._record(
+                    input,
+                    event.response.output,
+                    Usage(
+                        requests=1,
+                        input_tokens=usage.input_tokens if usage else 0,
+                        output_tokens=usage.output_tokens if usage else 0,
+                        total_tokens=usage.total_tokens if usage else 0,
+                        input_tokens_details=usage.input_tokens_details if usage else None,
+                    ),
+                    time.perf_counter() - start,
+                )
+            yield event
+
+
+class ReplayModel(Model):
+    """
+    Serves recorded responses with synthetic latency and never touches the
+    network. Latency is MODEL_REPLAY_LATENCY_MS when set, otherwise the
+    recorded latency times MODEL_REPLAY_LATENCY_SCALE, plus up to
+    MODEL_REPLAY_JITTER_MS of seeded jitter.
+    """
+
+    def __init__(self, agent: str, store: FixtureStore, rng: random.Random) -> None:
+        self.agent = agent
+        self.store = store
+        self.rng = rng
+
+    def _entry(self, input: Any) -> Dict[str, Any]:
+        items = _input_items(input)
+        turn = _turn(items)
+        entry = self.store.lookup(self.agent, turn, _fingerprint(items), _last_user_message(items))
+        if entry is None:
+            raise FixtureMissingError(
+                f"No recorded response for {self.agent} turn {turn} in {self.store.path} "
+                "(MODEL_REPLAY_STRICT=false replays another message's recording)"
+            )
+        return entry
+
+    def _latency(self, entry: Dict[str, Any]) -> float:
+        fixed_ms = Config.get_float("MODEL_REPLAY_LATENCY_MS", -1.0)
+        if fixed_ms >= 0:
+            latency = fixed_ms / 1000
+        else:
+            latency = entry.get("latency_s", 0.0) * Config.get_float("MODEL_REPLAY_LATENCY_SCALE", 1.0)
+        jitter_ms = Config.get_float("MODEL_REPLAY_JITTER_MS", 0.0)
+        if jitter_ms > 0:
+            latency += self.rng.uniform(0, jitter_ms) / 1000
+        return latency
+
+    async def get_response(self, system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs) -> ModelResponse:
+        entry = self._entry(input)
+        await asyncio.sleep(self._latency(entry))
+        usage = _response_usage(entry.get("usage", {}))
+        return ModelResponse(
+            output=[_output_item.validate_python(item) for item in entry["output"]],
+            usage=Usage(
+                requests=1,
+                input_tokens=usage.input_tokens,
+                output_tokens=usage.output_tokens,
+                total_tokens=usage.total_tokens,
+                input_tokens_details=usage.input_tokens_details,
+            ),
+            response_id=None,
+        )
+
+    async def stream_response(self, system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs) -> AsyncIterator[Any]:
+        """Replay as a stream: text arrives in word-sized deltas spread over the latency, first token after 30% of it."""
+        entry = self._entry(input)
+        latency = self._latency(entry)
+        output = [_output_item.validate_python(item) for item in entry["output"]]
+        await asyncio.sleep(latency * 0.3)
+
+        sequence = 0
+        for index, item in enumerate(output):
+            for part_index, part in enumerate(getattr(item, "content", None) or []):
+                text = getattr(part, "text", None)
+                if not text:
+                    continue
+                words = text.split(" ")
+                for position, word in enumerate(words):
+                    await asyncio.sleep(latency * 0.7 / max(len(words), 1))
+                    yield ResponseTextDeltaEvent.model_construct(
+                        type="response.output_text.delta",
+                        item_id=item.id,
+                        output_index=index,
+                        content_index=part_index,
+                        delta=word if position == len(words) - 1 else word + " ",
+                        logprobs=[],
+                        sequence_number=sequence,
+                    )
+                    sequence += 1
+            yield ResponseOutputItemDoneEvent(type="response.output_item.done", item=item, output_index=index, sequence_number=sequence)
+            sequence += 1
+
+        yield ResponseCompletedEvent(
+            type="response.completed",
+            sequence_number=sequence,
+            response=Response.model_construct(
+                id=f"replay-{entry.get('key') or self.agent}",
+                created_at=time.time(),
+                model=entry.get("model") or "replay",
+                object="response",
+                output=output,
+                parallel_tool_calls=False,
+                tool_choice="auto",
+                tools=[],
+                usage=_response_usage(entry.get("usage", {})),
+            ),
+        )
+
+
+class FixtureModelProvider:
+    """
+    Hands out recording or replaying models per agent (MODEL_PROVIDER_MODE).
+
+    ``record`` runs the real models and appends every response to the
+    fixture file; ``replay`` serves them back offline, so WorkFlow can be
+    load-tested deterministically without OpenAI. Models are bound to the
+    agent's metrics key, which is what fixtures are looked up by.
+    """
+
+    def __init__(self, mode: str, path: str, seed: int = 0) -> None:
+        self.mode = mode
+        self.store = FixtureStore(path)
+        self.rng = random.Random(seed)
+        self._live = MultiProvider() if mode == "record" else None
+        self._models: Dict[Tuple[str, Optional[str]], Model] = {}
+
+    def model_for(self, agent: str, model_name: Optional[str] = None) -> Model:
+        model = self._models.get((agent, model_name))
+        if model is None:
+            if self.mode == "record":
+                model = RecordingModel(agent, self._live.get_model(model_name), model_name, self.store)
+            else:
+                model = ReplayModel(agent, self.store, self.rng)
+            self._models[(agent, model_name)] = model
+        return model
+
+    @classmethod
+    def get(cls) -> Optional["FixtureModelProvider"]:
+        """Return the process-wide provider, or None for live models (the default)."""
+        global _provider
+        mode = (Config.get("MODEL_PROVIDER_MODE") or "live").lower()
+        if mode not in {"record", "replay"}:
+            return None
+        if _provider is None or _provider.mode != mode:
+            _provider = cls(
+                mode,
+                Config.get("MODEL_FIXTURES_PATH") or DEFAULT_FIXTURES_PATH,
+                seed=Config.get_int("MODEL_REPLAY_SEED", 0),
+            )
+            if mode == "replay":
+                set_tracing_disabled(True)  # the SDK trace exporter would otherwise call OpenAI
+            Logger.warning(f"Agents are using {mode}ed model responses ({_provider.store.path})")
+        return _provider
+
+
+_provider: Optional[FixtureModelProvider] = None
@@ -0,0 +1,107 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Optional, Set, Tuple
+from national_agentic_ai_hackathon_2025_backend.config import Config
+from national_agentic_ai_hackathon_2025_backend.utils._helpers import is_constrained_device
+
+STRONG = "strong"
+FAST = "fast"
+
+# Agents that always get the strongest model: a wrong or vague answer here costs most
+DEFAULT_EMERGENCY_AGENTS = "medical,police,catastrophic,booking"
+# Agents whose answers are low-stakes enough to always use the fast model. Not guidance: its
+# is_critical flag decides whether an emergency reaches the orchestrator at all
+DEFAULT_LOW_STAKES_AGENTS = "degraded,summary"
+
+DEFAULT_FAST_MODEL = "gpt-4.1-mini"
+DEFAULT_IN_FLIGHT_THRESHOLD = 20
+DEFAULT_QUEUE_DEPTH_THRESHOLD = 10
+
+_constrained_device: ContextVar[bool] = ContextVar("constrained_device", default=False)
+
+
+class ModelPolicy:
+    """
+    Chooses the model tier for each agent run (MODEL_TIERING_ENABLED).
+
+    Emergency agents always run on the strong tier and low-stakes agents on
+    the fast tier. The remaining agents (guidance, orchestrator, triage),
+    which decide whether and where a request escalates, use the fast tier
+    while the process is loaded (in-flight requests or queued work past a
+    threshold) or the request comes from a constrained device, and the
+    strong tier otherwise. An unset MODEL_STRONG keeps the SDK default model.
+    """
+
+    _in_flight = 0
+    _queues: Dict[str, Callable[[], int]] = {}
+
+    @classmethod
+    def enabled(cls) -> bool:
+        return Config.get_bool("MODEL_TIERING_ENABLED")
+
+    @classmethod
+    @contextmanager
+    def request(cls, status=None):
+        """Count one in-flight request and remember whether its device is constrained."""
+        cls._in_flight += 1
+        token = _constrained_device.set(is_constrained_device(status))
+        try:
+            yield
+        finally:
+            cls._in_flight -= 1
+            try:
+                _constrained_device.reset(token)
+            except ValueError:
+                _constrained_device.set(False)
+
+    @classmethod
+    def in_flight(cls) -> int:
+        return cls._in_flight
+
+    @classmethod
+    def register_queue(cls, name: str, depth: Callable[[], int]) -> None:
+        """Let a work queue report its depth to the load check."""
+        cls._queues[name] = depth
+
+    @classmethod
+    def queue_depth(cls) -> int:
+        return sum(depth() for depth in cls._queues.values())
+
+    @classmethod
+    def overloaded(cls) -> bool:
+        return (
+            cls._in_flight >= Config.get_int("MODEL_FAST_IN_FLIGHT", DEFAULT_IN_FLIGHT_THRESHOLD)
+            or cls.queue_depth() >= Config.get_int("MODEL_FAST_QUEUE_DEPTH", DEFAULT_QUEUE_DEPTH_THRESHOLD)
+        )
+
+    @classmethod
+    def tier_for(cls, agent: str) -> Tuple[str, str]:
+        """(tier, reason) for an agent key such as ``guidance`` or ``agent.medical``."""
+        agent = agent.split(".")[-1]
+        if agent in _agent_set("MODEL_EMERGENCY_AGENTS", DEFAULT_EMERGENCY_AGENTS):
+            return STRONG, "emergency"
+        if agent in _agent_set("MODEL_LOW_STAKES_AGENTS", DEFAULT_LOW_STAKES_AGENTS):
+            return FAST, "low_stakes"
+        if cls.overloaded():
+            return FAST, "load"
+        if _constrained_device.get():
+            return FAST, "device"
+        return STRONG, "default"
+
+    @classmethod
+    def model_for(cls, tier: str) -> Optional[str]:
+        if tier == FAST:
+            return Config.get("MODEL_FAST", DEFAULT_FAST_MODEL)
+        return Config.get("MODEL_STRONG") or None
+
+    @classmethod
+    def select(cls, agent: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """(tier, reason, model) for one run; all None when tiering is off."""
+        if not cls.enabled():
+            return None, None, None
+        tier, reason = cls.tier_for(agent)
+        return tier, reason, cls.model_for(tier)
+
+
+def _agent_set(key: str, default: str) -> Set[str]:
+    return {name.strip() for name in Config.get(key, default).split(",") if name.strip()}
@@ -2,11 +2,15 @@ from national_agentic_ai_hackathon_2025_backend._debug import Logger
 from national_agentic_ai_hackathon_2025_backend.agents_workflow.orchestrator_agent.orchestrator_instructions import get_orchestrator_instructions
 from national_agentic_ai_hackathon_2025_backend.agents_workflow.orchestrator_agent.output_type import OrchestratorOutputType
 
-from agents import Agent , Runner 
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.base import BaseAgent
+from national_agentic_ai_hackathon_2025_backend.utils.deadline import DeadlineExceeded
+from national_agentic_ai_hackathon_2025_backend.utils.circuit_breaker import CircuitOpenError
+from national_agentic_ai_hackathon_2025_backend.context.global_context import GlobalContext
 
-class OrchestratorAgent(Agent):
-    def __init__(self,context):
-        self.context=context
+class OrchestratorAgent(BaseAgent):
+    metrics_key = "agent.orchestrator"
+
+    def __init__(self):
         super().__init__(
             name="Orchestrator Agent",
             instructions=get_orchestrator_instructions,
@@ -14,11 +18,13 @@ class OrchestratorAgent(Agent):
             output_type=OrchestratorOutputType
         )
 
-    async def run(self, raw_message: str) -> OrchestratorOutputType:
+    async def run(self, raw_message: str, context: GlobalContext) -> OrchestratorOutputType:
         Logger.info(f"Orchestrator Agent received message: {raw_message}")
         try:
-            result = await Runner.run(self, raw_message, context=self.context)
-            return result.final_output
+            return await self._run(raw_message, context)
+
+        except (DeadlineExceeded, CircuitOpenError):
+            raise
 
         except Exception as e:
             Logger.error(f"Error running Orchestrator agent: {e}")
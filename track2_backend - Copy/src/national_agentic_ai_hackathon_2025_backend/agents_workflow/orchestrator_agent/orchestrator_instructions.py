@@ -1,6 +1,6 @@
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.prompt_template import InstructionTemplate
 from agents import Agent, RunContextWrapper
 from national_agentic_ai_hackathon_2025_backend.context.global_context import GlobalContext
-from national_agentic_ai_hackathon_2025_backend.utils._helpers import _get_current_time
 
 
 ORCHESTRATOR_AGENT_INSTRUCTIONS = """
@@ -63,12 +63,8 @@ You do not directly solve the problem but act as the decision-maker that ensures
 
 """
 
+ORCHESTRATOR_TEMPLATE = InstructionTemplate("orchestrator", ORCHESTRATOR_AGENT_INSTRUCTIONS)
 
-def get_orchestrator_instructions(wrapper: RunContextWrapper[GlobalContext], agent: Agent) -> str:
-    return ORCHESTRATOR_AGENT_INSTRUCTIONS.format(
-        user_context=wrapper.context.user.formatted_user,
-        chat_history=wrapper.context.chat_history.formatted_messages,
-        current_time=_get_current_time(),
-        coordinates=getattr(wrapper.context.coordinates,"formatted_coordinates","")
 
-    )
+def get_orchestrator_instructions(wrapper: RunContextWrapper[GlobalContext], agent: Agent) -> str:
+    return ORCHESTRATOR_TEMPLATE.render_for(wrapper)
@@ -3,30 +3,37 @@ from national_agentic_ai_hackathon_2025_backend.agents_workflow.police_agent.pol
 from national_agentic_ai_hackathon_2025_backend.tools.RAG.police import police_facility_tool
 from national_agentic_ai_hackathon_2025_backend.tools.location.get_location import get_location_info
 from national_agentic_ai_hackathon_2025_backend.tools.location.get_nearest_location import get_nearest_place
-from agents import Agent , Runner
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.base import BaseAgent
+from national_agentic_ai_hackathon_2025_backend.utils.deadline import DeadlineExceeded
+from national_agentic_ai_hackathon_2025_backend.utils.circuit_breaker import CircuitOpenError
+from national_agentic_ai_hackathon_2025_backend.context.global_context import GlobalContext
 
-class PoliceAgent(Agent):
-    def __init__(self,context):
-        self.context=context
+class PoliceAgent(BaseAgent):
+    metrics_key = "agent.police"
+    fallback_response = "Sorry, I am unable to process your police request at the moment."
+
+    def __init__(self):
         super().__init__(
             name="Police Agent",
             instructions=get_police_instructions,
             tools=self._get_all_tools()
         )
 
-    async def run(self, raw_message: str):
+    async def run(self, raw_message: str, context: GlobalContext):
         Logger.info(f"Police Agent received message: {raw_message}")
         try:
-            result = await Runner.run(self, raw_message, context=self.context)
-            return result.final_output
+            return await self._run(raw_message, context)
+
+        except (DeadlineExceeded, CircuitOpenError):
+            raise
 
         except Exception as e:
             Logger.error(f"Error running medical agent: {e}")
-            return "Sorry, I am unable to process your police request at the moment."
+            return self.fallback_response
 
     def _get_all_tools(self):
         return [
-            police_facility_tool(self.context),
+            police_facility_tool(),
             get_location_info,
             get_nearest_place
         ]
@@ -1,5 +1,5 @@
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.prompt_template import InstructionTemplate
 from agents import Agent, RunContextWrapper
-from national_agentic_ai_hackathon_2025_backend.utils._helpers import _get_current_time
 
 
 POLICE_AGENT_INSTRUCTIONS = """
@@ -69,16 +69,8 @@ Use these tools only when the citizen explicitly or implicitly requests the corr
 
 """
 
+POLICE_TEMPLATE = InstructionTemplate("police", POLICE_AGENT_INSTRUCTIONS)
+
 
 def get_police_instructions(wrapper: RunContextWrapper, agent: Agent) -> str:
-    # Handle case where coordinates might be None
-    coordinates_text = ""
-    if wrapper.context.coordinates is not None:
-        coordinates_text = wrapper.context.coordinates.formatted_coordinates or ""
-    
-    return POLICE_AGENT_INSTRUCTIONS.format(
-        user_context=wrapper.context.user.formatted_user,
-        chat_history=wrapper.context.chat_history.formatted_messages,
-        current_time=_get_current_time(),
-        coordinates=coordinates_text
-    )
+    return POLICE_TEMPLATE.render_for(wrapper)
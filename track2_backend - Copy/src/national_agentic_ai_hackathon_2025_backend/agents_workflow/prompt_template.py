@@ -0,0 +1,92 @@
+import re
+from typing import Any, Dict, List
+from agents import RunContextWrapper
+from national_agentic_ai_hackathon_2025_backend.context.chat_history import estimate_tokens
+from national_agentic_ai_hackathon_2025_backend.utils._helpers import _get_current_time
+from national_agentic_ai_hackathon_2025_backend.utils.metrics import Metrics
+
+# Providers only cache prompt prefixes from this length on (OpenAI: 1024 tokens)
+PROMPT_CACHE_MIN_TOKENS = 1024
+
+_CONTEXT_HEADING = re.compile(r"^## Context[ \t]*$", re.MULTILINE)
+_NEXT_HEADING = re.compile(r"^## ", re.MULTILINE)
+
+
+class InstructionTemplate:
+    """
+    An agent's instructions, compiled once into a static prefix and a small
+    per-request context block.
+
+    The ``## Context`` section (user details, chat history, current time,
+    coordinates) is moved to the end, so every request for the same agent
+    starts with an identical prefix that the provider can serve from its
+    prompt cache. Templates without a ``## Context`` section are fully static.
+    """
+
+    def __init__(self, agent: str, template: str) -> None:
+        self.agent = agent
+        static, self.context_template = self._split(template)
+        # The static part is never formatted again, so resolve {{ }} escapes now
+        self.static_prefix = static.format()
+        _templates[agent] = self
+
+    @staticmethod
+    def _split(template: str):
+        match = _CONTEXT_HEADING.search(template)
+        if match is None:
+            return template.strip() + "\n", ""
+        following = _NEXT_HEADING.search(template, match.end())
+        end = following.start() if following else len(template)
+        static = template[:match.start()] + template[end:]
+        return static.strip() + "\n", template[match.start():end].strip()
+
+    def render(self, **values: Any) -> str:
+        if not self.context_template:
+            return self.static_prefix
+        return f"{self.static_prefix}\n{self.context_template.format(**values)}\n"
+
+    def render_for(self, wrapper: RunContextWrapper) -> str:
+        """Render with the standard context values of the request."""
+        return self.render(**instruction_context(wrapper, self.agent))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Stable-prefix size, plus prompt-cache usage recorded for this agent so
+        far. Tool and output schemas are sent ahead of the instructions and are
+        also cached, so ``cacheable`` (instructions alone) is conservative.
+        """
+        prefix_tokens = estimate_tokens(self.static_prefix)
+        input_tokens = Metrics.get_counter(f"agent.{self.agent}.input_tokens")
+        cached_tokens = Metrics.get_counter(f"agent.{self.agent}.cached_tokens")
+        return {
+            "agent": self.agent,
+            "static_prefix_chars": len(self.static_prefix),
+            "static_prefix_tokens": prefix_tokens,
+            "context_template_chars": len(self.context_template),
+            "cacheable": prefix_tokens >= PROMPT_CACHE_MIN_TOKENS,
+            "input_tokens": input_tokens,
+            "cached_tokens": cached_tokens,
+            "cached_ratio": round(cached_tokens / input_tokens, 3) if input_tokens else 0.0,
+        }
+
+
+_templates: Dict[str, InstructionTemplate] = {}
+
+
+def instruction_context(wrapper: RunContextWrapper, agent: str) -> Dict[str, str]:
+    """Per-request values for the ``## Context`` section of an agent's instructions."""
+    context = wrapper.context
+    user = getattr(context, "user", None)
+    chat_history = getattr(context, "chat_history", None)
+    coordinates = getattr(context, "coordinates", None)
+    return {
+        "user_context": (user.formatted_user if user is not None else "") or "",
+        "chat_history": chat_history.for_agent(agent) if chat_history is not None else "",
+        "current_time": _get_current_time(),
+        "coordinates": (coordinates.formatted_coordinates if coordinates is not None else "") or "",
+    }
+
+
+def instruction_report() -> List[Dict[str, Any]]:
+    """Stats for every compiled instruction template."""
+    return [template.stats() for template in _templates.values()]
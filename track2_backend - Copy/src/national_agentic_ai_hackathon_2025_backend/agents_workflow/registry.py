@@ -0,0 +1,73 @@
+from dataclasses import dataclass, fields
+from typing import Optional
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.guidance_agent.agent import GuidanceAgent
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.orchestrator_agent.agent import OrchestratorAgent
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.triage_agent.agent import TriageAgent
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.booking_agent.agent import BookingAgent
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.medical_agent.agent import MedicalAgent
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.police_agent.agent import PoliceAgent
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.catastrophic_agent.agent import CatastrophicAgent
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.degraded_performer_agent.agent import DegradedPerformerAgent
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.summary_agent.agent import SummaryAgent
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.prompt_template import instruction_report
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.model_fixtures import FixtureModelProvider
+from national_agentic_ai_hackathon_2025_backend._debug import Logger
+
+
+@dataclass(frozen=True)
+class AgentRegistry:
+    """
+    Process-wide set of agent definitions.
+
+    Every agent (and its tool list) is constructed exactly once; requests share
+    these instances and pass their own GlobalContext at run time.
+    """
+    guidance: GuidanceAgent
+    orchestrator: OrchestratorAgent
+    triage: TriageAgent
+    booking: BookingAgent
+    medical: MedicalAgent
+    police: PoliceAgent
+    catastrophic: CatastrophicAgent
+    degraded: DegradedPerformerAgent
+    summary: SummaryAgent
+
+    @classmethod
+    def build(cls) -> "AgentRegistry":
+        """Construct a fresh set of agents. Prefer ``get()`` outside of benchmarks."""
+        booking = BookingAgent()
+        registry = cls(
+            guidance=GuidanceAgent(),
+            orchestrator=OrchestratorAgent(),
+            triage=TriageAgent(),
+            booking=booking,
+            medical=MedicalAgent(booking_agent=booking),
+            police=PoliceAgent(),
+            catastrophic=CatastrophicAgent(),
+            degraded=DegradedPerformerAgent(),
+            summary=SummaryAgent(),
+        )
+        provider = FixtureModelProvider.get()
+        if provider is not None:
+            # Set on the agent itself so nested runs (agents used as tools) record/replay too
+            for field in fields(registry):
+                agent = getattr(registry, field.name)
+                agent.model = provider.model_for(agent.metrics_key, agent.model)
+        return registry
+
+    @classmethod
+    def get(cls) -> "AgentRegistry":
+        """Return the process-wide registry, building it on first use."""
+        global _registry
+        if _registry is None:
+            _registry = cls.build()
+            Logger.success("Agent registry built")
+            for stats in instruction_report():
+                Logger.info(
+                    f"{stats['agent']} instructions: stable prefix ~{stats['static_prefix_tokens']} tokens"
+                    f"{'' if stats['cacheable'] else ' (instructions alone are below the prompt cache minimum)'}"
+                )
+        return _registry
+
+
+_registry: Optional[AgentRegistry] = None
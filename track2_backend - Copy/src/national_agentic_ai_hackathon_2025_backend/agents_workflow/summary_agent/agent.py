@@ -0,0 +1,27 @@
+from typing import List, Optional
+from national_agentic_ai_hackathon_2025_backend._debug import Logger
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.summary_agent.summary_instruction import SUMMARY_AGENT_INSTRUCTIONS
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.base import BaseAgent
+
+class SummaryAgent(BaseAgent):
+    metrics_key = "agent.summary"
+
+    def __init__(self):
+        super().__init__(
+            name="Summary Agent",
+            instructions=SUMMARY_AGENT_INSTRUCTIONS,
+        )
+
+    async def summarize(self, previous_summary: Optional[str], lines: List[str]) -> Optional[str]:
+        """Fold formatted history lines into the previous summary. Returns None on failure."""
+        prompt = (
+            f"## Previous summary\n{previous_summary or '(none)'}\n\n"
+            "## New messages\n" + "\n".join(lines)
+        )
+        try:
+            summary = await self._run(prompt, None)
+            return str(summary).strip() or None
+
+        except Exception as e:
+            Logger.error(f"Error running summary agent: {e}")
+            return None
@@ -0,0 +1,33 @@
+from national_agentic_ai_hackathon_2025_backend._debug import Logger
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.triage_agent.triage_instruction import get_triage_instructions
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.triage_agent.output_type import TriageOutputType
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.base import BaseAgent
+from national_agentic_ai_hackathon_2025_backend.utils.deadline import DeadlineExceeded
+from national_agentic_ai_hackathon_2025_backend.utils.circuit_breaker import CircuitOpenError
+from national_agentic_ai_hackathon_2025_backend.context.global_context import GlobalContext
+
+class TriageAgent(BaseAgent):
+    metrics_key = "agent.triage"
+
+    def __init__(self):
+        super().__init__(
+            name="Triage Agent",
+            instructions=get_triage_instructions,
+            tools=self._get_all_tools(),
+            output_type=TriageOutputType
+        )
+
+    async def run(self, raw_message: str, context: GlobalContext) -> TriageOutputType:
+        Logger.info(f"Triage Agent received message: {raw_message}")
+        try:
+            return await self._run(raw_message, context)
+
+        except (DeadlineExceeded, CircuitOpenError):
+            raise
+
+        except Exception as e:
+            Logger.error(f"Error running triage agent: {e}")
+            return "Sorry, I am unable to process your request at the moment."
+
+    def _get_all_tools(self):
+        return []
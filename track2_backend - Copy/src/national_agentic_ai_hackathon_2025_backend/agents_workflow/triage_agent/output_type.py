@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+from typing import Literal, Optional
+
+class TriageOutputType(BaseModel):
+    response: str
+    is_critical: bool
+    request_type: Optional[Literal["medical", "police", "catastrophic"]]
@@ -4,14 +4,18 @@ from national_agentic_ai_hackathon_2025_backend.schemas.chat_history import Chat
 from national_agentic_ai_hackathon_2025_backend.utils._helpers import _get_current_time
 from national_agentic_ai_hackathon_2025_backend.database.user import UserDB
 from national_agentic_ai_hackathon_2025_backend.handlers.workflow import WorkFlow
+from national_agentic_ai_hackathon_2025_backend.handlers.history_summarizer import HistorySummarizer
+from national_agentic_ai_hackathon_2025_backend.bot.work_queue import KeyedWorkQueue
 from national_agentic_ai_hackathon_2025_backend.context.global_context import GlobalContext
 from national_agentic_ai_hackathon_2025_backend.context.chat_history import ChatHistoryContext
 from national_agentic_ai_hackathon_2025_backend.context.user import UserContext
 from national_agentic_ai_hackathon_2025_backend._debug import Logger
+from national_agentic_ai_hackathon_2025_backend.utils.tracing import Tracer
+from national_agentic_ai_hackathon_2025_backend.utils.deadline import Deadline
 from national_agentic_ai_hackathon_2025_backend.context.coordinates import Coordinates
 from pydantic import BaseModel
 
-from typing import Optional
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
 
 class ConnectionInfo(BaseModel):
     downlink: float
@@ -42,76 +46,128 @@ class WebBot:
         4. Route message to appropriate agent
         5. Return agent's response
         """
-        try:
-            if not message:
-                Logger.error("No message provided to execute_workflow")
-                return "No message provided"
-
-            if not user or not user.userid:
-                Logger.error("No user provided to execute_workflow")
-                return "User authentication required"
-
-            Logger.info(f"Received message from user {user.userid}: {message}")
-
-            # Log incoming user message
+        with Tracer.trace("web.execute_workflow", channel="web"), Deadline.for_request():
             try:
-                await self._log_user_message(user.phone_number, message, "text")
-            except Exception as e:
-                Logger.error(f"Error logging user message: {e}")
+                global_context, error = await self._prepare_context(user, message, coordinates)
+                if error:
+                    return error
 
-            # Fetch chat history for the user
-            try:
-                chat_history = await self.chat_db.get_chat_history_by_userid(user.userid)
-                Logger.info(f"Fetched chat history for user {user.userid}")
-            except Exception as e:
-                Logger.error(f"Error fetching chat history for user {user.userid}: {e}")
-                chat_history = None
+                # Process message through workflow
+                try:
+                    wf = WorkFlow(self.status)
+                    response = await wf.execute_workflow(message, global_context)
+                
+                    if not response:
+                        Logger.error("Agent returned no result")
+                        return "I'm sorry, I couldn't process your request at the moment."
 
-            # Retrieve or create user
-            try:
-                updated_user = await self._get_or_create_user(user)
-                if not updated_user:
-                    Logger.error(f"Failed to create or retrieve user {user.userid}")
-                    return "User authentication failed"
-            except Exception as e:
-                Logger.error(f"Error getting or creating user: {e}")
-                return "User authentication failed"
+                    # Log the agent's response
+                    await self._log_agent_message(user.phone_number, response, "text")
+                    self._schedule_history_summary(global_context)
+                
+                    Logger.info(f"Successfully processed message for user {user.userid}")
+                    return response
+                
+                except Exception as e:
+                    Logger.error(f"Error processing message: {e}")
+                    return "I'm sorry, I encountered an error processing your message. Please try again later."
 
-            # Build global context
-            try:
-                global_context = GlobalContext(
-                    user=self._get_user_context(updated_user),
-                    chat_history=self._get_chat_history_context(user.phone_number, chat_history),
-                    coordinates=coordinates
-                )
             except Exception as e:
-                Logger.error(f"Error building global context: {e}")
-                return "Error processing request"
+                import traceback
+                Logger.error(f"{__name__}> execute_workflow -> Unexpected error in execute_workflow: {e}")
+                Logger.error(f"Traceback: {traceback.format_exc()}")
+                return "I'm sorry, I encountered an unexpected error. Please try again later."
 
-            # Process message through workflow
+    async def stream_workflow(
+        self, user: User, message: str, coordinates: Optional[Coordinates] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of execute_workflow. Yields workflow events as they
+        are produced and persists the final response to chat history once the
+        stream completes.
+        """
+        with Tracer.trace("web.stream_workflow", channel="web"), Deadline.for_request():
             try:
+                global_context, error = await self._prepare_context(user, message, coordinates)
+                if error:
+                    yield {"event": "done", "response": error}
+                    return
+
+                response = None
                 wf = WorkFlow(self.status)
-                response = await wf.execute_workflow(message, global_context)
-                
+                async for event in wf.stream_workflow(message, global_context):
+                    if event["event"] == "done":
+                        response = event["response"]
+                    yield event
+
                 if not response:
                     Logger.error("Agent returned no result")
-                    return "I'm sorry, I couldn't process your request at the moment."
+                    yield {"event": "done", "response": "I'm sorry, I couldn't process your request at the moment."}
+                    return
 
-                # Log the agent's response
                 await self._log_agent_message(user.phone_number, response, "text")
-                
-                Logger.info(f"Successfully processed message for user {user.userid}")
-                return response
-                
+                self._schedule_history_summary(global_context)
+                Logger.info(f"Successfully streamed response for user {user.userid}")
+
             except Exception as e:
-                Logger.error(f"Error processing message: {e}")
-                return "I'm sorry, I encountered an error processing your message. Please try again later."
+                import traceback
+                Logger.error(f"{__name__}> stream_workflow -> Unexpected error in stream_workflow: {e}")
+                Logger.error(f"Traceback: {traceback.format_exc()}")
+                yield {"event": "done", "response": "I'm sorry, I encountered an unexpected error. Please try again later."}
 
+    async def _prepare_context(
+        self, user: User, message: str, coordinates: Optional[Coordinates]
+    ) -> Tuple[Optional[GlobalContext], Optional[str]]:
+        """
+        Validate the request, log the user message, resolve the user and build
+        the GlobalContext. Returns (context, None) or (None, error reply).
+        """
+        if not message:
+            Logger.error("No message provided to execute_workflow")
+            return None, "No message provided"
+
+        if not user or not user.userid:
+            Logger.error("No user provided to execute_workflow")
+            return None, "User authentication required"
+
+        Logger.info(f"Received message from user {user.userid}: {message}")
+
+        # Log incoming user message
+        try:
+            await self._log_user_message(user.phone_number, message, "text")
+        except Exception as e:
+            Logger.error(f"Error logging user message: {e}")
+
+        # Fetch chat history for the user
+        try:
+            chat_history = await self.chat_db.get_chat_history_by_userid(user.userid)
+            Logger.info(f"Fetched chat history for user {user.userid}")
         except Exception as e:
-            import traceback
-            Logger.error(f"{__name__}> execute_workflow -> Unexpected error in execute_workflow: {e}")
-            Logger.error(f"Traceback: {traceback.format_exc()}")
-            return "I'm sorry, I encountered an unexpected error. Please try again later."
+            Logger.error(f"Error fetching chat history for user {user.userid}: {e}")
+            chat_history = None
+
+        # Retrieve or create user
+        try:
+            updated_user = await self._get_or_create_user(user)
+            if not updated_user:
+                Logger.error(f"Failed to create or retrieve user {user.userid}")
+                return None, "User authentication failed"
+        except Exception as e:
+            Logger.error(f"Error getting or creating user: {e}")
+            return None, "User authentication failed"
+
+        # Build global context
+        try:
+            global_context = GlobalContext(
+                user=self._get_user_context(updated_user),
+                chat_history=self._get_chat_history_context(user.phone_number, chat_history),
+                coordinates=coordinates
+            )
+        except Exception as e:
+            Logger.error(f"Error building global context: {e}")
+            return None, "Error processing request"
+
+        return global_context, None
 
     async def _log_user_message(self, phone_number: str, raw_message: str, message_type: str):
         """Log user message to chat history."""
@@ -122,11 +178,19 @@ class WebBot:
                 type=message_type,
                 timestamp=_get_current_time()
             )
-            await self.chat_db.append_message(phone_number, message)
+            # Per-user queue, so one user's history writes never interleave
+            await KeyedWorkQueue.get("web").run(phone_number, lambda: self.chat_db.append_message(phone_number, message))
             Logger.info(f"Logged user message for {phone_number}: {raw_message}")
         except Exception as e:
             Logger.error(f"Error logging user message: {e}")
 
+    @staticmethod
+    def _schedule_history_summary(global_context: GlobalContext) -> None:
+        """Fold older messages into the stored summary in the background, if enabled and due."""
+        summarizer = HistorySummarizer.get()
+        if summarizer is not None:
+            summarizer.schedule(global_context.chat_history)
+
     async def _log_agent_message(self, phone_number: str, raw_message: str, message_type: str):
         """Log agent message to chat history."""
         try:
@@ -136,7 +200,8 @@ class WebBot:
                 type=message_type,
                 timestamp=_get_current_time()
             )
-            await self.chat_db.append_message(phone_number, message)
+            # Per-user queue, so one user's history writes never interleave
+            await KeyedWorkQueue.get("web").run(phone_number, lambda: self.chat_db.append_message(phone_number, message))
             Logger.info(f"Logged agent message for {phone_number}: {raw_message}")
         except Exception as e:
             Logger.error(f"Error logging agent message: {e}")
@@ -190,4 +255,6 @@ class WebBot:
         return ChatHistoryContext(
             phone_number=phone_number,
             messages=chat_history.messages if chat_history else [],
+            summary=chat_history.summary if chat_history else None,
+            summarized_count=(chat_history.summarized_count or 0) if chat_history else 0,
         )
\ No newline at end of file
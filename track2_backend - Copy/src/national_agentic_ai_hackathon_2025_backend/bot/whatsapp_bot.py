@@ -1,5 +1,8 @@
 from pywa_async import types
 from national_agentic_ai_hackathon_2025_backend._debug import Logger
+from national_agentic_ai_hackathon_2025_backend.utils.tracing import Tracer
+from national_agentic_ai_hackathon_2025_backend.utils.deadline import Deadline
+from national_agentic_ai_hackathon_2025_backend.utils.circuit_breaker import CircuitBreaker
 from national_agentic_ai_hackathon_2025_backend.database.user import UserDB
 from national_agentic_ai_hackathon_2025_backend.database.chat_history import ChatHistoryDB
 from national_agentic_ai_hackathon_2025_backend.handlers.whatsapp import WhatsappHandler
@@ -10,7 +13,11 @@ from national_agentic_ai_hackathon_2025_backend.context.global_context import Gl
 from national_agentic_ai_hackathon_2025_backend.utils._helpers import _get_current_time
 from national_agentic_ai_hackathon_2025_backend.schemas.user import User
 from national_agentic_ai_hackathon_2025_backend.handlers.workflow import WorkFlow
-from typing import Optional
+from national_agentic_ai_hackathon_2025_backend.handlers.history_summarizer import HistorySummarizer
+from national_agentic_ai_hackathon_2025_backend.handlers.idempotency import IdempotencyStore
+from national_agentic_ai_hackathon_2025_backend.handlers.debouncer import Batch, MessageDebouncer, Superseded
+from national_agentic_ai_hackathon_2025_backend.bot.work_queue import KeyedWorkQueue, QueueFullError
+from typing import List, Optional
 
 
 class WhatsappBot:
@@ -18,8 +25,32 @@ class WhatsappBot:
         self.user_db = UserDB()
         self.chat_db = ChatHistoryDB()
         self.whatsapp_handler = WhatsappHandler()
+        self.debouncer = MessageDebouncer.get()
+        self.queue = KeyedWorkQueue.get()
 
     async def execute_workflow(self, message: types.Message, message_type: str):
+        """
+        Process an incoming WhatsApp update at most once across all workers:
+        webhook retries of an update already claimed (or answered) by any
+        worker are dropped. See IdempotencyStore.
+        """
+        store = IdempotencyStore.get()
+        update_id = getattr(message, "id", None)
+        if store is None or not update_id:
+            await self._execute_workflow(message, message_type)
+            return
+
+        if not await store.claim(update_id):
+            Logger.info(f"Skipping duplicate WhatsApp update {update_id}")
+            return
+        try:
+            await self._execute_workflow(message, message_type)
+        except BaseException:
+            await store.release(update_id)
+            raise
+        await store.complete(update_id)
+
+    async def _execute_workflow(self, message: types.Message, message_type: str):
         """
         Main entry point to process incoming WhatsApp messages.
         Steps:
@@ -29,120 +60,157 @@ class WhatsappBot:
         4. Route message to appropriate agent
         5. Send agent's response back to WhatsApp and dashboard
         """
-        try:
-            if not message:
-                Logger.error("No message provided to execute_workflow")
-                return
+        with Tracer.trace("whatsapp.execute_workflow", request_id=getattr(message, "id", None), channel="whatsapp", message_type=message_type), Deadline.for_request():
+            try:
+                if not message:
+                    Logger.error("No message provided to execute_workflow")
+                    return
                 
-            if not message_type or not isinstance(message_type, str):
-                Logger.error(f"Invalid message type provided: {message_type}")
-                return
+                if not message_type or not isinstance(message_type, str):
+                    Logger.error(f"Invalid message type provided: {message_type}")
+                    return
+
+                if message_type not in {"text", "audio", "voice"}:
+                    Logger.warning(f"Unsupported message type: {message_type}")
+                    try:
+                        await message.reply("Unsupported message type.")
+                    except Exception as e:
+                        Logger.error(f"Failed to send unsupported message type reply: {e}")
+                    return
 
-            if message_type not in {"text", "audio", "voice"}:
-                Logger.warning(f"Unsupported message type: {message_type}")
+                # Identify business
                 try:
-                    await message.reply("Unsupported message type.")
+                    buisness_number, phone_number = self.whatsapp_handler._get_phone_numbers(message)
+                    if not buisness_number or not phone_number:
+                        Logger.error("Failed to extract phone numbers from message")
+                        return
                 except Exception as e:
-                    Logger.error(f"Failed to send unsupported message type reply: {e}")
-                return
-
-            # Identify business
-            try:
-                buisness_number, phone_number = self.whatsapp_handler._get_phone_numbers(message)
-                if not buisness_number or not phone_number:
-                    Logger.error("Failed to extract phone numbers from message")
+                    Logger.error(f"Error extracting phone numbers: {e}")
                     return
-            except Exception as e:
-                Logger.error(f"Error extracting phone numbers: {e}")
-                return
                 
-            try:
-                await message.mark_as_read()
-            except Exception as e:
-                Logger.warning(f"Failed to mark message as read: {e}")
+                try:
+                    await message.mark_as_read()
+                except Exception as e:
+                    Logger.warning(f"Failed to mark message as read: {e}")
                 
-            try:
-                raw_message = await self.whatsapp_handler._get_raw_message(message, message_type)
-                if not raw_message:
-                    Logger.warning(f"Failed to extract message content for type: {message_type}")
+                try:
+                    raw_message = await self.whatsapp_handler._get_raw_message(message, message_type)
+                    if not raw_message:
+                        Logger.warning(f"Failed to extract message content for type: {message_type}")
+                        return
+                except Exception as e:
+                    Logger.error(f"Error extracting raw message: {e}")
                     return
-            except Exception as e:
-                Logger.error(f"Error extracting raw message: {e}")
-                return
                 
-            Logger.info(f"Received message from {phone_number}: {raw_message}")
-            Logger.debug(f"Raw message object: {message}")
-            Logger.debug(f"Message metadata: {message.metadata if hasattr(message, 'metadata') else 'No metadata'}")
+                Logger.info(f"Received message from {phone_number}: {raw_message}")
+                Logger.debug(f"Raw message object: {message}")
+                Logger.debug(f"Message metadata: {message.metadata if hasattr(message, 'metadata') else 'No metadata'}")
 
-            # Fetch chat history
-            try:
-                chat_history = await self.chat_db.get_chat_history_by_phone(phone_number)
-                Logger.info(f"Fetched chat history for {phone_number}")
-                Logger.debug(f"Raw chat history: {chat_history}")
-            except Exception as e:
-                Logger.error(f"Error fetching chat history for {phone_number}: {e}")
-                chat_history = None
+                # save incoming user message; chat_history writes for a user go through their queue in order
+                saved = self.queue.submit(phone_number, lambda: self._log_and_save_user_message(phone_number, raw_message, message_type))
 
-            # save incoming user message
-            try:
-                await self._log_and_save_user_message(phone_number, raw_message, message_type)
-            except Exception as e:
-                Logger.error(f"Error logging user message: {e}")
+                # Join with the user's other messages arriving close together (runs alongside a queued reply, so it can supersede it)
+                batch = None
+                if self.debouncer is not None:
+                    batch = await self.debouncer.gather(phone_number, raw_message)
 
-            # Retrieve or create user
-            try:
-                user = await self._get_or_create_user(phone_number)
-                if not user:
-                    Logger.error(f"Failed to create or retrieve user for {phone_number}")
+                try:
+                    await saved
+                except Exception as e:
+                    Logger.error(f"Error logging user message: {e}")
+
+                if self.debouncer is None:
+                    await self.queue.run(phone_number, lambda: self._respond(message, phone_number, [raw_message], message_type))
                     return
-            except Exception as e:
-                Logger.error(f"Error getting or creating user: {e}")
-                return
+                if batch is None:
+                    Logger.info(f"Message from {phone_number} merged into a later batch")
+                    return
+                try:
+                    await self.queue.run(phone_number, lambda: self._respond(message, phone_number, batch.texts, message_type, batch))
+                finally:
+                    self.debouncer.discard(phone_number, batch)
 
-            # Build global context
-            try:
-                global_context = GlobalContext(
-                    user=self._get_user_context(user),
-                    chat_history=self._get_chat_history_context(phone_number, chat_history),
-                )
-            except Exception as e:
-                Logger.error(f"Error building global context: {e}")
-                return
+            except QueueFullError:
+                Logger.warning(f"Too many queued messages for {phone_number}, dropping update")
+                raise
 
-            # Process message
-            try:
-                await message.indicate_typing()
             except Exception as e:
-                Logger.warning(f"Failed to indicate typing: {e}")
-                
-            try:
-                wf = WorkFlow()
-                response = await wf.execute_workflow(raw_message, global_context)
-                
-                if not response:
-                    Logger.error("Agent returned no result")
-                    return
+                import traceback
+                Logger.error(f"{__name__}> execute_workflow -> Unexpected error in execute_workflow: {e}")
+                Logger.error(f"Traceback: {traceback.format_exc()}")
+                try:
+                    # Try to send error message to user
+                    if 'phone_number' in locals():
+                        await self.whatsapp_handler.send_whatsapp_message(
+                            phone_number, 
+                            "I'm sorry, I encountered an error processing your message. Please try again later.",
+                            "text"
+                        )
+                except Exception as send_error:
+                    Logger.error(f"{__name__}> execute_workflow -> Failed to send error message to user: {send_error}")
 
-                await self._log_agent_message(phone_number, response, message_type)
-                await self.whatsapp_handler.send_whatsapp_message(phone_number, response, message_type)
-            except Exception as e:
-                Logger.error(f"Error sending agent response: {e}")
+    async def _respond(self, message: types.Message, phone_number: str, texts: List[str], message_type: str, batch: Optional[Batch] = None):
+        """
+        Run the workflow for one or more user messages (already saved to the
+        history) and send the reply. With a debounce batch, the run is
+        cancelled if a newer message from the user supersedes it.
+        """
+        raw_message = "\n".join(texts)
 
+        # Fetch chat history, without the messages being answered now
+        try:
+            chat_history = await self.chat_db.get_chat_history_by_phone(phone_number)
+            Logger.info(f"Fetched chat history for {phone_number}")
+            Logger.debug(f"Raw chat history: {chat_history}")
         except Exception as e:
-            import traceback
-            Logger.error(f"{__name__}> execute_workflow -> Unexpected error in execute_workflow: {e}")
-            Logger.error(f"Traceback: {traceback.format_exc()}")
-            try:
-                # Try to send error message to user
-                if 'phone_number' in locals():
-                    await self.whatsapp_handler.send_whatsapp_message(
-                        phone_number, 
-                        "I'm sorry, I encountered an error processing your message. Please try again later.",
-                        "text"
-                    )
-            except Exception as send_error:
-                Logger.error(f"{__name__}> execute_workflow -> Failed to send error message to user: {send_error}")
+            Logger.error(f"Error fetching chat history for {phone_number}: {e}")
+            chat_history = None
+        chat_history = self._without_pending(chat_history, texts)
 
+        # Retrieve or create user
+        try:
+            user = await self._get_or_create_user(phone_number)
+            if not user:
+                Logger.error(f"Failed to create or retrieve user for {phone_number}")
+                return
+        except Exception as e:
+            Logger.error(f"Error getting or creating user: {e}")
+            return
+
+        # Build global context
+        try:
+            global_context = GlobalContext(
+                user=self._get_user_context(user),
+                chat_history=self._get_chat_history_context(phone_number, chat_history),
+            )
+        except Exception as e:
+            Logger.error(f"Error building global context: {e}")
+            return
+
+        # Process message
+        try:
+            await message.indicate_typing()
+        except Exception as e:
+            Logger.warning(f"Failed to indicate typing: {e}")
+        
+        try:
+            wf = WorkFlow()
+            if batch is None:
+                response = await wf.execute_workflow(raw_message, global_context)
+            else:
+                response = await self.debouncer.run(phone_number, batch, lambda: wf.execute_workflow(raw_message, global_context))
+        
+            if not response:
+                Logger.error("Agent returned no result")
+                return
+
+            await self._log_agent_message(phone_number, response, message_type)
+            await self.whatsapp_handler.send_whatsapp_message(phone_number, response, message_type)
+            self._schedule_history_summary(global_context)
+        except Superseded:
+            Logger.info(f"Run for {phone_number} superseded by a newer message")
+        except Exception as e:
+            Logger.error(f"Error sending agent response: {e}")
 
     async def _log_and_save_user_message(self, phone_number: str, raw_message: str, message_type: str):
         message = Message(
@@ -154,6 +222,13 @@ class WhatsappBot:
         await self.chat_db.append_message(phone_number, message)
         Logger.info(f"Logged user message for {phone_number}: {raw_message}")
 
+    @staticmethod
+    def _schedule_history_summary(global_context: GlobalContext) -> None:
+        """Fold older messages into the stored summary in the background, if enabled and due."""
+        summarizer = HistorySummarizer.get()
+        if summarizer is not None:
+            summarizer.schedule(global_context.chat_history)
+
     async def _log_agent_message(self, phone_number: str, raw_message: str, message_type: str):
         message = Message(
             content=raw_message,
@@ -185,6 +260,10 @@ class WhatsappBot:
             if create_result and create_result.get("success"):
                 Logger.success(f"Created new user {phone_number}")
                 return new_user
+            elif CircuitBreaker.get("supabase").is_open:
+                # Keep answering while the database is down; the user is saved on a later message
+                Logger.warning(f"Supabase unavailable, continuing with an unsaved user for {phone_number}")
+                return new_user
             else:
                 Logger.error(f"Failed to create user {phone_number}: {create_result}")
                 return None
@@ -202,10 +281,23 @@ class WhatsappBot:
             email=getattr(user, "email", "") or "",
         )
 
+    @staticmethod
+    def _without_pending(chat_history: Optional[ChatHistory], texts: List[str]) -> Optional[ChatHistory]:
+        """Drop the trailing user messages that are about to be answered, so the agents don't see them twice."""
+        if not chat_history or not chat_history.messages:
+            return chat_history
+        messages = list(chat_history.messages)
+        remaining = list(texts)
+        while messages and remaining and messages[-1].sender == "user" and messages[-1].content in remaining:
+            remaining.remove(messages.pop().content)
+        return chat_history.model_copy(update={"messages": messages})
+
     @staticmethod
     def _get_chat_history_context(phone_number: str, chat_history: ChatHistory) -> ChatHistoryContext:
         """Convert ChatHistory schema to ChatHistoryContext."""
         return ChatHistoryContext(
             phone_number=phone_number,
             messages=chat_history.messages if chat_history else [],
+            summary=chat_history.summary if chat_history else None,
+            summarized_count=(chat_history.summarized_count or 0) if chat_history else 0,
         )
\ No newline at end of file
@@ -0,0 +1,127 @@
+import asyncio
+import contextvars
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+from national_agentic_ai_hackathon_2025_backend.config import Config
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.model_policy import ModelPolicy
+from national_agentic_ai_hackathon_2025_backend.utils.metrics import Metrics
+from national_agentic_ai_hackathon_2025_backend._debug import Logger
+
+
+class QueueFullError(Exception):
+    """The key already has ``max_depth_per_key`` jobs waiting."""
+
+
+@dataclass
+class _Job:
+    work: Callable[[], Awaitable[Any]]
+    future: asyncio.Future
+    context: contextvars.Context
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class KeyedWorkQueue:
+    """
+    Async work queue that runs jobs for the same key (phone number) one at a
+    time, in submission order, while jobs for different keys run in parallel.
+
+    At most ``max_concurrency`` jobs run at once. Keys with waiting jobs are
+    served round-robin, one job per turn, so a user with a long backlog cannot
+    starve the others. Each key holds at most ``max_depth_per_key`` waiting
+    jobs; ``submit`` raises QueueFullError beyond that.
+
+    Jobs run in the submitter's context (trace, deadline); cancelling the
+    future returned by ``submit`` cancels the job.
+    """
+
+    def __init__(self, name: str, max_concurrency: int = 64, max_depth_per_key: int = 20) -> None:
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_depth_per_key = max_depth_per_key
+        self._waiting: Dict[str, Deque[_Job]] = {}
+        self._ready: Deque[str] = deque()
+        self._busy: set = set()
+        self._running = 0
+
+    def submit(self, key: str, work: Callable[[], Awaitable[Any]]) -> asyncio.Future:
+        """Queue ``work()`` behind the key's earlier jobs; returns a future for its result."""
+        waiting = self._waiting.setdefault(key, deque())
+        if len(waiting) >= self.max_depth_per_key:
+            Metrics.increment(f"queue.{self.name}.rejected")
+            raise QueueFullError(f"{len(waiting)} jobs already waiting for {key}")
+
+        job = _Job(work=work, future=asyncio.get_running_loop().create_future(), context=contextvars.copy_context())
+        waiting.append(job)
+        Metrics.increment(f"queue.{self.name}.submitted")
+        if key not in self._busy and len(waiting) == 1:
+            self._ready.append(key)
+        self._dispatch()
+        return job.future
+
+    async def run(self, key: str, work: Callable[[], Awaitable[Any]]) -> Any:
+        """Submit and wait for the result."""
+        return await self.submit(key, work)
+
+    def depth(self) -> int:
+        """Jobs waiting to start, across all keys."""
+        return sum(len(waiting) for waiting in self._waiting.values())
+
+    def _dispatch(self) -> None:
+        while self._ready and self._running < self.max_concurrency:
+            key = self._ready.popleft()
+            waiting = self._waiting.get(key)
+            job = waiting.popleft() if waiting else None
+            if waiting is not None and not waiting:
+                del self._waiting[key]
+            if job is None:
+                continue
+            if job.future.cancelled():
+                self._requeue(key)
+                continue
+
+            Metrics.observe(f"queue.{self.name}.wait", time.perf_counter() - job.enqueued_at)
+            self._busy.add(key)
+            self._running += 1
+            task = asyncio.create_task(job.work(), context=job.context)
+            job.future.add_done_callback(lambda future, task=task: task.cancel() if future.cancelled() else None)
+            task.add_done_callback(lambda task, key=key, job=job: self._finish(key, job, task))
+
+    def _finish(self, key: str, job: _Job, task: asyncio.Task) -> None:
+        self._running -= 1
+        self._busy.discard(key)
+        if job.future.done():
+            if not task.cancelled():
+                task.exception()  # mark retrieved; the submitter stopped waiting
+        else:
+            if task.cancelled():
+                job.future.cancel()
+            elif task.exception() is not None:
+                job.future.set_exception(task.exception())
+            else:
+                job.future.set_result(task.result())
+        self._requeue(key)
+        self._dispatch()
+
+    def _requeue(self, key: str) -> None:
+        # Back of the line: other keys get a turn before this key's next job
+        if self._waiting.get(key) and key not in self._busy:
+            self._ready.append(key)
+
+    @classmethod
+    def get(cls, name: str = "whatsapp") -> "KeyedWorkQueue":
+        """Process-wide per-user work queue for a channel ("whatsapp", "web")."""
+        queue = _queues.get(name)
+        if queue is None:
+            queue = _queues[name] = cls(
+                name,
+                max_concurrency=Config.get_int("USER_QUEUE_MAX_CONCURRENCY", 64),
+                max_depth_per_key=Config.get_int("USER_QUEUE_MAX_DEPTH", 20),
+            )
+            ModelPolicy.register_queue(queue.name, queue.depth)
+            Logger.info(f"Per-user {name} work queue ready (concurrency {queue.max_concurrency}, depth {queue.max_depth_per_key})")
+        return queue
+
+
+_queues: Dict[str, KeyedWorkQueue] = {}
@@ -52,6 +52,34 @@ class Config:
             Logger.error(f"{__name__}> get -> Error getting configuration value for key '{key}': {e}")
             return default
     
+    @classmethod
+    def get_bool(cls, key: str, default: bool = False) -> bool:
+        """Get a boolean configuration value ("1", "true", "yes", "on" are truthy)"""
+        value = cls.get(key)
+        if value is None or not value.strip():
+            return default
+        return value.strip().lower() in {"1", "true", "yes", "on"}
+
+    @classmethod
+    def get_int(cls, key: str, default: int = 0) -> int:
+        """Get an integer configuration value, falling back to default if unparsable"""
+        value = cls.get(key)
+        try:
+            return int(value) if value is not None and value.strip() else default
+        except ValueError:
+            Logger.warning(f"Invalid integer for configuration key '{key}': {value}")
+            return default
+
+    @classmethod
+    def get_float(cls, key: str, default: float = 0.0) -> float:
+        """Get a float configuration value, falling back to default if unparsable"""
+        value = cls.get(key)
+        try:
+            return float(value) if value is not None and value.strip() else default
+        except ValueError:
+            Logger.warning(f"Invalid float for configuration key '{key}': {value}")
+            return default
+
     @classmethod
     def get_required(cls, key: str) -> str:
         """Get required configuration value, raise error if missing"""
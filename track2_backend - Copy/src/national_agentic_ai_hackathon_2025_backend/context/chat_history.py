@@ -1,16 +1,46 @@
 from datetime import datetime
-from typing import Optional, List
-from pydantic import BaseModel
+from typing import Dict, Optional, List, Tuple
+from pydantic import BaseModel, PrivateAttr
 from national_agentic_ai_hackathon_2025_backend.schemas.chat_history import Message
+from national_agentic_ai_hackathon_2025_backend.config import Config
+from national_agentic_ai_hackathon_2025_backend.utils.metrics import Metrics
+
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 4
+
+DEFAULT_HISTORY_TOKEN_BUDGET = 800
+# Triage only needs enough context to resolve follow-ups ("yes, send them")
+AGENT_HISTORY_TOKEN_BUDGETS = {
+    "guidance": 400,
+    "orchestrator": 300,
+    "triage": 400,
+    # Degraded mode serves slow connections; keep its prompt small
+    "degraded": 300,
+}
+DEFAULT_MAX_MESSAGE_TOKENS = 200
+DEFAULT_MAX_MESSAGES = 10
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token), good enough for budgeting prompts."""
+    if not text:
+        return 0
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
 
 class ChatHistoryContext(BaseModel):
     phone_number: str
     messages: List[Message] = []
     formatted_messages: Optional[str] = None
+    # Rolling summary of messages[:summarized_count], maintained by HistorySummarizer
+    summary: Optional[str] = None
+    summarized_count: int = 0
+
+    _formatted_by_agent: Dict[str, str] = PrivateAttr(default_factory=dict)
 
     def set_message_limit(self, limit: int):
         self.generate_formatted_messages(limit=limit)
-        return self.formatted_messages 
+        return self.formatted_messages
 
     def generate_formatted_messages(self, limit: int = 10) -> str:
         """
@@ -19,33 +49,104 @@ class ChatHistoryContext(BaseModel):
         if not self.messages:
             return ""
 
-        lines = []
-        
-        for msg in self.messages[-limit:]:
-            # Format time
-            msg_time = datetime.fromisoformat(msg.timestamp)
-            time_str = msg_time.strftime("%Y-%m-%d %H:%M")
+        lines = [self.format_message(msg) for msg in self.messages[-limit:]]
+        self.formatted_messages = self._wrap(lines)
+        return self.formatted_messages
+
+    def for_agent(self, agent: str) -> str:
+        """
+        History block for one agent's prompt, fitted to that agent's token
+        budget: HISTORY_TOKEN_BUDGET_<AGENT> if set, else the agent's default
+        in AGENT_HISTORY_TOKEN_BUDGETS, else HISTORY_TOKEN_BUDGET. Built once
+        per request and agent.
+        """
+        if agent not in self._formatted_by_agent:
+            default_budget = AGENT_HISTORY_TOKEN_BUDGETS.get(agent, Config.get_int("HISTORY_TOKEN_BUDGET", DEFAULT_HISTORY_TOKEN_BUDGET))
+            budget = Config.get_int(f"HISTORY_TOKEN_BUDGET_{agent.upper()}", default_budget)
+            text, tokens, count = self.build_history(budget)
+            self._formatted_by_agent[agent] = text
+
+            Metrics.increment(f"history.{agent}.builds")
+            Metrics.increment(f"history.{agent}.messages", count)
+            Metrics.increment(f"history.{agent}.tokens", tokens)
+            # What the fixed last-10 history would have cost, for comparison
+            Metrics.increment(f"history.{agent}.baseline_tokens", estimate_tokens(self.formatted_messages or ""))
+        return self._formatted_by_agent[agent]
+
+    def build_history(
+        self,
+        budget_tokens: int,
+        max_message_tokens: Optional[int] = None,
+        max_messages: Optional[int] = None,
+    ) -> Tuple[str, int, int]:
+        """
+        Fit the summary plus the most recent unsummarised messages into
+        ``budget_tokens``. Walks backwards from the newest message, truncating
+        long messages to ``max_message_tokens``, and stops at the first one
+        that no longer fits. Returns (text, estimated tokens, messages included).
+        """
+        if max_message_tokens is None:
+            max_message_tokens = Config.get_int("HISTORY_MAX_MESSAGE_TOKENS", DEFAULT_MAX_MESSAGE_TOKENS)
+        if max_messages is None:
+            max_messages = Config.get_int("HISTORY_MAX_MESSAGES", DEFAULT_MAX_MESSAGES)
+
+        summary_line = ""
+        if self.summary and self.summarized_count:
+            # The summary may use at most half the budget; recent turns matter more
+            summary_line = "Summary of earlier conversation: " + self._truncate(self.summary, budget_tokens // 2)
+        used = estimate_tokens(summary_line)
+
+        lines: List[str] = []
+        recent = self.messages[min(self.summarized_count, len(self.messages)):]
+        for msg in reversed(recent[-max_messages:] if max_messages > 0 else []):
+            line = self.format_message(msg, max_message_tokens)
+            cost = estimate_tokens(line) + MESSAGE_OVERHEAD_TOKENS
+            if used + cost > budget_tokens:
+                break
+            lines.append(line)
+            used += cost
+        lines.reverse()
 
-            # Show content differently if not text
-            if msg.type == "text":
-                content_display = msg.content
-            else:
-                content_display = f"[{msg.type.upper()}] {msg.content}"
+        if summary_line:
+            lines.insert(0, summary_line)
+        if not lines:
+            return "", 0, 0
+        return self._wrap(lines), used, len(lines) - (1 if summary_line else 0)
 
-            # Capitalize sender
-            sender_name = msg.sender.capitalize()
+    @classmethod
+    def format_message(cls, msg: Message, max_tokens: Optional[int] = None) -> str:
+        content = cls._truncate(msg.content, max_tokens) if max_tokens else msg.content
 
-            lines.append(f"[{time_str}] {sender_name}: {content_display}")
+        # Show content differently if not text
+        if msg.type == "text":
+            content_display = content
+        else:
+            content_display = f"[{msg.type.upper()}] {content}"
 
-        self.formatted_messages = (
+        # Capitalize sender
+        sender_name = msg.sender.capitalize()
+
+        if not msg.timestamp:
+            return f"{sender_name}: {content_display}"
+        time_str = datetime.fromisoformat(msg.timestamp).strftime("%Y-%m-%d %H:%M")
+        return f"[{time_str}] {sender_name}: {content_display}"
+
+    @staticmethod
+    def _truncate(text: str, max_tokens: int) -> str:
+        max_chars = max_tokens * CHARS_PER_TOKEN
+        if len(text) <= max_chars:
+            return text
+        return text[:max_chars].rstrip() + " …"
+
+    @staticmethod
+    def _wrap(lines: List[str]) -> str:
+        return (
             "\n---\n" +
             "**Chat History**\n"
             + "\n".join(lines) +
             "\n---\n"
         )
 
-        return self.formatted_messages
-
     def __init__(self, **data):
         super().__init__(**data)
         self.generate_formatted_messages()
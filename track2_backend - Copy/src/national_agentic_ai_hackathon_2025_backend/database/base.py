@@ -1,10 +1,60 @@
+import inspect
+import httpx
 from supabase import create_client, Client
 from national_agentic_ai_hackathon_2025_backend.config import Config
+from national_agentic_ai_hackathon_2025_backend.utils.tracing import Tracer
+from national_agentic_ai_hackathon_2025_backend.utils.circuit_breaker import CircuitBreaker
+
+
+def escape_like(value: str) -> str:
+    """``value`` with the LIKE wildcards escaped, to match it literally in ``like``/``ilike`` filters."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _is_supabase_failure(error: BaseException) -> bool:
+    # Network-level errors only; PostgREST APIErrors (bad query, missing row) are not outages
+    return isinstance(error, (httpx.TransportError, OSError))
+
+
+class _Guarded:
+    """
+    Proxy over the Supabase client and the query builders it returns: every
+    ``.execute()`` runs through the ``supabase`` circuit breaker, so an open
+    breaker makes DB methods fail fast into their existing error handling.
+    """
+
+    def __init__(self, target, breaker: CircuitBreaker):
+        self._target = target
+        self._breaker = breaker
+
+    def _wrap(self, value):
+        return _Guarded(value, self._breaker) if hasattr(value, "execute") else value
+
+    def execute(self, *args, **kwargs):
+        return self._breaker.call(self._target.execute, *args, **kwargs)
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return self._wrap(attr)
+
+        def call(*args, **kwargs):
+            return self._wrap(attr(*args, **kwargs))
+        return call
+
 
 class DataBase:
     def __init__(self):
         self._connect_to_db()
 
+    def __init_subclass__(cls, **kwargs):
+        # Every public async DB method becomes a span ("db.<Class>.<method>")
+        super().__init_subclass__(**kwargs)
+        for name, attr in list(vars(cls).items()):
+            if not name.startswith("_") and inspect.iscoroutinefunction(attr):
+                setattr(cls, name, Tracer.traced(f"db.{cls.__name__}.{name}")(attr))
+
     def _connect_to_db(self):
         config = Config()
-        self.supabase: Client = create_client(config.get("SUPABASE_URL"), config.get("SUPABASE_SERVICE_ROLE_KEY"))
\ No newline at end of file
+        client = create_client(config.get("SUPABASE_URL"), config.get("SUPABASE_SERVICE_ROLE_KEY"))
+        self.supabase: Client = _Guarded(client, CircuitBreaker.get("supabase", is_failure=_is_supabase_failure))
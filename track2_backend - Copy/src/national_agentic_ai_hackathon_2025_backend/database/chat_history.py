@@ -9,7 +9,8 @@ class ChatHistoryDB(DataBase):
 
     async def create_chat_history(self, chat_history: ChatHistory) -> Dict[str, Any]:
         # Insert a new chat history record into the database using supabase.table
-        data = chat_history.model_dump()
+        # (summary columns are written only by update_summary)
+        data = chat_history.model_dump(exclude={"summary", "summarized_count"})
         try:
             result = self.supabase.table(self.table_name).insert(data).execute()
             return {"success": True, "data": result.data[0] if result.data else None}
@@ -75,6 +76,16 @@ class ChatHistoryDB(DataBase):
                 pass
             return chat_history
 
+    async def update_summary(self, phone_number: str, summary: str, summarized_count: int) -> bool:
+        # Persist the rolling summary of the first summarized_count messages
+        try:
+            result = self.supabase.table(self.table_name).update(
+                {"summary": summary, "summarized_count": summarized_count}
+            ).eq("phone_number", phone_number).execute()
+            return bool(result.data)
+        except Exception as e:
+            return False
+
     async def get_all_chat_histories(self) -> List[ChatHistory]:
         # Retrieve all chat histories using supabase.table
         try:
@@ -0,0 +1,367 @@
+import asyncio
+import math
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from national_agentic_ai_hackathon_2025_backend.config import Config
+from national_agentic_ai_hackathon_2025_backend.database.facility_snapshot import (
+    FacilitySnapshot,
+    _coordinates,
+    cell_grid,
+    fetch_table,
+)
+from national_agentic_ai_hackathon_2025_backend.utils.geo import (
+    EARTH_RADIUS_KM,
+    KM_PER_DEGREE,
+    bounding_box_offsets,
+    haversine_km_many,
+    haversine_km_radians,
+)
+from national_agentic_ai_hackathon_2025_backend.utils.metrics import Metrics
+from national_agentic_ai_hackathon_2025_backend._debug import Logger
+
+FACILITY_TABLES = ("health_facility", "police_facility")
+
+# An overlay entry: (lat, lng, cos lat) in radians or None, lower-cased amenity and speciality, row
+_Extra = Tuple[Optional[Tuple[float, float, float]], str, str, Dict[str, Any]]
+
+
+def rank_by_distance(
+    rows: List[Dict[str, Any]], latitude: float, longitude: float, radius_km: float
+) -> List[Dict[str, Any]]:
+    """Rows within ``radius_km``, nearest first, with ``distance_km`` added (one vectorized pass)."""
+    located = [(row, point) for row in rows if (point := _coordinates(row)) is not None]
+    if not located:
+        return []
+    coordinates = np.array([point for _, point in located], dtype=np.float64)
+    distances = haversine_km_many(latitude, longitude, coordinates[:, 0], coordinates[:, 1])
+    ranked = []
+    for index in np.argsort(distances, kind="stable").tolist():
+        if distances[index] > radius_km:
+            break
+        row = located[index][0]
+        row["distance_km"] = float(distances[index])
+        ranked.append(row)
+    return ranked
+
+
+def nearest_in_bounding_boxes(
+    fetch: Callable[[float], List[Dict[str, Any]]],
+    latitude: float,
+    longitude: float,
+    k: int,
+    max_radius_km: float,
+    page_size: int,
+    max_queries: int = 8,
+) -> List[Dict[str, Any]]:
+    """
+    The ``k`` nearest rows within ``max_radius_km``, for a database that can
+    only return ``page_size`` unordered rows per bounding box (``fetch(radius_km)``).
+
+    A full page may have cut off nearer rows, so the radius is bisected
+    until a box comes back complete with at least ``k`` rows in range (then
+    they are the k nearest), or the box at ``max_radius_km`` itself is
+    complete. After ``max_queries`` boxes the best complete box is used, or
+    failing that the last truncated one.
+    """
+    complete_km, truncated_km = 0.0, max_radius_km
+    radius_km = max_radius_km
+    best: List[Dict[str, Any]] = []
+    for _ in range(max_queries):
+        rows = fetch(radius_km)
+        ranked = rank_by_distance(rows, latitude, longitude, radius_km)
+        if len(rows) < page_size:
+            if len(ranked) >= k or radius_km >= max_radius_km:
+                return ranked[:k]
+            complete_km, best = radius_km, ranked
+        else:
+            truncated_km = radius_km
+            if complete_km == 0.0:
+                best = ranked
+        radius_km = (complete_km + truncated_km) / 2
+    return best[:k]
+
+
+class FacilityIndex:
+    """
+    In-memory spatial index over one facility table.
+
+    The facilities live in a FacilitySnapshot (columnar, possibly
+    memory-mapped from disk) whose slots are bucketed into a grid of
+    ``cell_degrees`` cells that wraps at the antimeridian. A radius query
+    gathers the slots in the cells overlapping the search box (longitude
+    span widened by 1/cos(latitude)) and ranks them with one vectorized
+    haversine pass; a k-nearest query repeats that with a doubling radius
+    until k facilities fall inside it. ``amenity`` matches exactly
+    (case-insensitive) and ``speciality`` as a substring, like the
+    PostgREST queries they replace.
+
+    Writes made through this process (``upsert``/``remove``) go to a small
+    overlay on top of the read-only snapshot; other workers pick them up
+    when their snapshot is rebuilt.
+    """
+
+    def __init__(
+        self,
+        rows: Iterable[Dict[str, Any]] = (),
+        cell_degrees: float = 0.05,
+        snapshot: Optional[FacilitySnapshot] = None,
+    ) -> None:
+        self.cell_degrees = cell_degrees
+        self.snapshot = snapshot if snapshot is not None else FacilitySnapshot.from_rows(rows, cell_degrees=cell_degrees)
+        self._columns = max(1, round(360 / cell_degrees))
+        if self.snapshot.cell_degrees == cell_degrees:
+            grid = self.snapshot.arrays
+        else:
+            grid = cell_grid(np.degrees(self.snapshot.lat), np.degrees(self.snapshot.lng), cell_degrees)
+        self._cell_keys = grid["_cell_keys"]
+        self._cell_starts = grid["_cell_starts"]
+        self._cell_order = grid["_cell_order"]
+        # Snapshot slots removed or replaced through this process, and rows added on top
+        self._dead: set = set()
+        self._dead_slots = np.empty(0, dtype=np.int64)
+        self._dead_located = 0
+        self._extra: Dict[Any, _Extra] = {}
+        # Lower-cased string tables of the filter columns, decoded on first use
+        self._tables: Dict[str, List[str]] = {}
+
+    def __len__(self) -> int:
+        """Facilities with coordinates."""
+        extra = sum(entry[0] is not None for entry in self._extra.values())
+        return len(self._cell_order) - self._dead_located + extra
+
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_degrees), math.floor(lng / self.cell_degrees) % self._columns
+
+    def upsert(self, row: Dict[str, Any]) -> None:
+        """Add or replace a facility (keyed by osm_id). Rows without coordinates are kept but never returned by location."""
+        key = row.get("osm_id")
+        if key is None:
+            return
+        self.remove(key)
+        point = _coordinates(row)
+        position = None
+        if point is not None:
+            lat, lng = math.radians(point[0]), math.radians(point[1])
+            position = (lat, lng, math.cos(lat))
+        amenity = str(row.get("amenity") or "").lower()
+        speciality = str(row.get("speciality") or "").lower()
+        self._extra[key] = (position, amenity, speciality, dict(row))
+
+    def remove(self, key: Any) -> None:
+        if self._extra.pop(key, None) is not None:
+            return
+        slot = self.snapshot.slot(key)
+        if slot is None or slot in self._dead:
+            return
+        self._dead.add(slot)
+        self._dead_slots = np.array(sorted(self._dead), dtype=np.int64)
+        if not math.isnan(self.snapshot.lat[slot]):
+            self._dead_located += 1
+
+    def rows(self, batch: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Every facility, with or without coordinates."""
+        for start in range(0, len(self.snapshot), batch):
+            live = [slot for slot in range(start, min(start + batch, len(self.snapshot))) if slot not in self._dead]
+            yield from self.snapshot.rows_at(live)
+        for _, _, _, row in self._extra.values():
+            yield dict(row)
+
+    def _table(self, column: str) -> Optional[List[str]]:
+        if self.snapshot.columns.get(column) != "str":
+            return None
+        if column not in self._tables:
+            self._tables[column] = [text.lower() for text in self.snapshot.strings(column)]
+        return self._tables[column]
+
+    def _mask(self, slots: np.ndarray, column: str, matches: Callable[[str], bool]) -> np.ndarray:
+        """Which ``slots`` have a ``column`` value satisfying ``matches`` (evaluated once per distinct value)."""
+        table = self._table(column)
+        if table is None:
+            return np.zeros(len(slots), dtype=bool)
+        # Trailing False so null codes (-1) never match
+        hits = np.array([matches(text) for text in table] + [False], dtype=bool)
+        return hits[self.snapshot.arrays[f"{column}.codes"][slots]]
+
+    def _gather(self, cy: int, cx: int, lat_cells: int, lng_cells: int) -> np.ndarray:
+        """Snapshot slots in the cells of the box around (cy, cx)."""
+        lo, hi = cx - lng_cells, cx + lng_cells
+        if hi - lo + 1 >= self._columns:
+            spans = [(0, self._columns - 1)]
+        elif lo % self._columns <= hi % self._columns:
+            spans = [(lo % self._columns, hi % self._columns)]
+        else:
+            spans = [(lo % self._columns, self._columns - 1), (0, hi % self._columns)]
+        rows = np.arange(cy - lat_cells, cy + lat_cells + 1, dtype=np.int64) * self._columns
+        pieces = []
+        for first, last in spans:
+            # Within a row of cells the keys are contiguous, so each row is one slice of the order
+            left = np.searchsorted(self._cell_keys, rows + first, side="left")
+            right = np.searchsorted(self._cell_keys, rows + last, side="right")
+            for a, b in zip(left.tolist(), right.tolist()):
+                if b > a:
+                    pieces.append(self._cell_order[self._cell_starts[a]:self._cell_starts[b]])
+        return np.concatenate(pieces) if pieces else np.empty(0, dtype=np.int64)
+
+    def _search(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        amenity: Optional[str],
+        speciality: Optional[str],
+    ) -> Tuple[np.ndarray, np.ndarray, List[Dict[str, Any]], bool]:
+        """
+        (distances, slots, overlay rows) of the matching facilities within
+        ``radius_km``, unordered, and whether every facility was considered.
+        Slots from ``len(snapshot)`` up index the overlay rows.
+        """
+        lat, lng = math.radians(latitude), math.radians(longitude)
+        lat_cells = math.ceil(radius_km / (KM_PER_DEGREE * self.cell_degrees))
+        _, lng_offset = bounding_box_offsets(latitude, radius_km)
+        lng_cells = math.ceil(lng_offset / self.cell_degrees)
+        complete = (2 * lng_cells + 1) * (2 * lat_cells + 1) > len(self._cell_keys)
+        if complete:
+            # Huge radius: walking the occupied cells is cheaper than walking the box
+            slots = self._cell_order
+        else:
+            slots = self._gather(*self._cell(latitude, longitude), lat_cells, lng_cells)
+        if self._dead:
+            slots = slots[~np.isin(slots, self._dead_slots)]
+        if amenity:
+            wanted = amenity.lower()
+            slots = slots[self._mask(slots, "amenity", lambda text: text == wanted)]
+        snapshot = self.snapshot
+        distances = haversine_km_radians(lat, lng, snapshot.lat[slots], snapshot.lng[slots], snapshot.cos_lat[slots])
+        inside = distances <= radius_km
+        distances, slots = distances[inside], slots[inside]
+        if speciality:
+            needle = speciality.lower()
+            keep = self._mask(slots, "speciality", lambda text: needle in text)
+            distances, slots = distances[keep], slots[keep]
+
+        extra_rows, extra_distances = [], []
+        for position, extra_amenity, extra_speciality, row in self._extra.values():
+            if position is None or (amenity and extra_amenity != amenity.lower()):
+                continue
+            if speciality and speciality.lower() not in extra_speciality:
+                continue
+            distance = float(haversine_km_radians(lat, lng, *position))
+            if distance <= radius_km:
+                extra_rows.append(row)
+                extra_distances.append(distance)
+        if extra_rows:
+            distances = np.concatenate([distances, extra_distances])
+            slots = np.concatenate([slots, len(snapshot) + np.arange(len(extra_rows))])
+        return distances, slots, extra_rows, complete
+
+    def _ranked(
+        self, distances: np.ndarray, slots: np.ndarray, extra_rows: List[Dict[str, Any]], limit: Optional[int]
+    ) -> List[Dict[str, Any]]:
+        if limit is not None and limit < len(distances):
+            nearest = np.argpartition(distances, limit)[:limit]
+            distances, slots = distances[nearest], slots[nearest]
+        order = np.lexsort((slots, distances))
+        distances, slots = distances[order], slots[order]
+        base = len(self.snapshot)
+        from_snapshot = iter(self.snapshot.rows_at(slots[slots < base]))
+        results = []
+        for distance, slot in zip(distances.tolist(), slots.tolist()):
+            row = next(from_snapshot) if slot < base else dict(extra_rows[slot - base])
+            row["distance_km"] = distance
+            results.append(row)
+        return results
+
+    def within(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        limit: Optional[int] = None,
+        amenity: Optional[str] = None,
+        speciality: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Facilities within ``radius_km``, nearest first, with ``distance_km`` added."""
+        if limit is not None:
+            # The first ``limit`` within the radius are the ``limit`` nearest: no need to rank the whole circle
+            return self.nearest(latitude, longitude, limit, radius_km, amenity, speciality)
+        distances, slots, extra_rows, _ = self._search(latitude, longitude, radius_km, amenity, speciality)
+        return self._ranked(distances, slots, extra_rows, None)
+
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int = 5,
+        max_radius_km: Optional[float] = None,
+        amenity: Optional[str] = None,
+        speciality: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """The ``k`` nearest facilities (optionally within ``max_radius_km``), nearest first."""
+        if k <= 0 or not len(self):
+            return []
+        limit_km = max_radius_km if max_radius_km is not None else math.pi * EARTH_RADIUS_KM
+        # Half a cell keeps the first box to the 3 x 3 cells around the origin
+        radius_km = min(limit_km, KM_PER_DEGREE * self.cell_degrees / 2)
+        while True:
+            # Everything within radius_km was considered, so k matches inside it are the k nearest
+            distances, slots, extra_rows, complete = self._search(latitude, longitude, radius_km, amenity, speciality)
+            if len(slots) >= k or radius_km >= limit_km:
+                return self._ranked(distances, slots, extra_rows, k)
+            # Once the whole index is being scanned anyway, widen straight to the limit
+            radius_km = limit_km if complete else min(limit_km, radius_km * 2)
+
+    @classmethod
+    def get(cls, table: str) -> Optional["FacilityIndex"]:
+        """The loaded index for ``table``, or None before ``load_all`` (or when FACILITY_INDEX_ENABLED is off)."""
+        return _indexes.get(table)
+
+    @classmethod
+    async def load_all(cls, page_size: int = 1000) -> None:
+        """
+        Load every facility table. Called at startup when FACILITY_INDEX_ENABLED
+        is on. A snapshot in FACILITY_SNAPSHOT_DIR (see
+        scripts/build_facility_snapshot.py) is memory-mapped; tables without
+        one, or whose snapshot is older than FACILITY_SNAPSHOT_MAX_AGE_SECONDS,
+        are read from Supabase.
+        """
+        if not Config.get_bool("FACILITY_INDEX_ENABLED"):
+            return
+        cell_degrees = Config.get_float("FACILITY_INDEX_CELL_DEGREES", 0.05)
+        snapshot_dir = Config.get("FACILITY_SNAPSHOT_DIR")
+        max_age = Config.get_float("FACILITY_SNAPSHOT_MAX_AGE_SECONDS", 0.0)
+        client = None
+
+        for table in FACILITY_TABLES:
+            snapshot = None
+            path = os.path.join(snapshot_dir, f"{table}.snapshot") if snapshot_dir else None
+            if path and os.path.exists(path):
+                try:
+                    snapshot = FacilitySnapshot.open(path)
+                except (OSError, ValueError) as e:
+                    Logger.warning(f"Could not open facility snapshot {path}: {e}")
+                if snapshot is not None and max_age and time.time() - snapshot.built_at > max_age:
+                    Logger.warning(f"Facility snapshot {path} is older than {max_age:.0f} s, reading {table} from the database")
+                    snapshot = None
+            source = f"snapshot {path}"
+            if snapshot is None:
+                source = "the database"
+                if client is None:
+                    # Imported here: the DB layer imports this module to keep the index in sync
+                    from national_agentic_ai_hackathon_2025_backend.database.base import DataBase
+                    client = DataBase().supabase
+                try:
+                    rows = await asyncio.to_thread(fetch_table, client, table, page_size)
+                except Exception as e:
+                    Logger.error(f"Could not load {table} into the facility index, using database queries: {e}")
+                    Metrics.increment("facility_index.load_errors")
+                    continue
+                snapshot = await asyncio.to_thread(FacilitySnapshot.from_rows, rows, table, cell_degrees)
+            _indexes[table] = cls(snapshot=snapshot, cell_degrees=cell_degrees)
+            Logger.info(f"Facility index loaded {len(_indexes[table])} of {len(snapshot)} {table} rows from {source}")
+
+
+_indexes: Dict[str, FacilityIndex] = {}
@@ -0,0 +1,238 @@
+import json
+import math
+import os
+import struct
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+MAGIC = b"FACSNAP1"
+ALIGNMENT = 64
+
+
+def _coordinates(row: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+    # Rows from Supabase use X/Y; HealthFacility/PoliceFacility models use x/y
+    lng = row.get("X", row.get("x"))
+    lat = row.get("Y", row.get("y"))
+    if lat is None or lng is None:
+        return None
+    try:
+        lat, lng = float(lat), float(lng)
+    except (TypeError, ValueError):
+        return None
+    if not (-90.0 <= lat <= 90.0 and -180.0 <= lng <= 180.0):
+        return None
+    return lat, lng
+
+
+def _kind(values: List[Any]) -> str:
+    present = [v for v in values if v is not None]
+    if all(isinstance(v, int) and not isinstance(v, bool) for v in present):
+        return "int"
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+        return "float"
+    if all(isinstance(v, str) for v in present):
+        return "str"
+    return "json"
+
+
+def cell_grid(lat: np.ndarray, lng: np.ndarray, cell_degrees: float) -> Dict[str, np.ndarray]:
+    """
+    Located slots bucketed into ``cell_degrees`` cells, CSR style: cell
+    ``keys[i]`` (y * columns + x, sorted) holds ``order[starts[i]:starts[i + 1]]``.
+    ``lat``/``lng`` are in degrees; NaN rows are left out.
+    """
+    columns = max(1, round(360 / cell_degrees))
+    located = np.flatnonzero(~np.isnan(lat))
+    y = np.floor(lat[located] / cell_degrees).astype(np.int64)
+    x = np.floor(lng[located] / cell_degrees).astype(np.int64) % columns
+    cell_keys = y * columns + x
+    order = np.argsort(cell_keys, kind="stable")
+    keys, starts = np.unique(cell_keys[order], return_index=True)
+    return {
+        "_cell_keys": keys.astype("<i8"),
+        "_cell_starts": np.append(starts, len(order)).astype("<i8"),
+        "_cell_order": located[order].astype("<i8"),
+    }
+
+
+class FacilitySnapshot:
+    """
+    A facility table as read-only columns, sorted by osm_id.
+
+    Integer and float columns are plain arrays (ints carry a ``.null``
+    mask, floats use NaN). Text columns (and anything else, as JSON) are
+    dictionary-encoded: int32 ``.codes`` per row (-1 for null) into a
+    string table stored as one UTF-8 blob plus offsets. Coordinates are
+    also kept in radians with cos(latitude), and slots are pre-bucketed
+    into the FacilityIndex cell grid, so an index over a snapshot does no
+    per-row work at startup.
+
+    ``save`` writes everything to a single file (a JSON header followed by
+    64-byte aligned arrays); ``open`` memory-maps it read-only, so every
+    worker on a host shares one page-cache copy.
+    """
+
+    def __init__(self, header: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> None:
+        self.table: str = header["table"]
+        self.built_at: float = header["built_at"]
+        self.cell_degrees: float = header["cell_degrees"]
+        self.columns: Dict[str, str] = header["columns"]
+        self.arrays = arrays
+        self.osm_ids = arrays["osm_id"]
+        self.lat = arrays["_lat"]
+        self.lng = arrays["_lng"]
+        self.cos_lat = arrays["_cos_lat"]
+
+    def __len__(self) -> int:
+        return len(self.osm_ids)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]], table: str = "", cell_degrees: float = 0.05) -> "FacilitySnapshot":
+        """Columnar copy of ``rows``. Rows without an integer osm_id are dropped; the last duplicate wins."""
+        by_id: Dict[int, Dict[str, Any]] = {}
+        for row in rows:
+            osm_id = row.get("osm_id")
+            if isinstance(osm_id, int) and not isinstance(osm_id, bool):
+                by_id[osm_id] = row
+        ordered = [by_id[osm_id] for osm_id in sorted(by_id)]
+        columns: Dict[str, str] = {}
+        arrays: Dict[str, np.ndarray] = {}
+        # Rows from one table nearly always share their keys, so compare key views instead of walking every key
+        seen: Dict[str, None] = {}
+        previous = None
+        for row in ordered:
+            if row.keys() != previous:
+                previous = row.keys()
+                seen.update(dict.fromkeys(previous))
+        names = list(seen) or ["osm_id"]
+        for name in names:
+            values = [row.get(name) for row in ordered]
+            kind = columns[name] = _kind(values)
+            if kind == "int":
+                arrays[name] = np.array([0 if v is None else v for v in values], dtype="<i8")
+                arrays[f"{name}.null"] = np.array([v is None for v in values], dtype=bool)
+            elif kind == "float":
+                arrays[name] = np.array([math.nan if v is None else v for v in values], dtype="<f8")
+            else:
+                table_index: Dict[str, int] = {}
+                texts = values if kind == "str" else [None if v is None else json.dumps(v) for v in values]
+                codes = [-1 if text is None else table_index.setdefault(text, len(table_index)) for text in texts]
+                encoded = [text.encode("utf-8") for text in table_index]
+                arrays[f"{name}.codes"] = np.array(codes, dtype="<i4")
+                arrays[f"{name}.offsets"] = np.cumsum([0] + [len(b) for b in encoded], dtype=np.int64).astype("<i8")
+                arrays[f"{name}.data"] = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        points = [_coordinates(row) or (math.nan, math.nan) for row in ordered]
+        lat_deg = np.array([p[0] for p in points], dtype="<f8")
+        lng_deg = np.array([p[1] for p in points], dtype="<f8")
+        arrays["_lat"] = np.radians(lat_deg)
+        arrays["_lng"] = np.radians(lng_deg)
+        arrays["_cos_lat"] = np.cos(arrays["_lat"])
+        arrays.update(cell_grid(lat_deg, lng_deg, cell_degrees))
+        header = {"table": table, "built_at": time.time(), "cell_degrees": cell_degrees, "columns": columns}
+        return cls(header, arrays)
+
+    def save(self, path: str) -> None:
+        """Write the snapshot to ``path`` atomically (readers of the old file keep their mapping)."""
+        layout: Dict[str, Dict[str, Any]] = {}
+        offset = 0
+        for name, array in self.arrays.items():
+            layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+            offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+        header = json.dumps({
+            "table": self.table, "built_at": self.built_at, "cell_degrees": self.cell_degrees,
+            "columns": self.columns, "arrays": layout,
+        }).encode("utf-8")
+        start = -(-(len(MAGIC) + 8 + len(header)) // ALIGNMENT) * ALIGNMENT
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(MAGIC + struct.pack("<Q", len(header)) + header)
+            for name, array in self.arrays.items():
+                f.seek(start + layout[name]["offset"])
+                f.write(np.ascontiguousarray(array).tobytes())
+            f.truncate(start + offset)
+        os.replace(temporary, path)
+
+    @classmethod
+    def open(cls, path: str) -> "FacilitySnapshot":
+        """Memory-map a snapshot written by ``save``; pages are read lazily and shared between processes."""
+        # Plain ndarray views of the mapping: np.memmap slices carry per-operation subclass overhead
+        mapped = np.memmap(path, dtype=np.uint8, mode="r").view(np.ndarray)
+        if bytes(mapped[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f"{path} is not a facility snapshot")
+        (length,) = struct.unpack("<Q", bytes(mapped[len(MAGIC):len(MAGIC) + 8]))
+        header = json.loads(bytes(mapped[len(MAGIC) + 8:len(MAGIC) + 8 + length]))
+        start = -(-(len(MAGIC) + 8 + length) // ALIGNMENT) * ALIGNMENT
+        arrays = {}
+        for name, spec in header["arrays"].items():
+            dtype = np.dtype(spec["dtype"])
+            count = int(np.prod(spec["shape"]))
+            begin = start + spec["offset"]
+            arrays[name] = mapped[begin:begin + count * dtype.itemsize].view(dtype).reshape(spec["shape"])
+        return cls(header, arrays)
+
+    def strings(self, column: str) -> List[str]:
+        """The decoded string table of a text column (meant for low-cardinality columns like amenity)."""
+        offsets, data = self.arrays[f"{column}.offsets"], self.arrays[f"{column}.data"]
+        return [bytes(data[offsets[i]:offsets[i + 1]]).decode("utf-8") for i in range(len(offsets) - 1)]
+
+    def value(self, column: str, slot: int) -> Any:
+        kind = self.columns[column]
+        if kind == "int":
+            return None if self.arrays[f"{column}.null"][slot] else int(self.arrays[column][slot])
+        if kind == "float":
+            value = float(self.arrays[column][slot])
+            return None if math.isnan(value) else value
+        code = int(self.arrays[f"{column}.codes"][slot])
+        if code < 0:
+            return None
+        offsets = self.arrays[f"{column}.offsets"]
+        text = bytes(self.arrays[f"{column}.data"][offsets[code]:offsets[code + 1]]).decode("utf-8")
+        return text if kind == "str" else json.loads(text)
+
+    def row(self, slot: int) -> Dict[str, Any]:
+        return {column: self.value(column, slot) for column in self.columns}
+
+    def rows_at(self, slots: Iterable[int]) -> List[Dict[str, Any]]:
+        """Rows for ``slots``, decoded a column at a time (much cheaper than ``row`` per slot)."""
+        slots = np.asarray(list(slots) if not isinstance(slots, np.ndarray) else slots, dtype=np.int64)
+        values: Dict[str, List[Any]] = {}
+        for column, kind in self.columns.items():
+            if kind == "int":
+                nulls = self.arrays[f"{column}.null"][slots].tolist()
+                values[column] = [None if null else v for v, null in zip(self.arrays[column][slots].tolist(), nulls)]
+            elif kind == "float":
+                values[column] = [None if v != v else v for v in self.arrays[column][slots].tolist()]
+            else:
+                codes = self.arrays[f"{column}.codes"][slots].tolist()
+                wanted = np.array(sorted({code for code in codes if code >= 0}), dtype=np.int64)
+                offsets, data = self.arrays[f"{column}.offsets"], memoryview(self.arrays[f"{column}.data"])
+                decoded: Dict[int, Any] = {-1: None}
+                for code, begin, end in zip(wanted.tolist(), offsets[wanted].tolist(), offsets[wanted + 1].tolist()):
+                    text = str(data[begin:end], "utf-8")
+                    decoded[code] = text if kind == "str" else json.loads(text)
+                values[column] = [decoded[code] for code in codes]
+        names = list(values)
+        return [dict(zip(names, row)) for row in zip(*values.values())]
+
+    def rows(self, batch: int = 1000) -> Iterator[Dict[str, Any]]:
+        for start in range(0, len(self), batch):
+            yield from self.rows_at(range(start, min(start + batch, len(self))))
+
+    def slot(self, osm_id: Any) -> Optional[int]:
+        """Slot of ``osm_id``, or None."""
+        if not isinstance(osm_id, int) or not len(self):
+            return None
+        slot = int(np.searchsorted(self.osm_ids, osm_id))
+        return slot if slot < len(self) and self.osm_ids[slot] == osm_id else None
+
+
+def fetch_table(client, table: str, page_size: int = 1000) -> List[Dict[str, Any]]:
+    """Every row of ``table``, paged (PostgREST caps a single response)."""
+    rows: List[Dict[str, Any]] = []
+    while True:
+        page = client.table(table).select("*").range(len(rows), len(rows) + page_size - 1).execute().data or []
+        rows.extend(page)
+        if len(page) < page_size:
+            return rows
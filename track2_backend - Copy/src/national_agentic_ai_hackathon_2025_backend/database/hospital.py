@@ -1,6 +1,13 @@
+from itertools import islice
 from typing import List, Optional, Dict, Any
 from national_agentic_ai_hackathon_2025_backend.schemas.hospitals import HealthFacility
-from national_agentic_ai_hackathon_2025_backend.database.base import DataBase
+from national_agentic_ai_hackathon_2025_backend.database.base import DataBase, escape_like
+from national_agentic_ai_hackathon_2025_backend.database.facility_index import FacilityIndex, nearest_in_bounding_boxes, rank_by_distance
+from national_agentic_ai_hackathon_2025_backend.utils.geo import bounding_box_offsets
+
+
+# Rows per bounding-box query when the nearest facilities are looked up without the in-memory index
+NEAREST_PAGE_SIZE = 1000
 
 
 class HealthFacilityDB(DataBase):
@@ -23,6 +30,9 @@ class HealthFacilityDB(DataBase):
         try:
             facility_data = facility.model_dump()
             result = self.supabase.table(self.table_name).insert(facility_data).execute()
+            index = FacilityIndex.get(self.table_name)
+            if index is not None and result.data:
+                index.upsert(result.data[0])
             return {"success": True, "data": result.data[0] if result.data else None}
         except Exception as e:
             print(f"Hello {e}")
@@ -52,7 +62,9 @@ class HealthFacilityDB(DataBase):
         latitude: float, 
         longitude: float, 
         radius_km: float = 10.0,
-        limit: int = 50
+        limit: int = 50,
+        amenity: Optional[str] = None,
+        speciality: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Get health facilities within a specified radius of given coordinates
@@ -62,10 +74,17 @@ class HealthFacilityDB(DataBase):
             longitude: Longitude coordinate
             radius_km: Search radius in kilometers (default: 10km)
             limit: Maximum number of results to return
+            amenity: Only facilities of this amenity type
+            speciality: Only facilities whose speciality contains this text
             
         Returns:
-            Dict containing list of nearby facilities
+            Dict containing list of nearby facilities, nearest first
         """
+        index = FacilityIndex.get(self.table_name)
+        if index is not None:
+            return {"success": True, "data": index.within(latitude, longitude, radius_km, limit, amenity, speciality)}
+        if amenity or speciality:
+            return await self._get_facilities_by_bounding_box(latitude, longitude, radius_km, limit, amenity, speciality)
         try:
             # Using PostGIS ST_DWithin for geographic distance calculation
             # This assumes your Supabase table has a geography column or similar
@@ -96,65 +115,81 @@ class HealthFacilityDB(DataBase):
         latitude: float, 
         longitude: float, 
         radius_km: float, 
-        limit: int
+        limit: int,
+        amenity: Optional[str] = None,
+        speciality: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Fallback method using bounding box approximation for location-based search
         """
         try:
-            # Approximate bounding box (rough calculation)
-            lat_offset = radius_km / 111.0  # Rough km per degree latitude
-            lng_offset = radius_km / (111.0 * abs(latitude / 90.0))  # Adjust for longitude
-            
-            result = self.supabase.table(self.table_name).select("*").gte(
-                "Y", latitude - lat_offset
-            ).lte(
-                "Y", latitude + lat_offset
-            ).gte(
-                "X", longitude - lng_offset
-            ).lte(
-                "X", longitude + lng_offset
-            ).limit(limit).execute()
-            
+            rows = self._bounding_box_rows(latitude, longitude, radius_km, limit, amenity, speciality)
             # Calculate actual distances and sort
-            facilities_with_distance = []
-            for facility in result.data:
-                if facility.get('X') and facility.get('Y'):
-                    distance = self._calculate_distance(
-                        latitude, longitude, 
-                        facility['Y'], facility['X']
-                    )
-                    if distance <= radius_km:
-                        facility['distance_km'] = distance
-                        facilities_with_distance.append(facility)
-            
-            # Sort by distance
-            facilities_with_distance.sort(key=lambda x: x['distance_km'])
-            
-            return {"success": True, "data": facilities_with_distance}
+            return {"success": True, "data": rank_by_distance(rows, latitude, longitude, radius_km)}
         except Exception as e:
             return {"success": False, "error": str(e)}
+
+    def _bounding_box_rows(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        limit: int,
+        amenity: Optional[str] = None,
+        speciality: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Up to ``limit`` facilities (in no particular order) in the box around a ``radius_km`` circle"""
+        lat_offset, lng_offset = bounding_box_offsets(latitude, radius_km)
+
+        query = self.supabase.table(self.table_name).select("*").gte(
+            "Y", latitude - lat_offset
+        ).lte(
+            "Y", latitude + lat_offset
+        ).gte(
+            "X", longitude - lng_offset
+        ).lte(
+            "X", longitude + lng_offset
+        )
+        if amenity:
+            query = query.ilike("amenity", escape_like(amenity))
+        if speciality:
+            query = query.ilike("speciality", f"%{escape_like(speciality)}%")
+        return query.limit(limit).execute().data or []
     
-    def _calculate_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    async def get_nearest_health_facilities(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int = 5,
+        max_radius_km: float = 50.0,
+        amenity: Optional[str] = None,
+        speciality: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
-        Calculate distance between two points using Haversine formula
+        Get the k health facilities nearest to given coordinates
         
+        Args:
+            latitude: Latitude coordinate
+            longitude: Longitude coordinate
+            k: Number of facilities to return
+            max_radius_km: Ignore facilities further away than this
+            amenity: Only facilities of this amenity type
+            speciality: Only facilities whose speciality contains this text
+            
         Returns:
-            Distance in kilometers
+            Dict containing up to k facilities, nearest first, with distance_km
         """
-        import math
-        
-        R = 6371  # Earth's radius in kilometers
-        
-        dlat = math.radians(lat2 - lat1)
-        dlon = math.radians(lon2 - lon1)
-        
-        a = (math.sin(dlat/2) * math.sin(dlat/2) + 
-             math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * 
-             math.sin(dlon/2) * math.sin(dlon/2))
-        
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-        return R * c
+        index = FacilityIndex.get(self.table_name)
+        if index is not None:
+            return {"success": True, "data": index.nearest(latitude, longitude, k, max_radius_km, amenity, speciality)}
+        try:
+            data = nearest_in_bounding_boxes(
+                lambda radius_km: self._bounding_box_rows(latitude, longitude, radius_km, NEAREST_PAGE_SIZE, amenity, speciality),
+                latitude, longitude, k, max_radius_km, NEAREST_PAGE_SIZE,
+            )
+            return {"success": True, "data": data}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
     
     async def get_health_facilities_by_amenity(self, amenity: str, limit: int = 100) -> Dict[str, Any]:
         """
@@ -210,6 +245,9 @@ class HealthFacilityDB(DataBase):
                 "osm_id", osm_id
             ).execute()
             
+            index = FacilityIndex.get(self.table_name)
+            if index is not None and result.data:
+                index.upsert(result.data[0])
             if result.data:
                 return {"success": True, "data": result.data[0]}
             else:
@@ -232,6 +270,9 @@ class HealthFacilityDB(DataBase):
                 "osm_id", osm_id
             ).execute()
             
+            index = FacilityIndex.get(self.table_name)
+            if index is not None and result.data:
+                index.remove(osm_id)
             if result.data:
                 return {"success": True, "message": "Facility deleted successfully"}
             else:
@@ -289,6 +330,9 @@ class HealthFacilityDB(DataBase):
             Returns:
                 Dict containing list of all facilities or error
             """
+            index = FacilityIndex.get(self.table_name)
+            if index is not None:
+                return {"success": True, "data": list(islice(index.rows(), limit))}
             try:
                 result = self.supabase.table(self.table_name).select("*").limit(limit).execute()
                 return {"success": True, "data": result.data if result.data else []}
@@ -1,6 +1,13 @@
+from itertools import islice
 from typing import List, Optional, Dict, Any
 from national_agentic_ai_hackathon_2025_backend.schemas.police import PoliceFacility
-from national_agentic_ai_hackathon_2025_backend.database.base import DataBase
+from national_agentic_ai_hackathon_2025_backend.database.base import DataBase, escape_like
+from national_agentic_ai_hackathon_2025_backend.database.facility_index import FacilityIndex, nearest_in_bounding_boxes, rank_by_distance
+from national_agentic_ai_hackathon_2025_backend.utils.geo import bounding_box_offsets
+
+
+# Rows per bounding-box query when the nearest facilities are looked up without the in-memory index
+NEAREST_PAGE_SIZE = 1000
 
 
 class PoliceFacilityDB(DataBase):
@@ -17,6 +24,9 @@ class PoliceFacilityDB(DataBase):
         try:
             facility_data = facility.model_dump()
             result = self.supabase.table(self.table_name).insert(facility_data).execute()
+            index = FacilityIndex.get(self.table_name)
+            if index is not None and result.data:
+                index.upsert(result.data[0])
             return {"success": True, "data": result.data[0] if result.data else None}
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -39,11 +49,17 @@ class PoliceFacilityDB(DataBase):
         latitude: float, 
         longitude: float, 
         radius_km: float = 10.0,
-        limit: int = 50
+        limit: int = 50,
+        amenity: Optional[str] = None
     ) -> Dict[str, Any]:
         """
-        Get police facilities within a specified radius of given coordinates
+        Get police facilities within a specified radius of given coordinates, nearest first
         """
+        index = FacilityIndex.get(self.table_name)
+        if index is not None:
+            return {"success": True, "data": index.within(latitude, longitude, radius_km, limit, amenity)}
+        if amenity:
+            return await self._get_facilities_by_bounding_box(latitude, longitude, radius_km, limit, amenity)
         try:
             query = f"""
             SELECT *, 
@@ -66,47 +82,49 @@ class PoliceFacilityDB(DataBase):
             return await self._get_facilities_by_bounding_box(latitude, longitude, radius_km, limit)
     
     async def _get_facilities_by_bounding_box(
-        self, latitude: float, longitude: float, radius_km: float, limit: int
+        self, latitude: float, longitude: float, radius_km: float, limit: int, amenity: Optional[str] = None
     ) -> Dict[str, Any]:
         """Fallback method using bounding box approximation"""
         try:
-            lat_offset = radius_km / 111.0
-            lng_offset = radius_km / (111.0 * abs(latitude / 90.0))
-            
-            result = self.supabase.table(self.table_name).select("*").gte(
-                "Y", latitude - lat_offset
-            ).lte(
-                "Y", latitude + lat_offset
-            ).gte(
-                "X", longitude - lng_offset
-            ).lte(
-                "X", longitude + lng_offset
-            ).limit(limit).execute()
-            
-            facilities_with_distance = []
-            for facility in result.data:
-                if facility.get('X') and facility.get('Y'):
-                    distance = self._calculate_distance(latitude, longitude, facility['Y'], facility['X'])
-                    if distance <= radius_km:
-                        facility['distance_km'] = distance
-                        facilities_with_distance.append(facility)
-            
-            facilities_with_distance.sort(key=lambda x: x['distance_km'])
-            return {"success": True, "data": facilities_with_distance}
+            rows = self._bounding_box_rows(latitude, longitude, radius_km, limit, amenity)
+            return {"success": True, "data": rank_by_distance(rows, latitude, longitude, radius_km)}
         except Exception as e:
             return {"success": False, "error": str(e)}
+
+    def _bounding_box_rows(
+        self, latitude: float, longitude: float, radius_km: float, limit: int, amenity: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Up to ``limit`` facilities (in no particular order) in the box around a ``radius_km`` circle"""
+        lat_offset, lng_offset = bounding_box_offsets(latitude, radius_km)
+
+        query = self.supabase.table(self.table_name).select("*").gte(
+            "Y", latitude - lat_offset
+        ).lte(
+            "Y", latitude + lat_offset
+        ).gte(
+            "X", longitude - lng_offset
+        ).lte(
+            "X", longitude + lng_offset
+        )
+        if amenity:
+            query = query.ilike("amenity", escape_like(amenity))
+        return query.limit(limit).execute().data or []
     
-    def _calculate_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-        """Haversine distance"""
-        import math
-        R = 6371
-        dlat = math.radians(lat2 - lat1)
-        dlon = math.radians(lon2 - lon1)
-        a = (math.sin(dlat/2) ** 2 +
-             math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) *
-             math.sin(dlon/2) ** 2)
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-        return R * c
+    async def get_nearest_police_facilities(
+        self, latitude: float, longitude: float, k: int = 5, max_radius_km: float = 50.0, amenity: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get the k police facilities nearest to given coordinates, nearest first"""
+        index = FacilityIndex.get(self.table_name)
+        if index is not None:
+            return {"success": True, "data": index.nearest(latitude, longitude, k, max_radius_km, amenity)}
+        try:
+            data = nearest_in_bounding_boxes(
+                lambda radius_km: self._bounding_box_rows(latitude, longitude, radius_km, NEAREST_PAGE_SIZE, amenity),
+                latitude, longitude, k, max_radius_km, NEAREST_PAGE_SIZE,
+            )
+            return {"success": True, "data": data}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
     
     async def get_police_facilities_by_amenity(self, amenity: str, limit: int = 100) -> Dict[str, Any]:
         """Get police facilities by amenity type (police, checkpoint, station, etc.)"""
@@ -128,6 +146,9 @@ class PoliceFacilityDB(DataBase):
         """Update a police facility's information"""
         try:
             result = self.supabase.table(self.table_name).update(updates).eq("osm_id", osm_id).execute()
+            index = FacilityIndex.get(self.table_name)
+            if index is not None and result.data:
+                index.upsert(result.data[0])
             if result.data:
                 return {"success": True, "data": result.data[0]}
             else:
@@ -139,6 +160,9 @@ class PoliceFacilityDB(DataBase):
         """Delete a police facility"""
         try:
             result = self.supabase.table(self.table_name).delete().eq("osm_id", osm_id).execute()
+            index = FacilityIndex.get(self.table_name)
+            if index is not None and result.data:
+                index.remove(osm_id)
             if result.data:
                 return {"success": True, "message": "Facility deleted successfully"}
             else:
@@ -164,6 +188,9 @@ class PoliceFacilityDB(DataBase):
         Returns:
             Dict containing list of all facilities or error
         """
+        index = FacilityIndex.get(self.table_name)
+        if index is not None:
+            return {"success": True, "data": list(islice(index.rows(), limit))}
         try:
             result = self.supabase.table(self.table_name).select("*").limit(limit).execute()
             return {"success": True, "data": result.data if result.data else []}
@@ -0,0 +1,145 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from national_agentic_ai_hackathon_2025_backend.config import Config
+from national_agentic_ai_hackathon_2025_backend.handlers.intent_classifier import IntentClassifier
+from national_agentic_ai_hackathon_2025_backend.utils.metrics import Metrics
+from national_agentic_ai_hackathon_2025_backend._debug import Logger
+
+
+class Superseded(Exception):
+    """The run was cancelled because a newer message from the same user replaced it."""
+
+
+@dataclass
+class Batch:
+    """Messages from one user answered by a single workflow run."""
+    texts: List[str]
+    critical: bool = False
+    superseded: bool = False
+    task: Optional[asyncio.Task] = None
+
+    @property
+    def message(self) -> str:
+        return "\n".join(self.texts)
+
+
+@dataclass
+class _Pending:
+    started_at: float
+    texts: List[str] = field(default_factory=list)
+    generation: int = 0
+
+
+def _is_emergency(text: str) -> bool:
+    return IntentClassifier.get().classify(text).is_route
+
+
+class MessageDebouncer:
+    """
+    Per-user debounce stage in front of the workflow.
+
+    Messages from one user that arrive within ``window_seconds`` of each other
+    are joined into one Batch and answered by one workflow run; a batch is
+    flushed at the latest ``max_wait_seconds`` after its first message. A new
+    message also supersedes a run still in progress for that user: the run is
+    cancelled and its messages are carried into the new batch.
+
+    Messages that look like emergencies are never delayed: they flush the
+    batch immediately, and a run for an emergency batch is never superseded.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = 2.0,
+        max_wait_seconds: float = 6.0,
+        is_critical: Callable[[str], bool] = _is_emergency,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.window_seconds = window_seconds
+        self.max_wait_seconds = max_wait_seconds
+        self.is_critical = is_critical
+        self.clock = clock
+        self._pending: Dict[str, _Pending] = {}
+        self._active: Dict[str, Batch] = {}
+
+    async def gather(self, key: str, text: str) -> Optional[Batch]:
+        """
+        Add a message to the user's pending batch. Returns the batch for the
+        caller that should run it, or None when the message was merged into a
+        batch that a later caller will run.
+        """
+        critical = self.is_critical(text)
+        carried = self._supersede(key)
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = _Pending(started_at=self.clock())
+        pending.texts = carried + pending.texts + [text]
+        pending.generation += 1
+        generation = pending.generation
+
+        if critical:
+            Metrics.increment("debounce.bypass")
+        else:
+            delay = min(self.window_seconds, pending.started_at + self.max_wait_seconds - self.clock())
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if self._pending.get(key) is not pending or pending.generation != generation:
+                Metrics.increment("debounce.merged")
+                return None
+
+        del self._pending[key]
+        batch = Batch(texts=pending.texts, critical=critical or any(self.is_critical(t) for t in pending.texts))
+        self._active[key] = batch
+        Metrics.increment("debounce.batches")
+        Metrics.observe("debounce.wait", self.clock() - pending.started_at)
+        return batch
+
+    def _supersede(self, key: str) -> List[str]:
+        """Cancel the user's in-progress run, unless it is an emergency, and return its messages."""
+        active = self._active.get(key)
+        if active is None or active.critical or active.superseded:
+            return []
+        active.superseded = True
+        if active.task is not None:
+            active.task.cancel()
+        Logger.info(f"New message from {key} supersedes the run in progress")
+        Metrics.increment("debounce.superseded")
+        return active.texts
+
+    async def run(self, key: str, batch: Batch, work: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``work`` for a batch; raises Superseded if a newer message replaces it first."""
+        try:
+            if batch.superseded:
+                raise Superseded()
+            batch.task = asyncio.ensure_future(work())
+            try:
+                return await batch.task
+            except asyncio.CancelledError:
+                if batch.superseded and batch.task.cancelled() and not asyncio.current_task().cancelling():
+                    raise Superseded() from None
+                batch.task.cancel()
+                raise
+        finally:
+            if self._active.get(key) is batch:
+                del self._active[key]
+
+    def discard(self, key: str, batch: Batch) -> None:
+        """Forget a batch whose run was never started."""
+        if self._active.get(key) is batch:
+            del self._active[key]
+
+    @classmethod
+    def get(cls) -> Optional["MessageDebouncer"]:
+        """Return the process-wide debouncer, or None unless DEBOUNCE_ENABLED is set."""
+        global _debouncer
+        if _debouncer is None and Config.get_bool("DEBOUNCE_ENABLED"):
+            _debouncer = cls(
+                window_seconds=Config.get_float("DEBOUNCE_WINDOW_SECONDS", 2.0),
+                max_wait_seconds=Config.get_float("DEBOUNCE_MAX_WAIT_SECONDS", 6.0),
+            )
+        return _debouncer
+
+
+_debouncer: Optional[MessageDebouncer] = None
@@ -0,0 +1,100 @@
+import asyncio
+import contextvars
+from typing import Optional, Set
+from national_agentic_ai_hackathon_2025_backend.config import Config
+from national_agentic_ai_hackathon_2025_backend.context.chat_history import ChatHistoryContext, DEFAULT_MAX_MESSAGES, DEFAULT_MAX_MESSAGE_TOKENS
+from national_agentic_ai_hackathon_2025_backend.utils.metrics import Metrics
+from national_agentic_ai_hackathon_2025_backend.utils.tracing import Tracer
+from national_agentic_ai_hackathon_2025_backend._debug import Logger
+
+
+class HistorySummarizer:
+    """
+    Maintains the rolling summary stored on each chat_history row.
+
+    Once ``batch_size`` or more messages have fallen out of the raw window
+    (the newest ``keep_recent`` messages), they are folded into the stored
+    summary by the SummaryAgent in a background task, after the reply has
+    been sent, and ``summarized_count`` is advanced. Only the new batch is sent
+    to the model, never the whole transcript.
+
+    Requires two columns on chat_history:
+
+        alter table chat_history
+            add column summary text,
+            add column summarized_count integer not null default 0;
+    """
+
+    def __init__(self, keep_recent: int = DEFAULT_MAX_MESSAGES, batch_size: int = 6, chat_db=None) -> None:
+        self.keep_recent = keep_recent
+        self.batch_size = batch_size
+        self._chat_db = chat_db
+        self._in_flight: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    def needs_update(self, history: ChatHistoryContext) -> bool:
+        unsummarized = len(history.messages) - history.summarized_count - self.keep_recent
+        return unsummarized >= self.batch_size
+
+    def schedule(self, history: ChatHistoryContext) -> None:
+        """Start a background summary update for this conversation if one is due."""
+        if not self.needs_update(history) or history.phone_number in self._in_flight:
+            return
+        self._in_flight.add(history.phone_number)
+        # Fresh context: the update is traced on its own, not as part of the request that triggered it
+        task = asyncio.create_task(self.update(history), context=contextvars.Context())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def update(self, history: ChatHistoryContext) -> Optional[str]:
+        """Fold the messages that left the raw window into the summary and persist it."""
+        from national_agentic_ai_hackathon_2025_backend.agents_workflow.registry import AgentRegistry
+
+        try:
+            with Tracer.trace("history.summarize", request_id=f"summary-{history.phone_number[-4:]}"):
+                upto = len(history.messages) - self.keep_recent
+                batch = history.messages[history.summarized_count:upto]
+                max_tokens = Config.get_int("HISTORY_MAX_MESSAGE_TOKENS", DEFAULT_MAX_MESSAGE_TOKENS)
+                lines = [ChatHistoryContext.format_message(msg, max_tokens) for msg in batch]
+
+                summary = await AgentRegistry.get().summary.summarize(history.summary, lines)
+                if not summary:
+                    Metrics.increment("history.summary.failed")
+                    return None
+
+                if not await self.chat_db.update_summary(history.phone_number, summary, upto):
+                    Logger.warning(f"Failed to persist chat summary for {history.phone_number}")
+                    Metrics.increment("history.summary.failed")
+                    return None
+
+                Metrics.increment("history.summary.updated")
+                Metrics.increment("history.summary.messages_folded", len(batch))
+                Logger.info(f"Folded {len(batch)} messages into chat summary for {history.phone_number}")
+                return summary
+        except Exception as e:
+            Logger.error(f"{__name__}> update -> Error updating chat summary for {history.phone_number}: {e}")
+            Metrics.increment("history.summary.failed")
+            return None
+        finally:
+            self._in_flight.discard(history.phone_number)
+
+    @property
+    def chat_db(self):
+        if self._chat_db is None:
+            from national_agentic_ai_hackathon_2025_backend.database.chat_history import ChatHistoryDB
+            self._chat_db = ChatHistoryDB()
+        return self._chat_db
+
+    @classmethod
+    def get(cls) -> Optional["HistorySummarizer"]:
+        """Return the process-wide summarizer, or None unless HISTORY_SUMMARY_ENABLED is set."""
+        global _summarizer
+        if _summarizer is None and Config.get_bool("HISTORY_SUMMARY_ENABLED"):
+            _summarizer = cls(
+                keep_recent=Config.get_int("HISTORY_MAX_MESSAGES", DEFAULT_MAX_MESSAGES),
+                batch_size=Config.get_int("HISTORY_SUMMARY_BATCH", 6),
+            )
+        return _summarizer
+
+
+_summarizer: Optional[HistorySummarizer] = None
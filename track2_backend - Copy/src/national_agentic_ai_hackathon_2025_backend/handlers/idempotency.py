@@ -0,0 +1,248 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+from national_agentic_ai_hackathon_2025_backend.config import Config
+from national_agentic_ai_hackathon_2025_backend.utils.metrics import Metrics
+from national_agentic_ai_hackathon_2025_backend._debug import Logger
+
+PROCESSING = "processing"
+DONE = "done"
+
+DEFAULT_PROCESSING_TTL_SECONDS = 120.0
+DEFAULT_DONE_TTL_SECONDS = 24 * 3600.0
+
+
+class IdempotencyBackend(ABC):
+    """
+    Key/state storage behind IdempotencyStore. ``claim`` must be atomic: of
+    several callers racing for the same absent (or expired) key, exactly one
+    gets True.
+    """
+
+    @abstractmethod
+    async def claim(self, key: str, state: str, ttl: float) -> bool:
+        """Store ``state`` under ``key`` for ``ttl`` seconds if the key is absent or expired; True if stored."""
+
+    @abstractmethod
+    async def set(self, key: str, state: str, ttl: float) -> None:
+        """Store ``state`` under ``key`` for ``ttl`` seconds, replacing any entry."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Drop ``key`` if present."""
+
+
+class MemoryBackend(IdempotencyBackend):
+    """In-process backend. Only deduplicates within one worker; for tests and single-worker runs."""
+
+    def __init__(self, max_entries: int = 10000, clock: Callable[[], float] = time.monotonic) -> None:
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+
+    async def claim(self, key: str, state: str, ttl: float) -> bool:
+        now = self.clock()
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] > now:
+            return False
+        self._store(key, state, now + ttl)
+        return True
+
+    async def set(self, key: str, state: str, ttl: float) -> None:
+        self._store(key, state, self.clock() + ttl)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def _store(self, key: str, state: str, expires_at: float) -> None:
+        self._entries[key] = (state, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class SqliteBackend(IdempotencyBackend):
+    """
+    SQLite file backend, shared by every worker process on one host. Claims
+    run in an IMMEDIATE transaction, so the database lock makes them atomic
+    across processes. Expired rows are purged every ``purge_every`` claims.
+    """
+
+    def __init__(self, path: str, purge_every: int = 500) -> None:
+        self.path = path
+        self.purge_every = purge_every
+        self._claims = 0
+        self._execute("PRAGMA journal_mode=WAL")
+        self._execute(
+            "CREATE TABLE IF NOT EXISTS idempotency ("
+            "key TEXT PRIMARY KEY, state TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+
+    def _execute(self, sql: str, params: tuple = ()) -> None:
+        conn = self._connect()
+        try:
+            conn.execute(sql, params)
+        finally:
+            conn.close()
+
+    def _claim(self, key: str, state: str, ttl: float) -> bool:
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM idempotency WHERE key = ? AND expires_at <= ?", (key, now))
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO idempotency (key, state, expires_at) VALUES (?, ?, ?)", (key, state, now + ttl)
+            )
+            if self._claims % self.purge_every == 0:
+                conn.execute("DELETE FROM idempotency WHERE expires_at <= ?", (now,))
+            conn.execute("COMMIT")
+            return cursor.rowcount == 1
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _set(self, key: str, state: str, ttl: float) -> None:
+        self._execute("INSERT OR REPLACE INTO idempotency (key, state, expires_at) VALUES (?, ?, ?)", (key, state, time.time() + ttl))
+
+    def _delete(self, key: str) -> None:
+        self._execute("DELETE FROM idempotency WHERE key = ?", (key,))
+
+    async def claim(self, key: str, state: str, ttl: float) -> bool:
+        self._claims += 1
+        return await asyncio.to_thread(self._claim, key, state, ttl)
+
+    async def set(self, key: str, state: str, ttl: float) -> None:
+        await asyncio.to_thread(self._set, key, state, ttl)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._delete, key)
+
+
+class RedisBackend(IdempotencyBackend):
+    """
+    Backend for any client with the redis-py asyncio interface (Redis, Valkey,
+    KeyDB, Upstash...). Claims use ``SET key state NX PX ttl``.
+    """
+
+    def __init__(self, client) -> None:
+        self.client = client
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisBackend":
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as e:
+            raise RuntimeError("IDEMPOTENCY_BACKEND=redis needs the 'redis' package installed") from e
+        return cls(redis_asyncio.from_url(url))
+
+    async def claim(self, key: str, state: str, ttl: float) -> bool:
+        return bool(await self.client.set(key, state, nx=True, px=int(ttl * 1000)))
+
+    async def set(self, key: str, state: str, ttl: float) -> None:
+        await self.client.set(key, state, px=int(ttl * 1000))
+
+    async def delete(self, key: str) -> None:
+        await self.client.delete(key)
+
+
+class IdempotencyStore:
+    """
+    Runs each WhatsApp update at most once across all workers.
+
+    ``claim`` takes a short processing lease on the message id; only the
+    caller that gets it runs the workflow. ``complete`` turns the lease into a
+    long-lived "done" marker so later webhook retries are dropped, and
+    ``release`` frees it after a failure so a retry can try again. A worker
+    that dies mid-request leaves a lease that expires after ``processing_ttl``.
+
+    Backend errors fail open (the update is processed) and are counted.
+    """
+
+    def __init__(
+        self,
+        backend: IdempotencyBackend,
+        processing_ttl: float = DEFAULT_PROCESSING_TTL_SECONDS,
+        done_ttl: float = DEFAULT_DONE_TTL_SECONDS,
+        prefix: str = "wa:update:",
+    ) -> None:
+        self.backend = backend
+        self.processing_ttl = processing_ttl
+        self.done_ttl = done_ttl
+        self.prefix = prefix
+
+    async def claim(self, update_id: str) -> bool:
+        """True if this caller should process the update, False for a duplicate."""
+        try:
+            claimed = await self.backend.claim(self.prefix + update_id, PROCESSING, self.processing_ttl)
+        except Exception as e:
+            Logger.warning(f"Idempotency claim failed for {update_id}, processing anyway: {e}")
+            Metrics.increment("idempotency.errors")
+            return True
+        Metrics.increment("idempotency.claimed" if claimed else "idempotency.duplicate")
+        return claimed
+
+    async def complete(self, update_id: str) -> None:
+        try:
+            await self.backend.set(self.prefix + update_id, DONE, self.done_ttl)
+        except Exception as e:
+            Logger.warning(f"Failed to mark update {update_id} as done: {e}")
+            Metrics.increment("idempotency.errors")
+
+    async def release(self, update_id: str) -> None:
+        try:
+            await self.backend.delete(self.prefix + update_id)
+            Metrics.increment("idempotency.released")
+        except Exception as e:
+            Logger.warning(f"Failed to release update {update_id}: {e}")
+            Metrics.increment("idempotency.errors")
+
+    @classmethod
+    def get(cls) -> Optional["IdempotencyStore"]:
+        """
+        Return the process-wide store for IDEMPOTENCY_BACKEND, or None when
+        disabled (``none``). The default, ``sqlite``, deduplicates across the
+        workers of one host; use ``redis`` (IDEMPOTENCY_REDIS_URL) in
+        production, where instances run on several hosts. ``memory`` only
+        covers a single worker.
+        """
+        global _store
+        if _store is None:
+            kind = (Config.get("IDEMPOTENCY_BACKEND") or "sqlite").lower()
+            if kind == "none":
+                return None
+            if kind == "sqlite":
+                backend = SqliteBackend(
+                    Config.get("IDEMPOTENCY_SQLITE_PATH") or os.path.join(tempfile.gettempdir(), "whatsapp_updates.sqlite3")
+                )
+            elif kind == "redis":
+                backend = RedisBackend.from_url(Config.get_required("IDEMPOTENCY_REDIS_URL"))
+            else:
+                if kind != "memory":
+                    Logger.warning(f"Unknown IDEMPOTENCY_BACKEND '{kind}', using memory")
+                if Config.get_int("WEB_CONCURRENCY", 1) > 1:
+                    Logger.warning(
+                        "IDEMPOTENCY_BACKEND=memory with several workers: a webhook retry that lands on another "
+                        "worker runs again. Use sqlite (one host) or redis."
+                    )
+                backend = MemoryBackend()
+            _store = cls(
+                backend,
+                processing_ttl=Config.get_float("IDEMPOTENCY_PROCESSING_TTL_SECONDS", DEFAULT_PROCESSING_TTL_SECONDS),
+                done_ttl=Config.get_float("IDEMPOTENCY_TTL_SECONDS", DEFAULT_DONE_TTL_SECONDS),
+            )
+        return _store
+
+
+_store: Optional[IdempotencyStore] = None
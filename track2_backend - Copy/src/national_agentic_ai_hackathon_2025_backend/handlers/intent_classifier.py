@@ -0,0 +1,242 @@
+import json
+import math
+import os
+import random
+import re
+from typing import Dict, Iterable, List, Literal, Optional, Tuple
+from pydantic import BaseModel
+from national_agentic_ai_hackathon_2025_backend.config import Config
+from national_agentic_ai_hackathon_2025_backend.utils.text_features import normalize_text, hashed_features
+from national_agentic_ai_hackathon_2025_backend._debug import Logger
+
+LABELS = ["greeting", "thanks", "medical", "police", "catastrophic", "other"]
+CHAT_LABELS = {"greeting", "thanks"}
+ROUTE_LABELS = {"medical", "police", "catastrophic"}
+
+DEFAULT_MODEL_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "intent_model.json")
+
+# Whole-message patterns (matched against normalize_text output)
+GREETING_PATTERN = re.compile(
+    r"^(as+ala?m[ou]? ?[ao]?l[ae]iku?m|w[ao] ?alaikum ?(as+alam)?|salam|slam|aoa|hi+|hello|hey|"
+    r"good (morning|afternoon|evening))( (ji|sir|bhai|there|everyone))?$"
+)
+THANKS_PATTERN = re.compile(
+    r"^(ok(ay)? )?(thanks?( you)?( so much| a lot| very much)?|thank u|thx|shukri[ay]a?( ji)?|"
+    r"jazak ?allah( khair)?|bohat shukriya)( ji| sir| bhai)?$"
+)
+
+# Unmistakable emergency keywords, searched anywhere in the message
+EMERGENCY_PATTERNS = {
+    "medical": re.compile(
+        r"\b(accident|1122|ambulance|heart attack|chest pain|unconscious|behosh|bleeding|khoon beh|"
+        r"not breathing|can ?t breathe|saans nahi|stroke|fainted|overdose|poisoned)\b"
+    ),
+    "police": re.compile(
+        r"\b(robbery|robbed|dakait\w*|daka|snatch\w*|chheen\w*|gunpoint|kidnap\w*|agwa|murder|qatal|"
+        r"harass\w*|theft|stolen|chori)\b"
+    ),
+    "catastrophic": re.compile(
+        r"\b(flood\w*|sailab|selab|earthquake|zalzala|building collapsed?|landslide|cyclone|"
+        r"explosion|blast|dhamaka|aag lag\w*)\b"
+    ),
+}
+
+# Informational questions mentioning an emergency word ("what is 1122?") are not emergencies
+QUESTION_PATTERN = re.compile(r"^(what|whats|how (do|does|to|can)|tell me about|kya hai|info)\b")
+
+# A negation in the few words before a keyword ("there was no accident") takes that keyword back
+NEGATION_PATTERN = re.compile(r"\b(no|not|never|without|nahi|nahin|\w+n t)( \w+){0,2} $")
+
+# Mentions of an emergency that is over: follow-ups on a report, paperwork, or a past date
+PAST_OR_REPORT_PATTERN = re.compile(
+    r"\b(last (night|week|month|year)|(days|weeks|months|years) ago|pichl[ae] (hafte|mahine|saal)|"
+    r"filed|registered|report status|case status|status of|insurance|claim|form|certificate|copy of|"
+    r"office timings?)\b"
+)
+
+RULE_CONFIDENCE = 0.99
+QUESTION_RULE_CONFIDENCE = 0.6
+
+GREETING_REPLY = "Wa Alaikum Assalam! How can I help you today? For any emergency, please describe what happened and where you are."
+HELLO_REPLY = "Hello! How can I help you today? For any emergency, please describe what happened and where you are."
+THANKS_REPLY = "You're welcome! If you need any more help, just send a message. In an emergency call 1122 (medical) or 15 (police)."
+
+
+class IntentDecision(BaseModel):
+    label: Optional[Literal["greeting", "thanks", "medical", "police", "catastrophic", "other"]] = None
+    confidence: float = 0.0
+    source: Literal["rule", "model", "none"] = "none"
+    is_confident: bool = False
+
+    @property
+    def is_chat(self) -> bool:
+        return self.is_confident and self.label in CHAT_LABELS
+
+    @property
+    def is_route(self) -> bool:
+        return self.is_confident and self.label in ROUTE_LABELS
+
+
+class IntentClassifier:
+    """
+    In-process intent classifier run before the LLM triage.
+
+    High-precision regex rules handle greetings, thank-yous and unmistakable
+    emergencies; an optional softmax model over hashed character n-grams
+    handles the rest. Anything below the confidence threshold is deferred to
+    the agents.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.9,
+        weights: Optional[Dict[str, Dict[int, float]]] = None,
+        bias: Optional[Dict[str, float]] = None,
+        dim: int = 2 ** 14,
+    ) -> None:
+        self.threshold = threshold
+        self.weights = weights or {}
+        self.bias = bias or {}
+        self.dim = dim
+
+    # ---------- Inference ----------
+    def classify(self, message: str) -> IntentDecision:
+        text = normalize_text(message)
+        if not text:
+            return IntentDecision()
+
+        decision = self._apply_rules(text)
+        if decision is None and self.weights:
+            label, confidence = self.predict(text)
+            decision = IntentDecision(label=label, confidence=confidence, source="model")
+        if decision is None:
+            return IntentDecision()
+
+        decision.is_confident = decision.label != "other" and decision.confidence >= self.threshold
+        return decision
+
+    def _apply_rules(self, text: str) -> Optional[IntentDecision]:
+        if GREETING_PATTERN.match(text):
+            return IntentDecision(label="greeting", confidence=RULE_CONFIDENCE, source="rule")
+        if THANKS_PATTERN.match(text):
+            return IntentDecision(label="thanks", confidence=RULE_CONFIDENCE, source="rule")
+
+        matched = [label for label, pattern in EMERGENCY_PATTERNS.items() if pattern.search(text)]
+        if len(matched) != 1:
+            # No keyword, or keywords for several routes: let the model / agents decide
+            return None
+        keywords = list(EMERGENCY_PATTERNS[matched[0]].finditer(text))
+        negated = all(NEGATION_PATTERN.search(text[:keyword.start()]) for keyword in keywords)
+        if negated or QUESTION_PATTERN.match(text) or PAST_OR_REPORT_PATTERN.search(text):
+            # Keep the label as a hint but leave the routing to the agents
+            return IntentDecision(label=matched[0], confidence=QUESTION_RULE_CONFIDENCE, source="rule")
+        return IntentDecision(label=matched[0], confidence=RULE_CONFIDENCE, source="rule")
+
+    def predict(self, text: str) -> Tuple[str, float]:
+        """Return the most probable label and its probability for normalised text."""
+        probabilities = self._probabilities(hashed_features(text, self.dim))
+        label = max(probabilities, key=probabilities.get)
+        return label, probabilities[label]
+
+    def _probabilities(self, features: Dict[int, float]) -> Dict[str, float]:
+        scores = {
+            label: self.bias.get(label, 0.0) + sum(
+                value * self.weights.get(label, {}).get(index, 0.0) for index, value in features.items()
+            )
+            for label in LABELS
+        }
+        top = max(scores.values())
+        exp_scores = {label: math.exp(score - top) for label, score in scores.items()}
+        total = sum(exp_scores.values())
+        return {label: value / total for label, value in exp_scores.items()}
+
+    @staticmethod
+    def reply_for(decision: IntentDecision, message: str) -> str:
+        """Canned reply for a confidently classified greeting or thank-you."""
+        if decision.label == "thanks":
+            return THANKS_REPLY
+        if "salam" in normalize_text(message) or "aoa" in normalize_text(message):
+            return GREETING_REPLY
+        return HELLO_REPLY
+
+    # ---------- Training ----------
+    @classmethod
+    def train(
+        cls,
+        examples: Iterable[Tuple[str, str]],
+        epochs: int = 30,
+        learning_rate: float = 0.5,
+        l2: float = 1e-4,
+        threshold: float = 0.9,
+        dim: int = 2 ** 14,
+        seed: int = 13,
+    ) -> "IntentClassifier":
+        """Fit the softmax model with plain SGD on (message, label) pairs."""
+        data = [(hashed_features(normalize_text(text), dim), label) for text, label in examples if label in LABELS]
+        model = cls(threshold=threshold, weights={label: {} for label in LABELS}, bias={label: 0.0 for label in LABELS}, dim=dim)
+        rng = random.Random(seed)
+        for _ in range(epochs):
+            rng.shuffle(data)
+            for features, target in data:
+                probabilities = model._probabilities(features)
+                for label in LABELS:
+                    gradient = probabilities[label] - (1.0 if label == target else 0.0)
+                    row = model.weights[label]
+                    for index, value in features.items():
+                        weight = row.get(index, 0.0)
+                        row[index] = weight - learning_rate * (gradient * value + l2 * weight)
+                    model.bias[label] -= learning_rate * gradient
+        return model
+
+    def save(self, path: str) -> None:
+        payload = {
+            "dim": self.dim,
+            "labels": LABELS,
+            "bias": self.bias,
+            "weights": {label: {str(i): round(w, 6) for i, w in row.items() if abs(w) > 1e-6} for label, row in self.weights.items()},
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+
+    @classmethod
+    def load(cls, path: str, threshold: float = 0.9) -> "IntentClassifier":
+        with open(path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+        weights = {label: {int(i): w for i, w in row.items()} for label, row in payload["weights"].items()}
+        return cls(threshold=threshold, weights=weights, bias=payload["bias"], dim=payload["dim"])
+
+    @classmethod
+    def get(cls) -> "IntentClassifier":
+        """Return the process-wide classifier (rules, plus the trained model if one is configured)."""
+        global _classifier
+        if _classifier is None:
+            threshold = Config.get_float("INTENT_CONFIDENCE_THRESHOLD", 0.9)
+            path = Config.get("INTENT_MODEL_PATH", DEFAULT_MODEL_PATH)
+            if path and os.path.exists(path):
+                try:
+                    _classifier = cls.load(path, threshold=threshold)
+                    Logger.info(f"Loaded intent model from {path}")
+                except Exception as e:
+                    Logger.error(f"{__name__}> get -> Failed to load intent model {path}: {e}")
+            if _classifier is None:
+                Logger.info("No intent model found; intent classifier is running rules only")
+                _classifier = cls(threshold=threshold)
+        return _classifier
+
+
+_classifier: Optional[IntentClassifier] = None
+
+
+def load_labelled_examples(path: str) -> List[Tuple[str, str]]:
+    """Read (message, label) pairs from a JSON lines file, skipping unlabelled rows."""
+    examples = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            row = json.loads(line)
+            if row.get("label"):
+                examples.append((row["message"], row["label"]))
+    return examples
@@ -0,0 +1,276 @@
+import inspect
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+import numpy as np
+import openai
+from national_agentic_ai_hackathon_2025_backend.config import Config
+from national_agentic_ai_hackathon_2025_backend.context.global_context import GlobalContext
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.base import openai_breaker
+from national_agentic_ai_hackathon_2025_backend.handlers.intent_classifier import IntentClassifier, ROUTE_LABELS
+from national_agentic_ai_hackathon_2025_backend.utils.text_features import normalize_text, hashed_features
+from national_agentic_ai_hackathon_2025_backend.utils.deadline import Deadline, DeadlineExceeded
+from national_agentic_ai_hackathon_2025_backend.utils.metrics import Metrics
+from national_agentic_ai_hackathon_2025_backend._debug import Logger
+
+# Dense, L2-normalised float32 vector
+Embedding = np.ndarray
+EmbedFn = Callable[[str], Union[Embedding, Awaitable[Embedding]]]
+
+# Hash buckets of the local embedding; at cache sizes, 2**12 scores the same as the classifier's 2**14
+LOCAL_EMBEDDING_DIM = 2 ** 12
+DEFAULT_EMBEDDING_TIMEOUT_SECONDS = 1.0
+
+# Character n-grams score "open" and "not open" alike, so the local embedding only serves near-exact repeats
+DEFAULT_THRESHOLDS = {"local": 0.97, "openai": 0.92}
+
+# Tokens that flip a question's meaning; "t" is what normalize_text leaves of "isn't" / "don't"
+NEGATION_TOKENS = frozenset({"no", "not", "never", "t", "cannot", "without", "nahi", "nahin", "na", "mat"})
+
+# First-person possessives: the answer depends on who is asking ("my complaint", "mera case")
+PERSONAL_TOKENS = frozenset({
+    "my", "mine", "our", "ours", "myself",
+    "mera", "meri", "mere", "mujhe", "hamara", "hamari", "hamare", "humara", "humari", "humare",
+})
+
+
+def negations(text: str) -> frozenset:
+    """Negation tokens in normalised text."""
+    return NEGATION_TOKENS.intersection(text.split())
+
+
+def local_embedding(text: str) -> Embedding:
+    """Offline embedding: L2-normalised hashed character n-grams."""
+    vector = np.zeros(LOCAL_EMBEDDING_DIM, dtype=np.float32)
+    for index, value in hashed_features(text, LOCAL_EMBEDDING_DIM).items():
+        vector[index] = value
+    return vector
+
+
+async def openai_embedding(text: str) -> Embedding:
+    """
+    Embedding from the OpenAI embeddings API, as a normalised vector. One
+    attempt through the ``openai`` breaker, within
+    RESPONSE_CACHE_EMBEDDING_TIMEOUT_SECONDS capped by the request deadline.
+    """
+    client = Config.get_openai_client()
+    if client is None:
+        raise RuntimeError("OpenAI client is not configured")
+    limit = Config.get_float("RESPONSE_CACHE_EMBEDDING_TIMEOUT_SECONDS", DEFAULT_EMBEDDING_TIMEOUT_SECONDS)
+    timeout = Deadline.timeout(limit)
+    with openai_breaker().guard():
+        try:
+            response = await client.with_options(timeout=timeout, max_retries=0).embeddings.create(
+                model=Config.get("RESPONSE_CACHE_EMBEDDING_MODEL", "text-embedding-3-small"),
+                input=text,
+            )
+        except openai.APITimeoutError:
+            if timeout < limit:
+                # Cut short by the request budget, not a slow API: keep it off the breaker
+                raise DeadlineExceeded("Request deadline passed during the cache embedding") from None
+            raise
+    vector = np.asarray(response.data[0].embedding, dtype=np.float32)
+    return vector / (np.linalg.norm(vector) or 1.0)
+
+
+@dataclass
+class CacheEntry:
+    text: str
+    row: int
+    response: str
+    created_at: float
+    hits: int = 0
+    last_hit_at: Optional[float] = None
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    bypassed: int = 0
+    stored: int = 0
+    rejected: int = 0
+    expired: int = 0
+    evicted: int = 0
+    errors: int = 0
+    entries: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class SemanticResponseCache:
+    """
+    Cache of non-critical guidance answers keyed by the normalised and embedded
+    message. A lookup hits when the cosine similarity to a stored message is at
+    least ``threshold``. Entries expire after ``ttl_seconds`` and the least
+    recently used entry is evicted beyond ``max_entries``. Embeddings live
+    in one matrix, so a lookup scores every entry in a single product.
+
+    Messages that look like emergencies or refer to the asker's own
+    situation ("my", "mera") are never looked up or stored, a similar
+    message only matches if both carry the same negations, and answers that
+    mention the asking user's details are never stored. The cache is
+    optional: an embedding error is a miss (or no store), never a failed
+    request.
+    """
+
+    def __init__(
+        self,
+        embed_fn: EmbedFn = local_embedding,
+        threshold: float = DEFAULT_THRESHOLDS["local"],
+        ttl_seconds: float = 3600,
+        max_entries: int = 500,
+        min_words: int = 3,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.embed_fn = embed_fn
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.min_words = min_words
+        self.clock = clock
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._stats = CacheStats()
+        # Row i holds the embedding of the entry with row i; sized on the first store
+        self._matrix: Optional[np.ndarray] = None
+        self._texts: List[Optional[str]] = [None] * max_entries
+        self._free: List[int] = list(range(max_entries - 1, -1, -1))
+
+    async def lookup(self, message: str) -> Optional[str]:
+        """Return a cached answer for a similar message, or None (also on any error)."""
+        try:
+            return await self._lookup(message)
+        except Exception as e:
+            self._error("lookup", e)
+            return None
+
+    async def store(self, message: str, response: str, context: Optional[GlobalContext] = None) -> bool:
+        """Store a non-critical answer. Returns False if it was not cacheable or could not be stored."""
+        try:
+            return await self._store(message, response, context)
+        except Exception as e:
+            self._error("store", e)
+            return False
+
+    async def _lookup(self, message: str) -> Optional[str]:
+        text = normalize_text(message)
+        if not self._is_cacheable(text):
+            self._stats.bypassed += 1
+            Metrics.increment("response_cache.bypass")
+            return None
+
+        self._expire()
+        entry = self._entries.get(text)
+        if entry is None and self._entries:
+            scores = self._matrix @ await self._embed(text)
+            negated = negations(text)
+            # Best first among rows over the threshold (free rows are zero vectors)
+            above = np.flatnonzero(scores >= self.threshold)
+            for row in above[np.argsort(-scores[above])]:
+                candidate = self._texts[row]
+                if candidate is not None and negations(candidate) == negated:
+                    entry = self._entries[candidate]
+                    break
+
+        if entry is None:
+            self._stats.misses += 1
+            Metrics.increment("response_cache.miss")
+            return None
+
+        entry.hits += 1
+        entry.last_hit_at = self.clock()
+        self._entries.move_to_end(entry.text)
+        self._stats.hits += 1
+        Metrics.increment("response_cache.hit")
+        Logger.info(f"Response cache hit for '{message}' (matched '{entry.text}')")
+        return entry.response
+
+    async def _store(self, message: str, response: str, context: Optional[GlobalContext]) -> bool:
+        text = normalize_text(message)
+        if not response or not self._is_cacheable(text) or self._is_personal(response, context):
+            self._stats.rejected += 1
+            return False
+
+        embedding = await self._embed(text)
+        if self._matrix is None:
+            self._matrix = np.zeros((self.max_entries, len(embedding)), dtype=np.float32)
+        if text in self._entries:
+            self._remove(text)
+        while not self._free:
+            self._remove(next(iter(self._entries)))
+            self._stats.evicted += 1
+        row = self._free.pop()
+        self._matrix[row] = embedding
+        self._texts[row] = text
+        self._entries[text] = CacheEntry(text=text, row=row, response=response, created_at=self.clock())
+        self._stats.stored += 1
+        Metrics.increment("response_cache.store")
+        return True
+
+    def stats(self, top: int = 10) -> Dict[str, Any]:
+        """Aggregate counters plus the most-hit entries."""
+        entries = sorted(self._entries.values(), key=lambda e: e.hits, reverse=True)[:top]
+        self._stats.entries = [{"text": e.text, "hits": e.hits} for e in entries]
+        stats = self._stats.__dict__.copy()
+        stats["size"] = len(self._entries)
+        return stats
+
+    def clear(self) -> None:
+        for text in list(self._entries):
+            self._remove(text)
+
+    def _remove(self, text: str) -> None:
+        entry = self._entries.pop(text)
+        self._matrix[entry.row] = 0.0
+        self._texts[entry.row] = None
+        self._free.append(entry.row)
+
+    def _error(self, operation: str, error: Exception) -> None:
+        self._stats.errors += 1
+        Metrics.increment("response_cache.error")
+        Logger.warning(f"Response cache {operation} failed, continuing without the cache: {error}")
+
+    def _is_cacheable(self, text: str) -> bool:
+        words = text.split()
+        if len(words) < self.min_words or PERSONAL_TOKENS.intersection(words):
+            return False
+        # Anything that even looks like an emergency must always reach the agents
+        decision = IntentClassifier.get().classify(text)
+        return decision.label not in ROUTE_LABELS
+
+    @staticmethod
+    def _is_personal(response: str, context: Optional[GlobalContext]) -> bool:
+        if context is None:
+            return False
+        user = context.user
+        lowered = response.lower()
+        return any(value and value.lower() in lowered for value in (user.username, user.phone_number, user.email, user.address))
+
+    def _expire(self) -> None:
+        cutoff = self.clock() - self.ttl_seconds
+        expired = [key for key, entry in self._entries.items() if entry.created_at < cutoff]
+        for key in expired:
+            self._remove(key)
+        self._stats.expired += len(expired)
+
+    async def _embed(self, text: str) -> Embedding:
+        embedding = self.embed_fn(text)
+        if inspect.isawaitable(embedding):
+            embedding = await embedding
+        return np.asarray(embedding, dtype=np.float32)
+
+    @classmethod
+    def get(cls) -> "SemanticResponseCache":
+        """Return the process-wide cache configured from RESPONSE_CACHE_* settings."""
+        global _cache
+        if _cache is None:
+            backend = "openai" if Config.get("RESPONSE_CACHE_EMBEDDING", "local").lower() == "openai" else "local"
+            _cache = cls(
+                embed_fn=openai_embedding if backend == "openai" else local_embedding,
+                threshold=Config.get_float("RESPONSE_CACHE_THRESHOLD", DEFAULT_THRESHOLDS[backend]),
+                ttl_seconds=Config.get_float("RESPONSE_CACHE_TTL_SECONDS", 3600),
+                max_entries=Config.get_int("RESPONSE_CACHE_MAX_ENTRIES", 500),
+            )
+        return _cache
+
+
+_cache: Optional[SemanticResponseCache] = None
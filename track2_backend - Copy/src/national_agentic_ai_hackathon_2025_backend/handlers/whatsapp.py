@@ -1,8 +1,10 @@
 from national_agentic_ai_hackathon_2025_backend.utils.wa_instance import wa
 from national_agentic_ai_hackathon_2025_backend._debug import Logger
+from national_agentic_ai_hackathon_2025_backend.utils.tracing import Tracer
 from pywa_async import types
 
 class WhatsappHandler:
+    @Tracer.traced("whatsapp.send_message")
     async def send_whatsapp_message(self, to: str, message: str, message_type: str = "text"):
         """Send a WhatsApp message."""
         try:
@@ -57,6 +59,7 @@ class WhatsappHandler:
         return (message.metadata.display_phone_number, message.from_user.wa_id)
 
     @staticmethod
+    @Tracer.traced("whatsapp.transcribe_audio")
     async def _transcribe_audio_message(message) -> str:
         """Transcribe audio message to text using OpenAI Whisper."""
         try:
@@ -1,60 +1,419 @@
+import asyncio
+import time
+from typing import Any, AsyncIterator, Dict, Optional, Tuple, Union
 from national_agentic_ai_hackathon_2025_backend.context.global_context import GlobalContext
-from national_agentic_ai_hackathon_2025_backend.agents_workflow.guidance_agent.agent import GuidanceAgent
-from national_agentic_ai_hackathon_2025_backend.agents_workflow.orchestrator_agent.agent import OrchestratorAgent
-from national_agentic_ai_hackathon_2025_backend.agents_workflow.police_agent.agent import PoliceAgent
-from national_agentic_ai_hackathon_2025_backend.agents_workflow.medical_agent.agent import MedicalAgent
-from national_agentic_ai_hackathon_2025_backend.agents_workflow.degraded_performer_agent.agent import DegradedPerformerAgent
-from national_agentic_ai_hackathon_2025_backend.agents_workflow.catastrophic_agent.agent import CatastrophicAgent
-from national_agentic_ai_hackathon_2025_backend.utils._helpers import should_enable_degraded_mode
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.registry import AgentRegistry
+from agents.usage import Usage
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.base import collect_usage, openai_breaker
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.model_policy import ModelPolicy
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.guidance_agent.output_type import GuidanceOutputType
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.orchestrator_agent.output_type import OrchestratorOutputType
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.triage_agent.output_type import TriageOutputType
+from national_agentic_ai_hackathon_2025_backend.handlers.intent_classifier import IntentClassifier
+from national_agentic_ai_hackathon_2025_backend.handlers.response_cache import SemanticResponseCache
+from national_agentic_ai_hackathon_2025_backend.tools.location.offline_geocoder import OfflineGeocoder
+from national_agentic_ai_hackathon_2025_backend.tools.location.road_router import RoadRouter
+from national_agentic_ai_hackathon_2025_backend.utils._helpers import should_enable_degraded_mode, _generate_random_id, _get_current_time
+from national_agentic_ai_hackathon_2025_backend.utils.metrics import Metrics
+from national_agentic_ai_hackathon_2025_backend.utils.tracing import Tracer
+from national_agentic_ai_hackathon_2025_backend.utils.deadline import Deadline, DeadlineExceeded
+from national_agentic_ai_hackathon_2025_backend.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.catastrophic_agent.agent import CATASTROPHIC_FALLBACK_RESPONSE
+from national_agentic_ai_hackathon_2025_backend.config import Config
 from national_agentic_ai_hackathon_2025_backend._debug import Logger
 
+TRIAGE_MODES = {"sequential", "speculative", "fused"}
+
+# Lead line of the reply sent when the request deadline passes or OpenAI is unavailable, by the route known at that point
+FALLBACK_LEADS = {
+    "medical": "I could not finish finding medical help right now. If this is a medical emergency, call 1122 now.",
+    "police": "I could not finish finding police help right now. If you are in danger, call 15 now.",
+    "catastrophic": "I could not finish processing your request right now. If lives are at risk, call 1122 now.",
+}
+
+# Dependencies whose outage switches a request to DegradedPerformerAgent
+DEGRADED_DEPENDENCIES = ("supabase", "google_maps", "smtp")
+
+# Trace flag set by each kind of fallback reply
+FALLBACK_TRACE_FLAGS = {"deadline": "deadline_exceeded", "breaker": "breaker_open", "triage": "triage_failed"}
+
+
+class TriageFailed(Exception):
+    """A triage agent returned its error reply instead of a structured output."""
+
+
 class WorkFlow:
-    def __init__(self, status = None) -> None:
+    def __init__(self, status = None, triage_mode: Optional[str] = None) -> None:
+        self.status = status
         self.enable_degraded = should_enable_degraded_mode(status)
+        self.agents = AgentRegistry.get()
+        self.classifier = IntentClassifier.get() if Config.get_bool("INTENT_CLASSIFIER_ENABLED") else None
+        self.response_cache = SemanticResponseCache.get() if Config.get_bool("RESPONSE_CACHE_ENABLED") else None
+        self.triage_mode = (triage_mode or Config.get("TRIAGE_MODE", "sequential")).lower()
+        # Guidance reply for a critical message, kept as the partial answer if routing runs out of time
+        self.partial_response: Optional[str] = None
+        if self.triage_mode not in TRIAGE_MODES:
+            Logger.warning(f"Unknown TRIAGE_MODE '{self.triage_mode}', falling back to sequential")
+            self.triage_mode = "sequential"
 
     async def execute_workflow(self, message: str, context: GlobalContext):
+        with ModelPolicy.request(self.status):
+            return await self._execute_workflow(message, context)
+
+    async def _execute_workflow(self, message: str, context: GlobalContext):
         Logger.info(f"Starting workflow execution for message: {message}")
-        
-        if self.enable_degraded:
+
+        if openai_breaker().is_open:
+            return self._fallback(message, None, "breaker")
+
+        if self.enable_degraded or self._dependency_outage():
             Logger.warning("System is in degraded mode. Using DegradedPerformerAgent.")
-            degraded_agent = DegradedPerformerAgent(context)
-            return await degraded_agent.run(message)
-            
-        guidance_agent = GuidanceAgent(context)
-        Logger.info("Running GuidanceAgent...")
-        agent_output = await guidance_agent.run(message)
-        Logger.info(f"GuidanceAgent output: {agent_output}")
+            Tracer.annotate_trace(route="degraded")
+            try:
+                with Deadline.for_route("degraded"):
+                    return await self.agents.degraded.run(message, context)
+            except DeadlineExceeded:
+                return self._fallback(message, None, "deadline")
+            except CircuitOpenError:
+                return self._fallback(message, None, "breaker")
+
+        try:
+            decision = await self._traced_decide(message, context)
+        except DeadlineExceeded:
+            return self._fallback(message, None, "deadline")
+        except CircuitOpenError:
+            return self._fallback(message, None, "breaker")
+        except TriageFailed:
+            return self._fallback(message, None, "triage")
+        if isinstance(decision, str):
+            return decision
+
+        try:
+            with Tracer.span("workflow.route", route=decision.request_type), Deadline.for_route(decision.request_type):
+                return await self._route(decision, message, context)
+        except DeadlineExceeded:
+            return self._fallback(message, decision.request_type, "deadline")
+        except CircuitOpenError:
+            return self._fallback(message, decision.request_type, "breaker")
+
+    async def stream_workflow(self, message: str, context: GlobalContext) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of execute_workflow. Yields ``stage`` events as the
+        request moves through triage and routing, the specialist agent's
+        ``token`` and ``tool_call`` events, and a final ``done`` event with the
+        complete response.
+        """
+        with ModelPolicy.request(self.status):
+            async for event in self._stream_workflow(message, context):
+                yield event
+
+    async def _stream_workflow(self, message: str, context: GlobalContext) -> AsyncIterator[Dict[str, Any]]:
+        Logger.info(f"Starting streaming workflow for message: {message}")
+
+        if openai_breaker().is_open:
+            yield {"event": "done", "response": self._fallback(message, None, "breaker")}
+            return
+
+        if self.enable_degraded or self._dependency_outage():
+            Logger.warning("System is in degraded mode. Using DegradedPerformerAgent.")
+            Tracer.annotate_trace(route="degraded")
+            yield {"event": "stage", "stage": "routed", "route": "degraded"}
+            with Deadline.for_route("degraded"):
+                async for event in self.agents.degraded.stream(message, context):
+                    yield event
+            return
+
+        try:
+            decision = await self._traced_decide(message, context)
+        except DeadlineExceeded:
+            yield {"event": "done", "response": self._fallback(message, None, "deadline")}
+            return
+        except CircuitOpenError:
+            yield {"event": "done", "response": self._fallback(message, None, "breaker")}
+            return
+        except TriageFailed:
+            yield {"event": "done", "response": self._fallback(message, None, "triage")}
+            return
+        if isinstance(decision, str):
+            yield {"event": "stage", "stage": "triage", "is_critical": False}
+            yield {"event": "token", "delta": decision}
+            yield {"event": "done", "response": decision}
+            return
+
+        yield {"event": "stage", "stage": "triage", "is_critical": True}
+        agent = self._agent_for(decision.request_type)
+        if agent is None:
+            Logger.error(f"Unknown request type: {decision.request_type}. Returning error message.")
+            yield {"event": "done", "response": "Something went wrong"}
+            return
+
+        yield {"event": "stage", "stage": "routed", "route": decision.request_type}
+        with Deadline.for_route(decision.request_type):
+            async for event in agent.stream(message, context):
+                yield event
+
+    async def _traced_decide(self, message: str, context: GlobalContext) -> Union[str, OrchestratorOutputType]:
+        """
+        Run _decide in a ``workflow.decide`` span, within the guidance
+        deadline, and tag the trace with the outcome.
+        """
+        with Tracer.span("workflow.decide", triage_mode=self.triage_mode), Deadline.for_route("guidance"):
+            decision = await self._decide(message, context)
+        if isinstance(decision, str):
+            Tracer.annotate_trace(route="guidance")
+        else:
+            Tracer.annotate_trace(route=decision.request_type, case_id=decision.case_id)
+        return decision
+
+    async def _decide(self, message: str, context: GlobalContext) -> Union[str, OrchestratorOutputType]:
+        """
+        Run everything in front of the specialist agents. Returns the final
+        reply for non-critical messages, or the routing decision for critical ones.
+        """
+        if self.classifier is not None:
+            start = time.perf_counter()
+            decision = self.classifier.classify(message)
+            Metrics.observe("intent.classify", time.perf_counter() - start)
+            Metrics.increment("intent.total")
+            if decision.is_chat:
+                Logger.info(f"Pre-classifier answered {decision.label} message without triage.")
+                Metrics.increment("intent.absorbed")
+                Metrics.increment(f"intent.absorbed.{decision.label}")
+                Tracer.annotate(decided_by="intent", intent=decision.label)
+                return self.classifier.reply_for(decision, message)
+            if decision.is_route:
+                Logger.info(f"Pre-classifier routed message to {decision.label} without triage.")
+                Metrics.increment("intent.absorbed")
+                Metrics.increment(f"intent.absorbed.{decision.label}")
+                Tracer.annotate(decided_by="intent", intent=decision.label)
+                return OrchestratorOutputType(
+                    case_id=_generate_random_id(4),
+                    request_type=decision.label,
+                    request_text=message,
+                    timestamp=_get_current_time(),
+                )
+            Metrics.increment("intent.deferred")
 
-        if not agent_output.is_critical:
+        if self.response_cache is not None:
+            cached_response = await self.response_cache.lookup(message)
+            if cached_response:
+                Tracer.annotate(decided_by="response_cache")
+                return cached_response
+
+        start = time.perf_counter()
+        if self.triage_mode == "speculative":
+            guidance_output, orchestrator_output = await self._speculative_triage(message, context)
+        elif self.triage_mode == "fused":
+            guidance_output, orchestrator_output = await self._fused_triage(message, context)
+        else:
+            guidance_output, orchestrator_output = await self._sequential_triage(message, context)
+        Metrics.observe(f"triage.{self.triage_mode}.total", time.perf_counter() - start)
+        Tracer.annotate(decided_by="triage", is_critical=guidance_output.is_critical)
+
+        if not guidance_output.is_critical:
             Logger.info("Message is not critical. Returning guidance agent response.")
-            return agent_output.response
+            if self.response_cache is not None:
+                await self.response_cache.store(message, guidance_output.response, context)
+            return guidance_output.response
+
+        self.partial_response = guidance_output.response
+        if not isinstance(orchestrator_output, OrchestratorOutputType):
+            Logger.warning("OrchestratorAgent failed. Returning fallback response.")
+            Metrics.increment("triage.orchestrator.failed")
+            raise TriageFailed("orchestrator")
+        return orchestrator_output
+
+    @staticmethod
+    def _dependency_outage() -> bool:
+        """True when a breaker for a dependency the full agents rely on is open."""
+        open_breakers = [name for name in DEGRADED_DEPENDENCIES if CircuitBreaker.get(name).is_open]
+        if "google_maps" in open_breakers and (OfflineGeocoder.get() is not None or RoadRouter.get() is not None):
+            # The location tools answer from the offline geocoder / road graph instead, so the full agents still work
+            open_breakers.remove("google_maps")
+        if open_breakers:
+            Logger.warning(f"Circuit breakers open: {', '.join(open_breakers)}")
+            Metrics.increment("breaker.degraded_requests")
+            Tracer.annotate_trace(breakers_open=",".join(open_breakers))
+        return bool(open_breakers)
+
+    def _fallback(self, message: str, route: Optional[str], reason: str) -> str:
+        """
+        Static reply used when the deadline passes (``reason="deadline"``),
+        the OpenAI breaker is open (``reason="breaker"``) or a triage agent
+        fails (``reason="triage"``): the guidance answer
+        if triage got that far, a route-specific line (the route from triage,
+        or else the pre-classifier's best guess) and the emergency contacts.
+        """
+        if route is None:
+            route = IntentClassifier.get().classify(message).label
+        Logger.warning(f"Returning {reason} fallback response (route: {route}).")
+        Metrics.increment(f"{reason}.fallback.{route or 'unknown'}")
+        Tracer.annotate_trace(**{FALLBACK_TRACE_FLAGS[reason]: True})
+        parts = [self.partial_response, FALLBACK_LEADS.get(route), CATASTROPHIC_FALLBACK_RESPONSE]
+        return "\n\n".join(part for part in parts if part)
+
+    async def _sequential_triage(
+        self, message: str, context: GlobalContext
+    ) -> Tuple[GuidanceOutputType, Optional[OrchestratorOutputType]]:
+        """Run GuidanceAgent, then OrchestratorAgent only if the message is critical."""
+        Logger.info("Running GuidanceAgent...")
+        guidance_output = await self._timed_branch("guidance", self.agents.guidance.run(message, context))
+        Logger.info(f"GuidanceAgent output: {guidance_output}")
+        self._require_guidance(guidance_output)
+
+        if not guidance_output.is_critical:
+            return guidance_output, None
 
         Logger.info("Message is critical. Escalating to OrchestratorAgent.")
-        orchestrator_agent = OrchestratorAgent(context)
-        agent_output = await orchestrator_agent.run(message)
-        Logger.info(f"OrchestratorAgent output: {agent_output}")
+        orchestrator_output = await self._timed_branch("orchestrator", self.agents.orchestrator.run(message, context))
+        Logger.info(f"OrchestratorAgent output: {orchestrator_output}")
+        return guidance_output, orchestrator_output
+
+    async def _speculative_triage(
+        self, message: str, context: GlobalContext
+    ) -> Tuple[GuidanceOutputType, Optional[OrchestratorOutputType]]:
+        """
+        Start GuidanceAgent and OrchestratorAgent together. The orchestrator
+        result is kept only if guidance marks the message critical; otherwise
+        the orchestrator branch is cancelled (or discarded if it already
+        finished) and its tokens are counted as
+        ``triage.speculative.orchestrator.wasted_tokens``.
+        """
+        Logger.info("Running GuidanceAgent and OrchestratorAgent speculatively...")
+        guidance_task = asyncio.create_task(
+            self._timed_branch("guidance", self.agents.guidance.run(message, context))
+        )
+        orchestrator_usage = Usage()
+        orchestrator_task = asyncio.create_task(
+            self._timed_branch("orchestrator", self.agents.orchestrator.run(message, context), orchestrator_usage)
+        )
+
+        try:
+            guidance_output = await guidance_task
+            Logger.info(f"GuidanceAgent output: {guidance_output}")
+            self._require_guidance(guidance_output)
+        except BaseException:
+            await self._cancel_branch(orchestrator_task)
+            Metrics.increment("triage.speculative.orchestrator.wasted_tokens", orchestrator_usage.total_tokens)
+            raise
+
+        if not guidance_output.is_critical:
+            if orchestrator_task.done():
+                Metrics.increment("triage.speculative.orchestrator_discarded")
+            else:
+                Metrics.increment("triage.speculative.orchestrator_cancelled")
+            await self._cancel_branch(orchestrator_task)
+            Metrics.increment("triage.speculative.orchestrator.wasted_tokens", orchestrator_usage.total_tokens)
+            return guidance_output, None
+
+        Logger.info("Message is critical. Using speculative OrchestratorAgent result.")
+        Metrics.increment("triage.speculative.orchestrator_used")
+        orchestrator_output = await orchestrator_task
+        Logger.info(f"OrchestratorAgent output: {orchestrator_output}")
+        return guidance_output, orchestrator_output
 
+    async def _fused_triage(
+        self, message: str, context: GlobalContext
+    ) -> Tuple[GuidanceOutputType, Optional[OrchestratorOutputType]]:
+        """
+        Run the single-call TriageAgent and map its output onto the two-stage
+        chain's output types. Falls back to the sequential chain if the fused
+        agent fails, and to OrchestratorAgent if it flags a message critical
+        without choosing a route.
+        """
+        Logger.info("Running TriageAgent...")
+        triage_output = await self._timed_branch("triage", self.agents.triage.run(message, context))
+        Logger.info(f"TriageAgent output: {triage_output}")
+
+        if not isinstance(triage_output, TriageOutputType):
+            Logger.warning("TriageAgent failed. Falling back to sequential triage.")
+            Metrics.increment("triage.fused.fallback_sequential")
+            return await self._sequential_triage(message, context)
+
+        guidance_output = GuidanceOutputType(
+            response=triage_output.response,
+            is_critical=triage_output.is_critical,
+        )
+        if not triage_output.is_critical:
+            return guidance_output, None
+
+        if triage_output.request_type is None:
+            Logger.warning("TriageAgent marked message critical without a route. Escalating to OrchestratorAgent.")
+            Metrics.increment("triage.fused.fallback_orchestrator")
+            orchestrator_output = await self._timed_branch("orchestrator", self.agents.orchestrator.run(message, context))
+            return guidance_output, orchestrator_output
+
+        return guidance_output, OrchestratorOutputType(
+            case_id=_generate_random_id(4),
+            request_type=triage_output.request_type,
+            request_text=message,
+            timestamp=_get_current_time(),
+        )
+
+    @staticmethod
+    def _require_guidance(guidance_output) -> None:
+        """Raise TriageFailed if GuidanceAgent returned its error reply."""
+        if not isinstance(guidance_output, GuidanceOutputType):
+            Logger.warning("GuidanceAgent failed. Returning fallback response.")
+            Metrics.increment("triage.guidance.failed")
+            raise TriageFailed("guidance")
+
+    async def _timed_branch(self, branch: str, coro, usage: Optional[Usage] = None):
+        """
+        Await a triage branch and record its latency and tokens (also when it
+        fails or is cancelled) under the current triage mode. Pass ``usage`` to
+        read the branch's token count afterwards.
+        """
+        start = time.perf_counter()
+        with collect_usage(usage) as usage:
+            try:
+                result = await coro
+            finally:
+                Metrics.increment(f"triage.{self.triage_mode}.{branch}.tokens", usage.total_tokens)
+        Metrics.observe(f"triage.{self.triage_mode}.{branch}", time.perf_counter() - start)
+        return result
+
+    @staticmethod
+    async def _cancel_branch(task: asyncio.Task) -> None:
+        """Cancel a speculative branch and wait for it to unwind."""
+        if task.done():
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            Logger.warning(f"Cancelled triage branch raised: {e}")
+
+    def _agent_for(self, request_type: str):
+        """Specialist agent for a routing decision, or None if the route is unknown."""
+        return {
+            "police": self.agents.police,
+            "medical": self.agents.medical,
+            "catastrophic": self.agents.catastrophic,
+        }.get(request_type)
+
+    async def _route(self, agent_output: OrchestratorOutputType, message: str, context: GlobalContext):
+        """Dispatch a critical message to the specialist agent chosen by the orchestrator."""
         if agent_output.request_type == "police":
             Logger.info("Request type is police. Running PoliceAgent.")
-            police_agent = PoliceAgent(context)
-            agent_output = await police_agent.run(message)
+            agent_output = await self.agents.police.run(message, context)
             Logger.info(f"PoliceAgent output: {agent_output}")
             return agent_output
 
         elif agent_output.request_type == "medical":
             Logger.info("Request type is medical. Running MedicalAgent.")
-            medical_agent = MedicalAgent(context)
-            agent_output = await medical_agent.run(message)
+            agent_output = await self.agents.medical.run(message, context)
             Logger.info(f"MedicalAgent output: {agent_output}")
             return agent_output
 
         elif agent_output.request_type == "catastrophic":
             Logger.info("Request type is catastrophic. Running CatastrophicAgent.")
-            catastrophic_agent = CatastrophicAgent(context)
-            agent_output = await catastrophic_agent.run(message)
-            Logger.info(f"MedicalAgent output: {agent_output}")
+            agent_output = await self.agents.catastrophic.run(message, context)
+            Logger.info(f"CatastrophicAgent output: {agent_output}")
             return agent_output
-        
-        else: 
+
+        else:
             Logger.error(f"Unknown request type: {agent_output.request_type}. Returning error message.")
-            return "Something went wrong"
\ No newline at end of file
+            return "Something went wrong"
@@ -1,9 +1,18 @@
+import asyncio
 from dotenv import load_dotenv
 from fastapi.middleware.cors import CORSMiddleware
 # from national_agentic_ai_hackathon_2025_backend.utils.wa_instance import wa
 from national_agentic_ai_hackathon_2025_backend._debug import Logger, enable_verbose_logging
+from national_agentic_ai_hackathon_2025_backend.config import Config
 from national_agentic_ai_hackathon_2025_backend.utils.app_instance import app
 from national_agentic_ai_hackathon_2025_backend.routes.chat import router
+from national_agentic_ai_hackathon_2025_backend.routes.internal import router as internal_router
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.registry import AgentRegistry
+from national_agentic_ai_hackathon_2025_backend.tools.location.maps_http import MapsClient
+from national_agentic_ai_hackathon_2025_backend.tools.location.offline_geocoder import OfflineGeocoder
+from national_agentic_ai_hackathon_2025_backend.tools.location.distance_matrix import DistanceMatrix
+from national_agentic_ai_hackathon_2025_backend.database.facility_index import FacilityIndex
+from national_agentic_ai_hackathon_2025_backend.handlers.idempotency import IdempotencyStore
 
 load_dotenv()
 enable_verbose_logging()
@@ -19,6 +28,38 @@ app.add_middleware(
 
 # Include routers
 app.include_router(router)
+app.include_router(internal_router)
+
+if Config.get_bool("WHATSAPP_WEBHOOK_ENABLED"):
+    # Creating the WhatsApp client registers /webhook and the message handlers on app
+    from national_agentic_ai_hackathon_2025_backend.utils.wa_instance import wa
+
+@app.on_event("startup")
+async def build_agent_registry():
+    """Build every agent definition once, before the first request arrives."""
+    AgentRegistry.get()
+
+@app.on_event("startup")
+async def load_offline_maps_data():
+    """Load the boundary index and road graph up front instead of on the first Maps call."""
+    await asyncio.to_thread(OfflineGeocoder.get)
+    await asyncio.to_thread(DistanceMatrix.get)
+
+@app.on_event("startup")
+async def load_facility_index():
+    """Hold the health and police facility tables in memory for nearest/radius lookups."""
+    await FacilityIndex.load_all()
+
+@app.on_event("startup")
+async def open_idempotency_store():
+    """Open the WhatsApp update store up front, so a bad IDEMPOTENCY_BACKEND shows at startup."""
+    if Config.get_bool("WHATSAPP_WEBHOOK_ENABLED"):
+        await asyncio.to_thread(IdempotencyStore.get)
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    """Close pooled upstream connections."""
+    await MapsClient.get().close()
 
 @app.get("/", tags=["Health"])
 async def health_check():
@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, ValidationError
-from typing import Optional
+from typing import Any, AsyncIterator, Dict, Optional
+import json
 from national_agentic_ai_hackathon_2025_backend.schemas.user import User
 from national_agentic_ai_hackathon_2025_backend.context.coordinates import Coordinates
 from national_agentic_ai_hackathon_2025_backend.bot.web_bot import WebBot, DeviceStatus
@@ -40,3 +41,41 @@ async def chat(request: Request):
         import traceback
         print("Error in /chat route:", traceback.format_exc())
         return JSONResponse(content={"error": str(e)}, status_code=500)
+
+
+@router.post("/chat/stream")
+async def chat_stream(request: Request):
+    """
+    Streaming variant of /chat. Emits one JSON event per line (NDJSON), or
+    Server-Sent Events when the client sends ``Accept: text/event-stream``.
+    Event types: stage, tool_call, token, error, done.
+    """
+    try:
+        body = await request.json()
+        payload = ChatPayload(**body)
+    except ValidationError as e:
+        return JSONResponse(content={"validation_error": e.errors()}, status_code=422)
+    except Exception as e:
+        return JSONResponse(content={"error": str(e)}, status_code=400)
+
+    use_sse = "text/event-stream" in request.headers.get("accept", "")
+    bot = WebBot(status=payload.status)
+    events = bot.stream_workflow(
+        user=payload.user,
+        message=payload.message,
+        coordinates=payload.coordinates,
+    )
+    return StreamingResponse(
+        _encode_events(events, use_sse),
+        media_type="text/event-stream" if use_sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _encode_events(events: AsyncIterator[Dict[str, Any]], use_sse: bool) -> AsyncIterator[str]:
+    async for event in events:
+        data = json.dumps(event, ensure_ascii=False)
+        if use_sse:
+            yield f"event: {event['event']}\ndata: {data}\n\n"
+        else:
+            yield data + "\n"
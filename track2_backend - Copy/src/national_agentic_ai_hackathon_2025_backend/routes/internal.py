@@ -0,0 +1,65 @@
+from fastapi import APIRouter, Depends, Header, HTTPException
+from typing import Optional
+from national_agentic_ai_hackathon_2025_backend.config import Config
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.prompt_template import instruction_report
+from national_agentic_ai_hackathon_2025_backend.utils.metrics import Metrics
+from national_agentic_ai_hackathon_2025_backend.utils.tracing import Tracer
+from national_agentic_ai_hackathon_2025_backend.utils.circuit_breaker import CircuitBreaker
+from national_agentic_ai_hackathon_2025_backend.tools.location.geocode_cache import GeocodeCache
+from national_agentic_ai_hackathon_2025_backend.tools.location.distance_matrix import DistanceMatrix
+
+
+async def require_internal_token(x_internal_token: Optional[str] = Header(default=None)):
+    """If INTERNAL_API_TOKEN is set, /internal endpoints require it in the X-Internal-Token header."""
+    expected = Config.get("INTERNAL_API_TOKEN")
+    if expected and x_internal_token != expected:
+        raise HTTPException(status_code=401, detail="Invalid internal token")
+
+
+router = APIRouter(prefix="/internal", tags=["Internal"], dependencies=[Depends(require_internal_token)])
+
+
+@router.get("/metrics")
+async def metrics():
+    """Counters and per-stage latency histograms (``span.*`` entries are the traced stages)."""
+    return Metrics.snapshot()
+
+
+@router.get("/traces")
+async def traces(limit: int = 50):
+    """Most recent finished traces, newest first."""
+    return {"traces": Tracer.get_exporter().recent(limit)}
+
+
+@router.get("/traces/{trace_id}")
+async def trace(trace_id: str):
+    """A single trace by trace id or request id (WhatsApp message id for WhatsApp traffic)."""
+    found = Tracer.get_exporter().find(trace_id)
+    if found is None:
+        raise HTTPException(status_code=404, detail="Trace not found")
+    return found
+
+
+@router.get("/prompts")
+async def prompts():
+    """Per-agent stable instruction prefix size and prompt-cache hit ratio so far."""
+    return {"agents": instruction_report()}
+
+
+@router.get("/breakers")
+async def breakers():
+    """Circuit breaker state per dependency; any open breaker puts new requests in degraded mode."""
+    return {"breakers": CircuitBreaker.snapshot_all()}
+
+
+@router.get("/geocode-cache")
+async def geocode_cache():
+    """Reverse-geocode cache hit rate and the number of Google Geocoding calls it saved."""
+    cache = GeocodeCache.get()
+    return {"enabled": cache is not None, **(cache.stats() if cache is not None else {})}
+
+
+@router.get("/distance-matrix")
+async def distance_matrix():
+    """Distance Matrix elements requested vs. sent (pre-ranking and cache savings) and request latency."""
+    return DistanceMatrix.get().stats()
@@ -10,5 +10,8 @@ class Message(BaseModel):
 class ChatHistory(BaseModel):
     phone_number: str
     messages: List[Message] = []
+    # Rolling summary of messages[:summarized_count] (see HistorySummarizer)
+    summary: Optional[str] = None
+    summarized_count: Optional[int] = None
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
@@ -0,0 +1,73 @@
+"""
+Microbenchmark: per-request agent construction vs. the shared AgentRegistry.
+
+"per-request" rebuilds the agents a critical medical message used to need
+(Guidance, Orchestrator, Medical -> Booking + FileSearch tools) on every
+message. "registry" looks the same agents up on the process-wide registry.
+No model calls are made.
+
+Usage:
+    uv run python -m national_agentic_ai_hackathon_2025_backend.scripts.benchmark_agent_registry --iterations 2000
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from rich import print
+from rich.table import Table
+
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.registry import AgentRegistry
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.guidance_agent.agent import GuidanceAgent
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.orchestrator_agent.agent import OrchestratorAgent
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.medical_agent.agent import MedicalAgent
+
+
+def per_request():
+    return GuidanceAgent(), OrchestratorAgent(), MedicalAgent()
+
+
+def from_registry():
+    agents = AgentRegistry.get()
+    return agents.guidance, agents.orchestrator, agents.medical
+
+
+def measure(fn, iterations: int):
+    """Return (microseconds per call, bytes allocated per call)."""
+    fn()  # warm up imports and lazy state
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    keep = [fn() for _ in range(min(iterations, 200))]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed / iterations * 1e6, (after - before) / len(keep)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    table = Table(title=f"Agent construction cost ({args.iterations} iterations)")
+    table.add_column("Strategy")
+    table.add_column("µs / request")
+    table.add_column("bytes retained / request")
+
+    results = {}
+    for name, fn in (("per-request", per_request), ("registry", from_registry)):
+        us, allocated = measure(fn, args.iterations)
+        results[name] = us
+        table.add_row(name, f"{us:,.2f}", f"{allocated:,.0f}")
+
+    print(table)
+    if results["registry"]:
+        print(f"[green]Registry lookup is {results['per-request'] / results['registry']:,.0f}x cheaper per request[/green]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Benchmark: Distance Matrix elements and latency for get_nearest_place traffic.
+
+Starts the Maps stand-in (scripts/stand_ins.py) in a subprocess and replays
+--calls nearest-facility lookups: users scattered within a few hundred metres
+of a handful of neighbourhood centres, each asking for the nearest of
+--destinations facilities in their city. The same traffic runs through:
+
+- ``single request``: every destination in one URL, as the tool used to do
+  (the real API rejects more than 25 destinations; the stand-in does not)
+- ``chunked``: DistanceMatrix with requests of at most 25 destinations
+- ``+ top-k``: haversine pre-ranking down to --top-k candidates
+- ``+ top-k + cache``: and the (origin cell, destination) cache
+
+Usage:
+    uv run python -m national_agentic_ai_hackathon_2025_backend.scripts.benchmark_distance_matrix
+    uv run python -m national_agentic_ai_hackathon_2025_backend.scripts.benchmark_distance_matrix --calls 500 --destinations 60 --top-k 8 --latency-ms 150
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from typing import List, Optional, Tuple
+
+from rich import print
+from rich.table import Table
+
+from national_agentic_ai_hackathon_2025_backend.scripts.benchmark_maps_client import wait_for_stand_in
+from national_agentic_ai_hackathon_2025_backend.scripts.stand_ins import CITIES, free_port
+from national_agentic_ai_hackathon_2025_backend.tools.location.distance_matrix import DistanceCache, DistanceMatrix
+from national_agentic_ai_hackathon_2025_backend.tools.location.maps_http import MapsClient, maps_get, maps_url
+
+Call = Tuple[Tuple[float, float], List[str]]
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def build_traffic(calls: int, destinations: int, seed: int) -> List[Call]:
+    rng = random.Random(seed)
+    facilities = {
+        city: [f"{lat + rng.uniform(-0.15, 0.15):.6f},{lng + rng.uniform(-0.15, 0.15):.6f}" for _ in range(destinations)]
+        for city, lat, lng in CITIES
+    }
+    # A few busy neighbourhoods per city; users within ~300 m of their centre
+    centres = [
+        (city, lat + rng.uniform(-0.05, 0.05), lng + rng.uniform(-0.05, 0.05))
+        for city, lat, lng in CITIES for _ in range(3)
+    ]
+    traffic = []
+    for _ in range(calls):
+        city, lat, lng = rng.choice(centres)
+        origin = (lat + rng.uniform(-0.003, 0.003), lng + rng.uniform(-0.003, 0.003))
+        traffic.append((origin, facilities[city]))
+    return traffic
+
+
+async def single_request(origin: Tuple[float, float], destinations: List[str]) -> int:
+    url = maps_url("/maps/api/distancematrix/json") + (
+        f"?origins={origin[0]},{origin[1]}&destinations={'|'.join(destinations)}&mode=driving&key=bench"
+    )
+    await maps_get(url)
+    return len(destinations)
+
+
+async def run(traffic: List[Call], concurrency: int, matrix: Optional[DistanceMatrix]) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    elements = 0
+    requests = 0
+
+    async def one(origin: Tuple[float, float], destinations: List[str]) -> None:
+        nonlocal elements, requests
+        async with semaphore:
+            start = time.perf_counter()
+            if matrix is None:
+                sent = await single_request(origin, destinations)
+                elements += sent
+                requests += 1
+            else:
+                await matrix.query(origin, destinations)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(origin, destinations) for origin, destinations in traffic))
+    elapsed = time.perf_counter() - start
+    if matrix is not None:
+        stats = matrix.stats()
+        elements, requests = stats["elements_sent"], stats["requests"]
+    return {
+        "elements": elements,
+        "requests": requests,
+        "p50_ms": _percentile(latencies, 0.50) * 1000,
+        "p95_ms": _percentile(latencies, 0.95) * 1000,
+        "wall_s": elapsed,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--destinations", type=int, default=40, help="Facilities per city passed on every call")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=100.0, help="Stand-in response latency")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    os.environ["GOOGLE_MAPS_BASE_URL"] = base_url
+    stand_in = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "national_agentic_ai_hackathon_2025_backend.scripts.stand_ins",
+        "--http-port", str(port), "--smtp-port", str(free_port()), "--latency", f"google_maps={args.latency_ms}",
+        stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL,
+    )
+    try:
+        await wait_for_stand_in(base_url)
+        traffic = build_traffic(args.calls, args.destinations, args.seed)
+        modes = {
+            "single request": None,
+            "chunked": DistanceMatrix(),
+            "+ top-k": DistanceMatrix(top_k=args.top_k),
+            "+ top-k + cache": DistanceMatrix(top_k=args.top_k, cache=DistanceCache()),
+        }
+        requested = args.calls * args.destinations
+        table = Table(title=f"{args.calls} calls x {args.destinations} destinations, {args.latency_ms:.0f} ms upstream latency")
+        for column in ("Mode", "Elements sent", "Saved", "Requests", "p50 (ms)", "p95 (ms)", "Wall (s)"):
+            table.add_column(column)
+        for name, matrix in modes.items():
+            result = await run(traffic, args.concurrency, matrix)
+            table.add_row(
+                name, f"{result['elements']:,}", f"{1 - result['elements'] / requested:.0%}", f"{result['requests']:,}",
+                f"{result['p50_ms']:,.0f}", f"{result['p95_ms']:,.0f}", f"{result['wall_s']:.2f}",
+            )
+        await MapsClient.get().close()
+        print(table)
+    finally:
+        stand_in.terminate()
+        await stand_in.wait()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,159 @@
+"""
+Benchmark: facility lookups through the database vs. the in-memory index.
+
+Part one starts the Supabase stand-in (scripts/stand_ins.py) in a subprocess
+and runs --queries radius lookups through HealthFacilityDB: first the
+existing path (``execute_sql`` RPC, which the stand-in rejects as a database
+without PostGIS would, then the bounding-box query), then the same calls
+after FacilityIndex.load_all, checking both return the same facilities.
+
+Part two builds an index over --scale synthetic facilities spread over
+Pakistan and times k-nearest and radius queries, with and without an
+amenity filter, against a brute-force haversine scan.
+
+Usage:
+    uv run python -m national_agentic_ai_hackathon_2025_backend.scripts.benchmark_facility_index
+    uv run python -m national_agentic_ai_hackathon_2025_backend.scripts.benchmark_facility_index --latency-ms 40 --scale 500000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from typing import Callable, List, Tuple
+
+from rich import print
+from rich.table import Table
+
+from national_agentic_ai_hackathon_2025_backend.scripts.benchmark_maps_client import wait_for_stand_in
+from national_agentic_ai_hackathon_2025_backend.scripts.stand_ins import CITIES, free_port
+from national_agentic_ai_hackathon_2025_backend.utils.geo import haversine_km
+
+AMENITIES = ["hospital", "clinic", "pharmacy", "doctors", "dentist"]
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def _city_points(count: int, rng: random.Random, spread: float) -> List[Tuple[float, float]]:
+    points = []
+    for _ in range(count):
+        _, lat, lng = rng.choice(CITIES)
+        points.append((lat + rng.uniform(-spread, spread), lng + rng.uniform(-spread, spread)))
+    return points
+
+
+def _time(queries: list, run: Callable) -> Tuple[List[float], list]:
+    timings, answers = [], []
+    for query in queries:
+        start = time.perf_counter()
+        answers.append(run(*query))
+        timings.append(time.perf_counter() - start)
+    return timings, answers
+
+
+async def database_vs_index(args, table: Table) -> None:
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    os.environ.update({"SUPABASE_URL": base_url, "SUPABASE_SERVICE_ROLE_KEY": "bench", "FACILITY_INDEX_ENABLED": "true"})
+    stand_in = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "national_agentic_ai_hackathon_2025_backend.scripts.stand_ins",
+        "--http-port", str(port), "--smtp-port", str(free_port()), "--latency", f"supabase={args.latency_ms}",
+        stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL,
+    )
+    try:
+        await wait_for_stand_in(base_url)
+        # Imported late: the DB client reads SUPABASE_URL when it is created
+        from national_agentic_ai_hackathon_2025_backend.database.facility_index import FacilityIndex
+        from national_agentic_ai_hackathon_2025_backend.database.hospital import HealthFacilityDB
+
+        db = HealthFacilityDB()
+        queries = _city_points(args.queries, random.Random(args.seed), 0.1)
+        answers = {}
+        for name in ("RPC -> bounding box", "FacilityIndex"):
+            if name == "FacilityIndex":
+                start = time.perf_counter()
+                await FacilityIndex.load_all()
+                print(f"Loaded {len(FacilityIndex.get(db.table_name)):,} facilities in {time.perf_counter() - start:.2f} s")
+            timings, ids = [], []
+            for lat, lng in queries:
+                start = time.perf_counter()
+                result = await db.get_health_facilities_by_location(lat, lng, args.radius_km, limit=1000)
+                timings.append(time.perf_counter() - start)
+                ids.append([row["osm_id"] for row in result["data"]])
+            answers[name] = ids
+            table.add_row(
+                f"stand-in, {name}", str(len(queries)), f"{_percentile(timings, 0.50) * 1000:,.3f}",
+                f"{_percentile(timings, 0.95) * 1000:,.3f}",
+            )
+        mismatches = sum(a != b for a, b in zip(*answers.values()))
+        print(f"Queries where the database and the index disagree: {mismatches}")
+    finally:
+        stand_in.terminate()
+        await stand_in.wait()
+
+
+def index_at_scale(args, table: Table) -> None:
+    from national_agentic_ai_hackathon_2025_backend.database.facility_index import FacilityIndex
+
+    rng = random.Random(args.seed)
+    rows = [
+        {"osm_id": osm_id, "Y": rng.uniform(24.0, 36.0), "X": rng.uniform(61.0, 77.0), "amenity": rng.choice(AMENITIES)}
+        for osm_id in range(args.scale)
+    ]
+    start = time.perf_counter()
+    index = FacilityIndex(rows)
+    print(f"Indexed {args.scale:,} synthetic facilities in {time.perf_counter() - start:.2f} s")
+    queries = _city_points(args.queries, rng, 0.3)
+
+    def brute_force(lat: float, lng: float, k: int, amenity=None) -> List[int]:
+        ranked = sorted(
+            (haversine_km(lat, lng, row["Y"], row["X"]), row["osm_id"])
+            for row in rows if amenity is None or row["amenity"] == amenity
+        )
+        return [osm_id for _, osm_id in ranked[:k]]
+
+    cases = [
+        ("nearest k=5", lambda lat, lng: [r["osm_id"] for r in index.nearest(lat, lng, 5)], 5, None),
+        ("nearest k=5, amenity", lambda lat, lng: [r["osm_id"] for r in index.nearest(lat, lng, 5, amenity="dentist")], 5, "dentist"),
+        (f"within {args.radius_km:g} km", lambda lat, lng: index.within(lat, lng, args.radius_km), None, None),
+        (f"within {args.radius_km:g} km, amenity", lambda lat, lng: index.within(lat, lng, args.radius_km, amenity="dentist"), None, None),
+    ]
+    for name, run, k, amenity in cases:
+        timings, answers = _time(queries, run)
+        table.add_row(
+            f"{args.scale:,} rows, {name}", str(len(queries)),
+            f"{_percentile(timings, 0.50) * 1000:,.3f}", f"{_percentile(timings, 0.95) * 1000:,.3f}",
+        )
+        if k is not None:
+            checked = queries[:args.verify]
+            wrong = sum(answer != brute_force(lat, lng, k, amenity) for (lat, lng), answer in zip(checked, answers))
+            print(f"{name}: {wrong} of {len(checked)} answers differ from a brute-force scan")
+    timings, _ = _time(queries[:args.verify], lambda lat, lng: brute_force(lat, lng, 5))
+    table.add_row(f"{args.scale:,} rows, brute-force scan", str(len(timings)), f"{_percentile(timings, 0.50) * 1000:,.3f}", f"{_percentile(timings, 0.95) * 1000:,.3f}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--radius-km", type=float, default=5.0)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Stand-in Supabase latency per request")
+    parser.add_argument("--scale", type=int, default=200_000, help="Synthetic facilities for the in-memory comparison")
+    parser.add_argument("--verify", type=int, default=20, help="Queries checked against a brute-force scan")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    table = Table(title="Facility lookups")
+    for column in ("Path", "Queries", "p50 (ms)", "p95 (ms)"):
+        table.add_column(column)
+    await database_vs_index(args, table)
+    index_at_scale(args, table)
+    print(table)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,161 @@
+"""
+Benchmark: worker cold start and memory, JSON rows vs. a mapped snapshot.
+
+Generates --scale synthetic health facilities and starts --workers
+processes per mode, as uvicorn would. Every worker loads the table, runs
+--queries nearest-facility lookups, and reports its load time and memory
+while all workers are still alive:
+
+- ``JSON -> dicts``: parse the rows as Supabase returns them and keep
+  them, as get_all_health_facility callers did
+- ``JSON -> FacilityIndex``: parse, then build the index (columnar copy)
+- ``snapshot -> FacilityIndex``: FacilitySnapshot.open on the file written
+  by scripts/build_facility_snapshot.py
+
+Memory is PSS from /proc/self/smaps_rollup (Linux): pages shared between
+workers are split between them, so the total is what the host pays. The
+snapshot file is in the page cache after being written, as it would be
+once the first worker has started.
+
+Usage:
+    uv run python -m national_agentic_ai_hackathon_2025_backend.scripts.benchmark_facility_snapshot
+    uv run python -m national_agentic_ai_hackathon_2025_backend.scripts.benchmark_facility_snapshot --scale 1000000 --workers 8
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from rich import print
+from rich.table import Table
+
+from national_agentic_ai_hackathon_2025_backend.scripts.stand_ins import CITIES
+
+MODES = ("JSON -> dicts", "JSON -> FacilityIndex", "snapshot -> FacilityIndex")
+
+
+def _pss_mb() -> Optional[float]:
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+def synthetic_rows(count: int, seed: int) -> List[Dict]:
+    rng = random.Random(seed)
+    rows = []
+    for osm_id in range(1, count + 1):
+        city, lat, lng = rng.choice(CITIES)
+        rows.append({
+            "osm_id": osm_id * 7919,
+            "name": f"{city} {rng.choice(['General', 'Family', 'Children', 'Eye'])} Hospital {osm_id}",
+            "amenity": rng.choice(["hospital", "clinic", "pharmacy", "doctors", "dentist"]),
+            "speciality": rng.choice([None, "dental", "gynecology", "paediatrics", "cardiology"]),
+            "addr_full": f"Plot {rng.randint(1, 999)}, Block {rng.randint(1, 20)}, {city}",
+            "contact_number": f"+92300{osm_id:07d}",
+            "X": round(lng + rng.uniform(-0.3, 0.3), 6),
+            "Y": round(lat + rng.uniform(-0.3, 0.3), 6),
+            "changeset_timestamp": "2024-05-01T00:00:00Z",
+            "available_beds": rng.choice([None, rng.randint(0, 200)]),
+        })
+    return rows
+
+
+def worker(mode: str, json_path: str, snapshot_path: str, queries: int, barrier, results) -> None:
+    from national_agentic_ai_hackathon_2025_backend.database.facility_index import FacilityIndex
+    from national_agentic_ai_hackathon_2025_backend.database.facility_snapshot import FacilitySnapshot
+
+    before = _pss_mb()
+    start = time.perf_counter()
+    if mode == "snapshot -> FacilityIndex":
+        held = FacilityIndex(snapshot=FacilitySnapshot.open(snapshot_path))
+    else:
+        with open(json_path, "rb") as f:
+            held = json.loads(f.read())
+        if mode == "JSON -> FacilityIndex":
+            held = FacilityIndex(held)
+    load_s = time.perf_counter() - start
+
+    rng = random.Random(os.getpid())
+    start = time.perf_counter()
+    for _ in range(queries):
+        _, lat, lng = rng.choice(CITIES)
+        lat, lng = lat + rng.uniform(-0.2, 0.2), lng + rng.uniform(-0.2, 0.2)
+        if isinstance(held, FacilityIndex):
+            held.nearest(lat, lng, 5)
+        else:
+            # What a caller holding the rows has to do: scan them all
+            sorted(held, key=lambda row: (row["Y"] - lat) ** 2 + (row["X"] - lng) ** 2)[:5]
+    query_ms = (time.perf_counter() - start) / max(1, queries) * 1000
+
+    # Measure with every worker alive so shared pages are split between them
+    barrier.wait()
+    after = _pss_mb()
+    results.put((load_s, query_ms, after, None if before is None or after is None else after - before))
+    barrier.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    from national_agentic_ai_hackathon_2025_backend.database.facility_snapshot import FacilitySnapshot
+
+    directory = tempfile.mkdtemp(prefix="facility-snapshot-")
+    json_path = os.path.join(directory, "health_facility.json")
+    snapshot_path = os.path.join(directory, "health_facility.snapshot")
+    rows = synthetic_rows(args.scale, args.seed)
+    with open(json_path, "w") as f:
+        json.dump(rows, f)
+    start = time.perf_counter()
+    FacilitySnapshot.from_rows(rows, "health_facility").save(snapshot_path)
+    print(
+        f"{args.scale:,} facilities: JSON {os.path.getsize(json_path) / 1e6:.1f} MB, snapshot "
+        f"{os.path.getsize(snapshot_path) / 1e6:.1f} MB (built in {time.perf_counter() - start:.1f} s)"
+    )
+    del rows
+
+    context = multiprocessing.get_context("spawn")
+    table = Table(title=f"{args.workers} workers, {args.scale:,} facilities")
+    for column in ("Mode", "Load p50 (ms)", "Nearest (ms)", "PSS per worker (MB)", "Added by load, total (MB)"):
+        table.add_column(column)
+    for mode in MODES:
+        barrier = context.Barrier(args.workers)
+        results = context.Queue()
+        processes = [
+            context.Process(target=worker, args=(mode, json_path, snapshot_path, args.queries, barrier, results))
+            for _ in range(args.workers)
+        ]
+        for process in processes:
+            process.start()
+        measured = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+        loads = sorted(m[0] for m in measured)
+        pss = [m[2] for m in measured if m[2] is not None]
+        added = [m[3] for m in measured if m[3] is not None]
+        table.add_row(
+            mode, f"{loads[len(loads) // 2] * 1000:,.1f}", f"{sum(m[1] for m in measured) / len(measured):,.3f}",
+            f"{sum(pss) / len(pss):,.1f}" if pss else "n/a", f"{sum(added):,.1f}" if added else "n/a",
+        )
+    print(table)
+    os.remove(json_path)
+    os.remove(snapshot_path)
+    os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    main()
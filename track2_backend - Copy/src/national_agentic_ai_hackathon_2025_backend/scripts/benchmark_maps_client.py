@@ -0,0 +1,159 @@
+"""
+Benchmark: Google Maps calls under concurrency, old sync client vs. MapsClient.
+
+Starts the Maps stand-in (scripts/stand_ins.py) in a subprocess with a fixed
+response latency, then issues --calls geocode requests, --concurrency at a
+time, in each mode while a heartbeat task measures event-loop lag (how late
+a 10 ms sleep wakes up, i.e. how long every other user on the worker waits):
+
+- ``blocking on loop``: a synchronous GET called from a coroutine, as a sync
+  tool runs when the agents SDK invokes it directly
+- ``blocking in thread``: the same call via ``asyncio.to_thread`` (what newer
+  SDK versions do for sync tools; bounded by the default executor)
+- ``aiohttp per call``: async, but a new session and connection per call
+- ``MapsClient``: the shared pooled client the tools use now
+
+Usage:
+    uv run python -m national_agentic_ai_hackathon_2025_backend.scripts.benchmark_maps_client
+    uv run python -m national_agentic_ai_hackathon_2025_backend.scripts.benchmark_maps_client --calls 500 --concurrency 100 --latency-ms 150
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import urllib.request
+from typing import Awaitable, Callable, Dict, List
+
+import aiohttp
+import httpx
+from rich import print
+from rich.table import Table
+
+from national_agentic_ai_hackathon_2025_backend.scripts.stand_ins import free_port
+from national_agentic_ai_hackathon_2025_backend.tools.location.maps_http import MapsClient, maps_url
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)] if ordered else 0.0
+
+
+async def heartbeat(lags: List[float], stop: asyncio.Event, interval: float = 0.01) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+
+async def measure(call: Callable[[str], Awaitable[dict]], urls: List[str], concurrency: int) -> Dict[str, float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    lags: List[float] = []
+    stop = asyncio.Event()
+
+    async def one(url: str) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await call(url)
+            latencies.append(time.perf_counter() - start)
+
+    monitor = asyncio.create_task(heartbeat(lags, stop))
+    start = time.perf_counter()
+    await asyncio.gather(*(one(url) for url in urls))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await monitor
+    return {
+        "wall_s": elapsed,
+        "calls_per_s": len(urls) / elapsed,
+        "p50_ms": _percentile(latencies, 0.50) * 1000,
+        "p95_ms": _percentile(latencies, 0.95) * 1000,
+        "lag_p99_ms": _percentile(lags, 0.99) * 1000,
+        "lag_max_ms": max(lags, default=0.0) * 1000,
+    }
+
+
+def blocking_get(url: str) -> dict:
+    # A fresh connection per call, like the synchronous client the tools used before
+    with urllib.request.urlopen(url, timeout=10) as response:
+        return json.loads(response.read())
+
+
+async def blocking_on_loop(url: str) -> dict:
+    return blocking_get(url)
+
+
+async def blocking_in_thread(url: str) -> dict:
+    return await asyncio.to_thread(blocking_get, url)
+
+
+async def aiohttp_per_call(url: str) -> dict:
+    async with aiohttp.ClientSession() as session:
+        async with session.get(url) as response:
+            return await response.json()
+
+
+async def maps_client(url: str) -> dict:
+    return await MapsClient.get().get_json(url)
+
+
+async def wait_for_stand_in(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.perf_counter() < deadline:
+            try:
+                await client.get(f"{base_url}/maps/api/geocode/json", params={"latlng": "0,0"})
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError("Maps stand-in did not start")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=100.0, help="Stand-in response latency")
+    args = parser.parse_args()
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    os.environ["GOOGLE_MAPS_BASE_URL"] = base_url
+    stand_in = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "national_agentic_ai_hackathon_2025_backend.scripts.stand_ins",
+        "--http-port", str(port), "--smtp-port", str(free_port()), "--latency", f"google_maps={args.latency_ms}",
+        stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL,
+    )
+    try:
+        await wait_for_stand_in(base_url)
+        urls = [
+            maps_url("/maps/api/geocode/json") + f"?latlng={24.80 + i * 0.001:.4f},{67.00 + i * 0.001:.4f}&key=bench"
+            for i in range(args.calls)
+        ]
+        modes = {
+            "blocking on loop": blocking_on_loop,
+            "blocking in thread": blocking_in_thread,
+            "aiohttp per call": aiohttp_per_call,
+            "MapsClient": maps_client,
+        }
+        table = Table(title=f"{args.calls} geocode calls, {args.concurrency} concurrent, {args.latency_ms:.0f} ms upstream latency")
+        for column in ("Mode", "Wall (s)", "Calls/s", "p50 (ms)", "p95 (ms)", "Loop lag p99 (ms)", "Loop lag max (ms)"):
+            table.add_column(column)
+        for name, call in modes.items():
+            result = await measure(call, urls, args.concurrency)
+            table.add_row(
+                name, f"{result['wall_s']:.2f}", f"{result['calls_per_s']:,.0f}", f"{result['p50_ms']:,.0f}",
+                f"{result['p95_ms']:,.0f}", f"{result['lag_p99_ms']:,.1f}", f"{result['lag_max_ms']:,.1f}",
+            )
+        await MapsClient.get().close()
+        print(table)
+    finally:
+        stand_in.terminate()
+        await stand_in.wait()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
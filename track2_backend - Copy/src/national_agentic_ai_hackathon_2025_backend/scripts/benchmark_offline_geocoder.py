@@ -0,0 +1,138 @@
+"""
+Benchmark: offline reverse geocoding, indexed lookup vs. a linear scan.
+
+Without --geojson the boundaries are synthetic: Pakistan's bounding box cut
+into --provinces columns of --districts-per-province districts each, with
+wavy borders of --vertices points per side so the polygons cost about as much
+to test as real district outlines. The linear scan runs the same ray-casting
+test over every edge of every region, which is what a lookup without the grid
+and latitude bands would do.
+
+Usage:
+    uv run python -m national_agentic_ai_hackathon_2025_backend.scripts.benchmark_offline_geocoder
+    uv run python -m national_agentic_ai_hackathon_2025_backend.scripts.benchmark_offline_geocoder --geojson pak_adm1.geojson,pak_adm3.geojson
+"""
+
+import argparse
+import math
+import random
+import time
+from typing import Dict, List, Tuple
+
+from rich import print
+from rich.table import Table
+
+from national_agentic_ai_hackathon_2025_backend.tools.location.offline_geocoder import (
+    Edge,
+    OfflineGeocoder,
+    Region,
+    _build_region,
+)
+
+BBOX = (60.9, 23.7, 77.8, 37.1)
+
+
+def wavy_rectangle(x0: float, y0: float, x1: float, y1: float, vertices: int) -> List[Tuple[float, float]]:
+    # Borders wiggle as a function of position only, so neighbouring cells share them exactly
+    def bottom_top(y: float, x: float) -> Tuple[float, float]:
+        return x, y + 0.01 * math.sin(40 * x)
+
+    def left_right(x: float, y: float) -> Tuple[float, float]:
+        return x + 0.01 * math.sin(40 * y), y
+
+    steps = [i / vertices for i in range(vertices)]
+    ring = [bottom_top(y0, x0 + (x1 - x0) * t) for t in steps]
+    ring += [left_right(x1, y0 + (y1 - y0) * t) for t in steps]
+    ring += [bottom_top(y1, x1 - (x1 - x0) * t) for t in steps]
+    ring += [left_right(x0, y1 - (y1 - y0) * t) for t in steps]
+    return ring
+
+
+def synthetic_regions(provinces: int, districts: int, vertices: int) -> List[Region]:
+    min_lng, min_lat, max_lng, max_lat = BBOX
+    width = (max_lng - min_lng) / provinces
+    height = (max_lat - min_lat) / districts
+    regions = []
+    for p in range(provinces):
+        x0, x1 = min_lng + p * width, min_lng + (p + 1) * width
+        province = f"Province {p + 1}"
+        regions.append(_build_region(1, {"province": province}, [wavy_rectangle(x0, min_lat, x1, max_lat, vertices * districts)]))
+        for d in range(districts):
+            y0, y1 = min_lat + d * height, min_lat + (d + 1) * height
+            names = {"province": province, "district": f"District {p + 1}-{d + 1}"}
+            regions.append(_build_region(3, names, [wavy_rectangle(x0, y0, x1, y1, vertices)]))
+    return regions
+
+
+def linear_scan(regions: List[Tuple[Region, List[Edge]]], lat: float, lng: float) -> Dict[str, str]:
+    names: Dict[str, str] = {}
+    for region, edges in regions:
+        inside = False
+        for x1, y1, x2, y2 in edges:
+            if (y1 > lat) != (y2 > lat) and lng < x1 + (lat - y1) * (x2 - x1) / (y2 - y1):
+                inside = not inside
+        if inside:
+            names.update(region.names)
+    return names
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--geojson", help="Comma-separated boundary files instead of synthetic regions")
+    parser.add_argument("--provinces", type=int, default=6)
+    parser.add_argument("--districts-per-province", type=int, default=25)
+    parser.add_argument("--vertices", type=int, default=500, help="Points per side of a synthetic district")
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--scan-queries", type=int, default=100, help="Queries for the (slow) linear scan")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.geojson:
+        geocoder = OfflineGeocoder.from_geojson([p.strip() for p in args.geojson.split(",")])
+    else:
+        geocoder = OfflineGeocoder(synthetic_regions(args.provinces, args.districts_per_province, args.vertices))
+    build_s = time.perf_counter() - start
+    flat = [(r, list({e for band in r.bands for e in band})) for r in sorted(geocoder.regions, key=lambda r: r.level)]
+    edges = sum(len(region_edges) for _, region_edges in flat)
+
+    rng = random.Random(args.seed)
+    min_lng, min_lat, max_lng, max_lat = BBOX
+    points = [(rng.uniform(min_lat, max_lat), rng.uniform(min_lng, max_lng)) for _ in range(args.queries)]
+
+    indexed: List[float] = []
+    found = 0
+    for lat, lng in points:
+        start = time.perf_counter()
+        result = geocoder.reverse(lat, lng)
+        indexed.append(time.perf_counter() - start)
+        found += result is not None
+
+    scanned: List[float] = []
+    mismatches = 0
+    for lat, lng in points[:args.scan_queries]:
+        start = time.perf_counter()
+        names = linear_scan(flat, lat, lng)
+        scanned.append(time.perf_counter() - start)
+        result = geocoder.reverse(lat, lng) or {}
+        mismatches += names.get("district") != result.get("district")
+
+    table = Table(title=f"{len(geocoder.regions)} regions, {edges:,} edges, index built in {build_s:.2f} s")
+    for column in ("Lookup", "Queries", "p50 (us)", "p99 (us)", "Queries/s"):
+        table.add_column(column)
+    for name, timings in (("grid + bands", indexed), ("linear scan", scanned)):
+        table.add_row(
+            name, str(len(timings)), f"{_percentile(timings, 0.50) * 1e6:,.1f}",
+            f"{_percentile(timings, 0.99) * 1e6:,.1f}", f"{len(timings) / sum(timings):,.0f}",
+        )
+    print(table)
+    print(f"Points inside a region: {found}/{len(points)}; district mismatches vs. linear scan: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
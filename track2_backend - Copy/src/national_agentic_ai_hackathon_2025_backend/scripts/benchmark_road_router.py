@@ -0,0 +1,108 @@
+"""
+Benchmark: offline one-to-many travel times, A* vs. plain Dijkstra.
+
+Without --graph the network is a synthetic city: a --size x --size street
+grid at 100 m spacing around Karachi, with a faster arterial every tenth
+street. Each query routes from a random point to the --destinations nearest
+of --facilities random facilities (the candidates get_nearest_place keeps
+after pre-ranking).
+
+Usage:
+    uv run python -m national_agentic_ai_hackathon_2025_backend.scripts.benchmark_road_router
+    uv run python -m national_agentic_ai_hackathon_2025_backend.scripts.benchmark_road_router --graph data/road_graph.npz --queries 200
+"""
+
+import argparse
+import random
+import time
+from typing import List, Tuple
+
+from rich import print
+from rich.table import Table
+
+from national_agentic_ai_hackathon_2025_backend.tools.location.road_router import RoadGraph, RoadRouter
+from national_agentic_ai_hackathon_2025_backend.utils.geo import haversine_km
+
+ORIGIN = (24.80, 66.95)
+SPACING_DEG = 0.0009
+
+
+def synthetic_city(size: int) -> RoadGraph:
+    lat = [ORIGIN[0] + (i // size) * SPACING_DEG for i in range(size * size)]
+    lng = [ORIGIN[1] + (i % size) * SPACING_DEG for i in range(size * size)]
+    edges = []
+    for row in range(size):
+        for col in range(size):
+            u = row * size + col
+            for v, arterial in ((u + 1, row % 10 == 0), (u + size, col % 10 == 0)):
+                if (v == u + 1 and col + 1 == size) or v >= size * size:
+                    continue
+                metres = haversine_km(lat[u], lng[u], lat[v], lng[v]) * 1000
+                seconds = metres / ((50 if arterial else 25) / 3.6)
+                edges += [(u, v, seconds, metres), (v, u, seconds, metres)]
+    return RoadGraph.from_edges(lat, lng, edges)
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--graph", help="A graph built by scripts/build_road_graph.py instead of the synthetic city")
+    parser.add_argument("--size", type=int, default=200, help="Synthetic grid side (nodes)")
+    parser.add_argument("--facilities", type=int, default=60)
+    parser.add_argument("--destinations", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    graph = RoadGraph.load(args.graph) if args.graph else synthetic_city(args.size)
+    build_s = time.perf_counter() - start
+    router = RoadRouter(graph)
+    dijkstra = RoadRouter(graph)
+    # Zero heuristic turns the A* search into plain Dijkstra
+    dijkstra._max_speed_ms = float("inf")
+
+    rng = random.Random(args.seed)
+    lo_lat, hi_lat = float(graph.lat.min()), float(graph.lat.max())
+    lo_lng, hi_lng = float(graph.lng.min()), float(graph.lng.max())
+
+    def point() -> Tuple[float, float]:
+        return rng.uniform(lo_lat, hi_lat), rng.uniform(lo_lng, hi_lng)
+
+    facilities = [point() for _ in range(args.facilities)]
+    queries = []
+    for _ in range(args.queries):
+        origin = point()
+        nearest = sorted(facilities, key=lambda f: haversine_km(*origin, *f))[:args.destinations]
+        queries.append((origin, nearest))
+
+    table = Table(title=f"{graph.node_count:,} nodes, {graph.edge_count:,} edges (loaded in {build_s:.1f} s)")
+    for column in ("Search", "Queries", "p50 (ms)", "p95 (ms)", "Reached"):
+        table.add_column(column)
+    results = {}
+    for name, candidate in (("A*", router), ("Dijkstra", dijkstra)):
+        timings: List[float] = []
+        reached = 0
+        answers = []
+        for origin, destinations in queries:
+            start = time.perf_counter()
+            elements = candidate.travel_times(origin, destinations)
+            timings.append(time.perf_counter() - start)
+            reached += sum(e["status"] == "OK" for e in elements)
+            answers.append([e.get("duration", {}).get("value") for e in elements])
+        results[name] = answers
+        table.add_row(
+            name, str(len(queries)), f"{_percentile(timings, 0.50) * 1000:,.1f}",
+            f"{_percentile(timings, 0.95) * 1000:,.1f}", f"{reached}/{len(queries) * args.destinations}",
+        )
+    print(table)
+    mismatches = sum(a != d for a, d in zip(results["A*"], results["Dijkstra"]))
+    print(f"Queries where A* and Dijkstra disagree: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Throughput benchmark of the whole WorkFlow against replayed model responses.
+
+Every agent is served from the fixture file (MODEL_PROVIDER_MODE=replay is
+forced, strict unless --lenient) and the tools talk to the upstream
+stand-ins (scripts/stand_ins.py) instead of Supabase, Google Maps and SMTP,
+so the run needs no network and no credits, and the same arguments give the
+same outputs every time. Latency per model call is the recorded one unless
+--latency-ms is given; --jitter-ms adds seeded noise, --latency
+SERVICE=MS slows a stand-in down.
+
+Throughput is reported next to the runs that did not take the normal path
+(degraded agent, fallback replies, replay fallbacks) and the circuit
+breakers that opened; the run exits non-zero if any breaker opened, since
+its numbers then measure the fallbacks rather than the workflow.
+
+Record fixtures from real traffic first with MODEL_PROVIDER_MODE=record
+(appends to MODEL_FIXTURES_PATH), or use the seed file in data/.
+
+Usage:
+    uv run python -m national_agentic_ai_hackathon_2025_backend.scripts.benchmark_workflow_replay
+    uv run python -m national_agentic_ai_hackathon_2025_backend.scripts.benchmark_workflow_replay --requests 500 --concurrency 50 --latency-ms 800 --jitter-ms 200
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Dict, List
+
+from rich import print
+from rich.table import Table
+
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.model_fixtures import DEFAULT_FIXTURES_PATH, recorded_messages
+from national_agentic_ai_hackathon_2025_backend.config import Config
+from national_agentic_ai_hackathon_2025_backend.context.chat_history import ChatHistoryContext
+from national_agentic_ai_hackathon_2025_backend.context.global_context import GlobalContext
+from national_agentic_ai_hackathon_2025_backend.context.user import UserContext
+from national_agentic_ai_hackathon_2025_backend.handlers.workflow import WorkFlow
+from national_agentic_ai_hackathon_2025_backend.scripts.stand_ins import UpstreamStandIns, parse_latency
+from national_agentic_ai_hackathon_2025_backend.tools.location.maps_http import MapsClient
+from national_agentic_ai_hackathon_2025_backend.utils.metrics import Metrics
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def _counters(suffix: str = "", prefix: str = "", contains: str = "") -> Dict[str, float]:
+    counters = Metrics.snapshot()["counters"]
+    return {
+        name: value for name, value in counters.items()
+        if name.startswith(prefix) and name.endswith(suffix) and contains in name and value
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", default=os.environ.get("MODEL_FIXTURES_PATH") or DEFAULT_FIXTURES_PATH)
+    parser.add_argument("--requests", type=int, default=200, help="Total workflow runs")
+    parser.add_argument("--concurrency", type=int, default=20, help="Runs in flight at once")
+    parser.add_argument("--latency-ms", type=float, help="Fixed latency per model call (default: recorded latency)")
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", action="append", default=[], metavar="SERVICE=MS", help="Stand-in latency, e.g. supabase=30")
+    parser.add_argument("--lenient", action="store_true", help="Replay another message's recording when none matches (MODEL_REPLAY_STRICT=false)")
+    args = parser.parse_args()
+
+    messages = recorded_messages(args.fixtures)
+    if not messages:
+        print(f"[red]No guidance or triage fixtures with an input message in {args.fixtures}[/red]")
+        return
+
+    stand_ins = UpstreamStandIns(latency_ms=parse_latency(args.latency))
+    await stand_ins.start()
+    os.environ.update(
+        stand_ins.env(),
+        MODEL_PROVIDER_MODE="replay",
+        MODEL_FIXTURES_PATH=args.fixtures,
+        MODEL_REPLAY_JITTER_MS=str(args.jitter_ms),
+        MODEL_REPLAY_SEED=str(args.seed),
+        MODEL_REPLAY_STRICT="false" if args.lenient else "true",
+    )
+    if args.latency_ms is not None:
+        os.environ["MODEL_REPLAY_LATENCY_MS"] = str(args.latency_ms)
+    # Read once at import time, before the stand-ins existed
+    Config.sender_email = os.environ["SENDER_EMAIL"]
+    Config.app_password = os.environ["APP_PASSWORD"]
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one(index: int) -> None:
+        nonlocal errors
+        phone_number = f"bench-{index % args.concurrency}"
+        context = GlobalContext(
+            user=UserContext(phone_number=phone_number),
+            chat_history=ChatHistoryContext(phone_number=phone_number, messages=[]),
+        )
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await WorkFlow().execute_workflow(messages[index % len(messages)], context)
+            except Exception as e:
+                errors += 1
+                print(f"[red]Run {index} failed: {e}[/red]")
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(one(i) for i in range(args.requests)))
+    finally:
+        await MapsClient.get().close()
+        await stand_ins.stop()
+    elapsed = time.perf_counter() - start
+
+    degraded = Metrics.get_counter("agent.degraded.requests")
+    fallbacks = _counters(contains=".fallback.")
+    replay_fallbacks = Metrics.get_counter("replay.fallback")
+    breakers = [name[len("breaker."):-len(".opened")] for name in _counters(prefix="breaker.", suffix=".opened")]
+
+    table = Table(title=f"WorkFlow on replayed responses ({len(messages)} distinct messages)")
+    for column in (
+        "Requests", "Concurrency", "Throughput (req/s)", "p50 (ms)", "p95 (ms)", "Errors",
+        "Degraded", "Fallback replies", "Replay fallbacks", "Breakers opened",
+    ):
+        table.add_column(column)
+    table.add_row(
+        str(args.requests),
+        str(args.concurrency),
+        f"{args.requests / elapsed:,.1f}",
+        f"{_percentile(latencies, 0.50) * 1000:,.0f}",
+        f"{_percentile(latencies, 0.95) * 1000:,.0f}",
+        str(errors),
+        f"{degraded:,.0f}",
+        f"{sum(fallbacks.values()):,.0f}",
+        f"{replay_fallbacks:,.0f}",
+        ", ".join(breakers) or "none",
+    )
+    print(table)
+    for name, count in sorted(fallbacks.items()):
+        print(f"[yellow]{name}: {count:,.0f}[/yellow]")
+
+    table = Table(title="Upstream stand-ins")
+    table.add_column("Service")
+    table.add_column("Requests")
+    for service, count in sorted(stand_ins.requests.items()):
+        table.add_row(service, str(count))
+    table.add_row("emails", str(stand_ins.emails))
+    print(table)
+
+    if breakers:
+        print(f"[red]Circuit breakers opened during the run ({', '.join(breakers)}); the numbers above measure fallbacks[/red]")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
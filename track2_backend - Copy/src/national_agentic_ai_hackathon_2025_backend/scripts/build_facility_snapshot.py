@@ -0,0 +1,56 @@
+"""
+Build the memory-mapped facility snapshots FacilityIndex loads at startup.
+
+Reads the health_facility and police_facility tables from Supabase (paged)
+and writes <output-dir>/<table>.snapshot. Set FACILITY_SNAPSHOT_DIR to the
+directory (with FACILITY_INDEX_ENABLED=true) and every worker maps the same
+files read-only instead of pulling the tables as JSON. Rebuild after bulk
+imports: writes made through the API only reach the worker that made them
+until then. Files are replaced atomically, so running workers are not
+disturbed.
+
+Usage:
+    uv run python -m national_agentic_ai_hackathon_2025_backend.scripts.build_facility_snapshot --output-dir data/facilities
+"""
+
+import argparse
+import os
+import time
+
+from rich import print
+
+from national_agentic_ai_hackathon_2025_backend.config import Config
+from national_agentic_ai_hackathon_2025_backend.database.base import DataBase
+from national_agentic_ai_hackathon_2025_backend.database.facility_index import FACILITY_TABLES
+from national_agentic_ai_hackathon_2025_backend.database.facility_snapshot import FacilitySnapshot, fetch_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output-dir", required=True)
+    parser.add_argument("--tables", nargs="+", default=list(FACILITY_TABLES))
+    parser.add_argument(
+        "--cell-degrees", type=float, default=Config.get_float("FACILITY_INDEX_CELL_DEGREES", 0.05),
+        help="Grid cell size to pre-bucket for (match FACILITY_INDEX_CELL_DEGREES)",
+    )
+    parser.add_argument("--page-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    client = DataBase().supabase
+    for table in args.tables:
+        start = time.perf_counter()
+        rows = fetch_table(client, table, args.page_size)
+        fetched_s = time.perf_counter() - start
+        snapshot = FacilitySnapshot.from_rows(rows, table, args.cell_degrees)
+        path = os.path.join(args.output_dir, f"{table}.snapshot")
+        snapshot.save(path)
+        print(
+            f"[green]{table}: {len(snapshot):,} of {len(rows):,} rows ({len(snapshot.columns)} columns) -> {path} "
+            f"({os.path.getsize(path) / 1e6:.1f} MB); fetched in {fetched_s:.1f} s, "
+            f"built in {time.perf_counter() - start - fetched_s:.1f} s[/green]"
+        )
+
+
+if __name__ == "__main__":
+    main()
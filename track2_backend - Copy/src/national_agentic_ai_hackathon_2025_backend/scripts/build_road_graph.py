@@ -0,0 +1,53 @@
+"""
+Build the offline road graph used when the Distance Matrix API is unavailable.
+
+Reads an OSM XML extract of the service cities (.osm, .osm.bz2 or .osm.gz;
+convert .pbf files first with ``osmium cat city.osm.pbf -o city.osm``),
+keeps the drivable highways, and writes a compressed .npz graph. Point
+ROAD_ROUTER_GRAPH_PATH at the output to enable the fallback.
+
+Usage:
+    uv run python -m national_agentic_ai_hackathon_2025_backend.scripts.build_road_graph karachi.osm.bz2 lahore.osm.bz2 --output data/road_graph.npz
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+from rich import print
+
+from national_agentic_ai_hackathon_2025_backend.tools.location.road_router import RoadGraph
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("extracts", nargs="+", help="OSM XML extracts")
+    parser.add_argument("--output", required=True, help="Output .npz path")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    graphs = [RoadGraph.from_osm_xml(path) for path in args.extracts]
+    if len(graphs) == 1:
+        graph = graphs[0]
+    else:
+        # Cities are far apart, so their graphs are simply laid side by side
+        node_base = np.cumsum([0] + [g.node_count for g in graphs[:-1]])
+        edge_base = np.cumsum([0] + [g.edge_count for g in graphs[:-1]])
+        graph = RoadGraph(
+            lat=np.concatenate([g.lat for g in graphs]),
+            lng=np.concatenate([g.lng for g in graphs]),
+            offsets=np.concatenate([graphs[0].offsets[:1]] + [g.offsets[1:] + base for g, base in zip(graphs, edge_base)]),
+            targets=np.concatenate([g.targets + base for g, base in zip(graphs, node_base)]).astype(np.int32),
+            seconds=np.concatenate([g.seconds for g in graphs]),
+            metres=np.concatenate([g.metres for g in graphs]),
+        )
+    graph.save(args.output)
+    print(
+        f"[green]Wrote {graph.node_count:,} nodes and {graph.edge_count:,} edges to {args.output} "
+        f"({os.path.getsize(args.output) / 1e6:.1f} MB) in {time.perf_counter() - start:.1f} s[/green]"
+    )
+
+
+if __name__ == "__main__":
+    main()
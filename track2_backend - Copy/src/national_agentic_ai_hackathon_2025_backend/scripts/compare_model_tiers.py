@@ -0,0 +1,140 @@
+"""
+Compare the strong and fast model tiers on recorded conversations.
+
+Replays user turns from stored chat histories (history as it was when each
+message arrived) through the chosen agents on both tiers and reports latency,
+tokens and how often the fast tier makes the same decision (criticality and
+route) as the strong one. Use it before moving an agent to the fast tier via
+MODEL_LOW_STAKES_AGENTS, or when tuning the load thresholds.
+
+Usage:
+    uv run python -m national_agentic_ai_hackathon_2025_backend.scripts.compare_model_tiers
+    uv run python -m national_agentic_ai_hackathon_2025_backend.scripts.compare_model_tiers --dataset histories.jsonl --agents guidance,triage --limit 100
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from agents import RunConfig, Runner
+from rich import print
+from rich.table import Table
+
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.model_policy import FAST, STRONG, ModelPolicy
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.registry import AgentRegistry
+from national_agentic_ai_hackathon_2025_backend.context.chat_history import ChatHistoryContext
+from national_agentic_ai_hackathon_2025_backend.context.global_context import GlobalContext
+from national_agentic_ai_hackathon_2025_backend.context.user import UserContext
+from national_agentic_ai_hackathon_2025_backend.scripts.history_budget_report import load_histories
+
+TIERS = (STRONG, FAST)
+
+
+def load_turns(histories, limit: int) -> List[Tuple[str, GlobalContext]]:
+    """(message, context) for the most recent user turns, up to ``limit``."""
+    turns = []
+    for history in histories:
+        for index, message in enumerate(history.messages):
+            if message.sender != "user":
+                continue
+            context = GlobalContext(
+                user=UserContext(phone_number=history.phone_number),
+                chat_history=ChatHistoryContext(phone_number=history.phone_number, messages=history.messages[:index]),
+            )
+            turns.append((message.content, context))
+    return turns[-limit:]
+
+
+def decision(output: Any) -> Dict[str, Any]:
+    return {
+        "is_critical": getattr(output, "is_critical", None),
+        "request_type": getattr(output, "request_type", None),
+    }
+
+
+async def run_tier(agent, tier: str, message: str, context: GlobalContext) -> Dict[str, Any]:
+    model = ModelPolicy.model_for(tier)
+    start = time.perf_counter()
+    try:
+        result = await Runner.run(agent, message, context=context, run_config=RunConfig(model=model) if model else None)
+        usage = result.context_wrapper.usage
+        return {
+            **decision(result.final_output),
+            "latency_s": time.perf_counter() - start,
+            "tokens": usage.total_tokens,
+            "error": None,
+        }
+    except Exception as e:
+        return {"is_critical": None, "request_type": None, "latency_s": time.perf_counter() - start, "tokens": 0, "error": str(e)}
+
+
+def _avg(values: List[float]) -> Optional[float]:
+    return sum(values) / len(values) if values else None
+
+
+def _fmt(value: Optional[float], pct: bool = False) -> str:
+    if value is None:
+        return "-"
+    return f"{value:.1%}" if pct else f"{value:.2f}"
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dataset", help="JSON lines file of chat_history rows (default: read from Supabase)")
+    parser.add_argument("--agents", default="guidance,orchestrator", help="Comma-separated registry agents to compare")
+    parser.add_argument("--limit", type=int, default=50, help="Number of most recent user turns to replay")
+    parser.add_argument("--output", help="Write per-turn results to this JSON lines file")
+    args = parser.parse_args()
+
+    registry = AgentRegistry.get()
+    agent_names = [name.strip() for name in args.agents.split(",") if name.strip()]
+    turns = load_turns(await load_histories(args.dataset), args.limit)
+    if not turns:
+        print("[red]No user messages found[/red]")
+        return
+    print(f"Strong tier: {ModelPolicy.model_for(STRONG) or 'SDK default'}, fast tier: {ModelPolicy.model_for(FAST)}")
+
+    results: List[Dict[str, Any]] = []
+    for message, context in turns:
+        for name in agent_names:
+            agent = getattr(registry, name)
+            row = {"agent": name, "message": message}
+            for tier in TIERS:
+                row[tier] = await run_tier(agent, tier, message, context)
+            row["agree"] = all(row[STRONG][key] == row[FAST][key] for key in ("is_critical", "request_type"))
+            results.append(row)
+            marker = "[green]agree[/green]" if row["agree"] else "[red]DIFF[/red]"
+            print(f"{marker} {name:<12} {message[:60]!r}")
+
+    table = Table(title=f"Model tiers over {len(turns)} recorded user turns")
+    table.add_column("Agent")
+    table.add_column("Tier")
+    table.add_column("Avg latency (s)")
+    table.add_column("Avg tokens")
+    table.add_column("Errors")
+    table.add_column("Agrees with strong")
+    for name in agent_names:
+        rows = [r for r in results if r["agent"] == name]
+        agreement = _avg([1.0 if r["agree"] else 0.0 for r in rows])
+        for tier in TIERS:
+            table.add_row(
+                name,
+                tier,
+                _fmt(_avg([r[tier]["latency_s"] for r in rows])),
+                _fmt(_avg([r[tier]["tokens"] for r in rows])),
+                str(sum(1 for r in rows if r[tier]["error"])),
+                "-" if tier == STRONG else _fmt(agreement, pct=True),
+            )
+    print(table)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            for r in results:
+                f.write(json.dumps(r) + "\n")
+        print(f"[blue]Per-turn results written to {args.output}[/blue]")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
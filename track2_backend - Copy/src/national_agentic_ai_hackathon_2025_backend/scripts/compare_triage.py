@@ -0,0 +1,182 @@
+"""
+Compare the fused TriageAgent against the two-stage Guidance -> Orchestrator chain.
+
+Each case is run through both triage paths with an empty chat history. The
+report shows agreement between the two paths, accuracy against the expected
+labels (when present), latency and token usage. A fused run whose TriageAgent
+failed (WorkFlow then quietly answers from the sequential chain) counts as a
+fused error, not as a decision, and never as agreement.
+
+Usage:
+    uv run python -m national_agentic_ai_hackathon_2025_backend.scripts.compare_triage
+    uv run python -m national_agentic_ai_hackathon_2025_backend.scripts.compare_triage --dataset cases.jsonl
+
+Dataset format (JSON lines):
+    {"message": "...", "is_critical": true, "request_type": "medical"}
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+from rich import print
+from rich.table import Table
+
+from national_agentic_ai_hackathon_2025_backend.handlers.workflow import WorkFlow
+from national_agentic_ai_hackathon_2025_backend.context.global_context import GlobalContext
+from national_agentic_ai_hackathon_2025_backend.context.chat_history import ChatHistoryContext
+from national_agentic_ai_hackathon_2025_backend.context.user import UserContext
+from national_agentic_ai_hackathon_2025_backend.utils.metrics import Metrics
+
+SAMPLE_CASES: List[Dict[str, Any]] = [
+    {"message": "Assalamoalaikum", "is_critical": False, "request_type": None},
+    {"message": "What are your office timings?", "is_critical": False, "request_type": None},
+    {"message": "How do I register on this service?", "is_critical": False, "request_type": None},
+    {"message": "Thank you so much for the help", "is_critical": False, "request_type": None},
+    {"message": "My father has severe chest pain and can't breathe", "is_critical": True, "request_type": "medical"},
+    {"message": "There was an accident on Shahrah-e-Faisal, two people are injured", "is_critical": True, "request_type": "medical"},
+    {"message": "I need an ambulance urgently, my mother fainted", "is_critical": True, "request_type": "medical"},
+    {"message": "Someone snatched my phone at gunpoint just now", "is_critical": True, "request_type": "police"},
+    {"message": "There is a robbery happening in the shop next door", "is_critical": True, "request_type": "police"},
+    {"message": "A man is harassing me and following me home", "is_critical": True, "request_type": "police"},
+    {"message": "Flood water has entered our whole street, families are trapped", "is_critical": True, "request_type": "catastrophic"},
+    {"message": "A building collapsed after the earthquake, many people are under it", "is_critical": True, "request_type": "catastrophic"},
+]
+
+TOKEN_COUNTERS = ("agent.guidance", "agent.orchestrator", "agent.triage")
+
+
+def load_cases(path: Optional[str]) -> List[Dict[str, Any]]:
+    """Load labelled cases from a JSON lines file, or use the built-in sample."""
+    if not path:
+        return SAMPLE_CASES
+    cases = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                cases.append(json.loads(line))
+    return cases
+
+
+def build_context() -> GlobalContext:
+    return GlobalContext(
+        user=UserContext(phone_number="+920000000000"),
+        chat_history=ChatHistoryContext(phone_number="+920000000000", messages=[]),
+    )
+
+
+def total_tokens() -> float:
+    return sum(Metrics.get_counter(f"{name}.total_tokens") for name in TOKEN_COUNTERS)
+
+
+def agree(result: Dict[str, Any]) -> bool:
+    chain, fused = result["sequential"], result["fused"]
+    if chain["error"] or fused["error"]:
+        return False
+    return chain["is_critical"] == fused["is_critical"] and chain["request_type"] == fused["request_type"]
+
+
+async def run_triage(mode: str, message: str) -> Dict[str, Any]:
+    """Run one triage path and return its decision, latency and tokens used."""
+    workflow = WorkFlow(triage_mode=mode)
+    context = build_context()
+    tokens_before = total_tokens()
+    fallbacks_before = Metrics.get_counter("triage.fused.fallback_sequential")
+    start = time.perf_counter()
+    try:
+        if mode == "fused":
+            guidance_output, orchestrator_output = await workflow._fused_triage(message, context)
+        else:
+            guidance_output, orchestrator_output = await workflow._sequential_triage(message, context)
+        is_critical = guidance_output.is_critical
+        request_type = getattr(orchestrator_output, "request_type", None)
+        error = None
+        if Metrics.get_counter("triage.fused.fallback_sequential") > fallbacks_before:
+            # The decision above is the sequential chain's, not TriageAgent's
+            is_critical, request_type, error = None, None, "TriageAgent failed, fell back to sequential triage"
+    except Exception as e:
+        is_critical, request_type, error = None, None, str(e)
+    return {
+        "is_critical": is_critical,
+        "request_type": request_type,
+        "latency_s": time.perf_counter() - start,
+        "tokens": total_tokens() - tokens_before,
+        "error": error,
+    }
+
+
+def summarise(results: List[Dict[str, Any]], mode: str) -> Dict[str, Any]:
+    labelled = [r for r in results if r["case"].get("is_critical") is not None]
+    critical_correct = sum(r[mode]["is_critical"] == r["case"]["is_critical"] for r in labelled)
+    routed = [r for r in labelled if r["case"]["is_critical"]]
+    route_correct = sum(r[mode]["request_type"] == r["case"].get("request_type") for r in routed)
+    return {
+        "criticality_accuracy": critical_correct / len(labelled) if labelled else None,
+        "route_accuracy": route_correct / len(routed) if routed else None,
+        "avg_latency_s": sum(r[mode]["latency_s"] for r in results) / len(results),
+        "avg_tokens": sum(r[mode]["tokens"] for r in results) / len(results),
+        "errors": sum(1 for r in results if r[mode]["error"]),
+    }
+
+
+def _fmt(value: Optional[float], pct: bool = False) -> str:
+    if value is None:
+        return "-"
+    return f"{value:.1%}" if pct else f"{value:.2f}"
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dataset", help="JSON lines file of labelled cases")
+    parser.add_argument("--output", help="Write per-case results to this JSON lines file")
+    args = parser.parse_args()
+
+    cases = load_cases(args.dataset)
+    results = []
+    for case in cases:
+        chain = await run_triage("sequential", case["message"])
+        fused = await run_triage("fused", case["message"])
+        results.append({"case": case, "sequential": chain, "fused": fused})
+        if chain["error"] or fused["error"]:
+            marker = "[red]FAIL[/red]"
+        else:
+            marker = "[green]agree[/green]" if agree(results[-1]) else "[red]DIFF[/red]"
+        decisions = " ".join(
+            f"{mode}={r['error'] if r['error'] else r['request_type'] or r['is_critical']}"
+            for mode, r in (("chain", chain), ("fused", fused))
+        )
+        print(f"{marker} {case['message'][:60]!r} {decisions}")
+
+    agreement = sum(agree(r) for r in results) / len(results)
+
+    table = Table(title=f"Triage comparison ({len(results)} cases, agreement {agreement:.1%})")
+    table.add_column("Path")
+    table.add_column("Criticality acc.")
+    table.add_column("Route acc.")
+    table.add_column("Avg latency (s)")
+    table.add_column("Avg tokens")
+    table.add_column("Errors")
+    for mode in ("sequential", "fused"):
+        summary = summarise(results, mode)
+        table.add_row(
+            mode,
+            _fmt(summary["criticality_accuracy"], pct=True),
+            _fmt(summary["route_accuracy"], pct=True),
+            _fmt(summary["avg_latency_s"]),
+            _fmt(summary["avg_tokens"]),
+            str(summary["errors"]),
+        )
+    print(table)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            for r in results:
+                f.write(json.dumps(r) + "\n")
+        print(f"[blue]Per-case results written to {args.output}[/blue]")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -31,7 +31,7 @@ async def example_healthcare_booking():
     context = GlobalContext(user=user)
     
     # Create booking agent
-    booking_agent = BookingAgent(context)
+    booking_agent = BookingAgent()
     
     # Example booking message
     booking_message = """
@@ -44,7 +44,7 @@ async def example_healthcare_booking():
     try:
         # Process booking request
         Logger.info("Processing healthcare booking request...")
-        result = await booking_agent.run(booking_message)
+        result = await booking_agent.run(booking_message, context)
         Logger.info(f"Booking result: {result}")
         
         # The booking agent will automatically use the email tool to send
@@ -69,7 +69,7 @@ async def example_police_booking():
     context = GlobalContext(user=user)
     
     # Create booking agent
-    booking_agent = BookingAgent(context)
+    booking_agent = BookingAgent()
     
     # Example police service request
     police_message = """
@@ -82,7 +82,7 @@ async def example_police_booking():
     try:
         # Process police service request
         Logger.info("Processing police service request...")
-        result = await booking_agent.run(police_message)
+        result = await booking_agent.run(police_message, context)
         Logger.info(f"Police service result: {result}")
         
         # The booking agent will automatically use the email tool to send
@@ -107,7 +107,7 @@ async def example_emergency_booking():
     context = GlobalContext(user=user)
     
     # Create booking agent
-    booking_agent = BookingAgent(context)
+    booking_agent = BookingAgent()
     
     # Example emergency booking
     emergency_message = """
@@ -120,7 +120,7 @@ async def example_emergency_booking():
     try:
         # Process emergency booking
         Logger.info("Processing emergency booking request...")
-        result = await booking_agent.run(emergency_message)
+        result = await booking_agent.run(emergency_message, context)
         Logger.info(f"Emergency booking result: {result}")
         
         # The booking agent will automatically use the email tool to send
@@ -0,0 +1,71 @@
+"""
+Estimate the prompt tokens spent on chat history per request: the fixed
+last-10-messages block vs. the token-budgeted history each agent now gets.
+
+Replays every stored conversation turn by turn (history as it was when each
+user message arrived) and sums the estimated history tokens per agent.
+Stored rolling summaries are ignored, so the budgeted figures are an upper bound.
+
+Usage:
+    uv run python -m national_agentic_ai_hackathon_2025_backend.scripts.history_budget_report
+    uv run python -m national_agentic_ai_hackathon_2025_backend.scripts.history_budget_report --dataset histories.jsonl
+"""
+
+import argparse
+import asyncio
+import json
+
+from rich import print
+from rich.table import Table
+
+from national_agentic_ai_hackathon_2025_backend.context.chat_history import ChatHistoryContext, estimate_tokens
+from national_agentic_ai_hackathon_2025_backend.schemas.chat_history import ChatHistory
+
+# Agents that see the history on the critical (sequential) path of one message
+AGENTS = ("guidance", "orchestrator", "medical", "police", "catastrophic", "triage", "degraded")
+
+
+async def load_histories(path):
+    if path:
+        with open(path, "r", encoding="utf-8") as f:
+            return [ChatHistory(**json.loads(line)) for line in f if line.strip()]
+    from national_agentic_ai_hackathon_2025_backend.database.chat_history import ChatHistoryDB
+    return await ChatHistoryDB().get_all_chat_histories()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dataset", help="JSON lines file of chat_history rows (default: read from Supabase)")
+    args = parser.parse_args()
+
+    histories = await load_histories(args.dataset)
+    turns = 0
+    baseline = 0
+    budgeted = {agent: 0 for agent in AGENTS}
+    for history in histories:
+        for index, message in enumerate(history.messages):
+            if message.sender != "user":
+                continue
+            context = ChatHistoryContext(phone_number=history.phone_number, messages=history.messages[:index])
+            turns += 1
+            baseline += estimate_tokens(context.formatted_messages or "")
+            for agent in AGENTS:
+                budgeted[agent] += estimate_tokens(context.for_agent(agent))
+
+    if not turns:
+        print("[red]No user messages found[/red]")
+        return
+
+    table = Table(title=f"History tokens per call over {turns} user turns in {len(histories)} conversations")
+    table.add_column("Agent")
+    table.add_column("Last-10 avg")
+    table.add_column("Budgeted avg")
+    table.add_column("Saved")
+    for agent in AGENTS:
+        saved = 1 - budgeted[agent] / baseline if baseline else 0.0
+        table.add_row(agent, f"{baseline / turns:.0f}", f"{budgeted[agent] / turns:.0f}", f"{saved:.1%}")
+    print(table)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
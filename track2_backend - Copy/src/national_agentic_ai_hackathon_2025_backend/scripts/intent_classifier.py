@@ -0,0 +1,138 @@
+"""
+Build, train and evaluate the local intent pre-classifier.
+
+    # 1. Export user messages from chat_history for labelling (label column left empty)
+    uv run python -m national_agentic_ai_hackathon_2025_backend.scripts.intent_classifier export --output intent_eval.jsonl
+
+    # 2. Train the n-gram model (defaults to the bundled seed set) and write it where IntentClassifier.get() looks
+    uv run python -m national_agentic_ai_hackathon_2025_backend.scripts.intent_classifier train --dataset data/intent_seed.jsonl intent_eval.jsonl
+
+    # 3. Measure how much traffic is absorbed, and how precisely, at several thresholds
+    uv run python -m national_agentic_ai_hackathon_2025_backend.scripts.intent_classifier evaluate --dataset intent_eval.jsonl
+
+Labels: greeting, thanks, medical, police, catastrophic, other.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+from collections import Counter
+
+from rich import print
+from rich.table import Table
+
+from national_agentic_ai_hackathon_2025_backend.handlers.intent_classifier import (
+    DEFAULT_MODEL_PATH,
+    IntentClassifier,
+    load_labelled_examples,
+)
+
+SEED_PATH = os.path.join(os.path.dirname(DEFAULT_MODEL_PATH), "intent_seed.jsonl")
+THRESHOLDS = (0.7, 0.8, 0.9, 0.95, 0.99)
+
+
+async def export(args):
+    from national_agentic_ai_hackathon_2025_backend.database.chat_history import ChatHistoryDB
+
+    classifier = IntentClassifier.get()
+    histories = await ChatHistoryDB().get_all_chat_histories()
+    seen = set()
+    rows = 0
+    with open(args.output, "w", encoding="utf-8") as f:
+        for history in histories:
+            for message in history.messages:
+                if message.sender != "user" or message.type != "text":
+                    continue
+                text = message.content.strip()
+                if not text or text.lower() in seen:
+                    continue
+                seen.add(text.lower())
+                decision = classifier.classify(text)
+                f.write(json.dumps({
+                    "message": text,
+                    "suggested_label": decision.label,
+                    "confidence": round(decision.confidence, 3),
+                    "label": "",
+                }) + "\n")
+                rows += 1
+    print(f"[green]Exported {rows} unique user messages from {len(histories)} chat histories to {args.output}[/green]")
+    print("Fill in the 'label' column, then run 'evaluate' or 'train' with this file.")
+
+
+def train(args):
+    examples = []
+    for path in args.dataset or [SEED_PATH]:
+        examples.extend(load_labelled_examples(path))
+    classifier = IntentClassifier.train(examples, epochs=args.epochs)
+    classifier.save(args.output)
+    print(f"[green]Trained on {len(examples)} examples ({dict(Counter(l for _, l in examples))})[/green]")
+    print(f"[blue]Model written to {args.output}[/blue]")
+
+
+def evaluate(args):
+    examples = []
+    for path in args.dataset:
+        examples.extend(load_labelled_examples(path))
+    if not examples:
+        print("[red]No labelled examples found[/red]")
+        return
+
+    base = IntentClassifier.load(args.model) if args.model and os.path.exists(args.model) else IntentClassifier()
+    table = Table(title=f"Intent pre-classifier on {len(examples)} labelled messages")
+    table.add_column("Threshold")
+    table.add_column("Absorbed")
+    table.add_column("Precision")
+    table.add_column("Chat / Route absorbed")
+    table.add_column("Missed emergencies")
+
+    for threshold in THRESHOLDS:
+        base.threshold = threshold
+        absorbed = correct = chat = route = unsafe = 0
+        for text, label in examples:
+            decision = base.classify(text)
+            if not decision.is_confident:
+                continue
+            absorbed += 1
+            correct += decision.label == label
+            chat += decision.is_chat
+            route += decision.is_route
+            # An emergency answered with a canned chat reply is the costly failure
+            unsafe += decision.is_chat and label in {"medical", "police", "catastrophic"}
+        table.add_row(
+            f"{threshold:.2f}",
+            f"{absorbed / len(examples):.1%}",
+            f"{correct / absorbed:.1%}" if absorbed else "-",
+            f"{chat} / {route}",
+            str(unsafe),
+        )
+    print(table)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_export = sub.add_parser("export", help="Export chat_history user messages for labelling")
+    p_export.add_argument("--output", default="intent_eval.jsonl")
+
+    p_train = sub.add_parser("train", help="Train the n-gram model")
+    p_train.add_argument("--dataset", nargs="+", help=f"Labelled JSON lines files (default: {SEED_PATH})")
+    p_train.add_argument("--output", default=DEFAULT_MODEL_PATH)
+    p_train.add_argument("--epochs", type=int, default=30)
+
+    p_eval = sub.add_parser("evaluate", help="Report absorbed traffic and precision per threshold")
+    p_eval.add_argument("--dataset", nargs="+", required=True)
+    p_eval.add_argument("--model", default=DEFAULT_MODEL_PATH, help="Trained model (rules only if missing)")
+
+    args = parser.parse_args()
+    if args.command == "export":
+        asyncio.run(export(args))
+    elif args.command == "train":
+        train(args)
+    else:
+        evaluate(args)
+
+
+if __name__ == "__main__":
+    main()
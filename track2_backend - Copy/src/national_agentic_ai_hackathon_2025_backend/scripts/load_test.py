@@ -0,0 +1,383 @@
+"""
+Offline end-to-end load test of one app instance.
+
+Starts the upstream stand-ins (scripts/stand_ins.py), launches the app under
+uvicorn pointed at them with replayed model responses
+(MODEL_PROVIDER_MODE=replay) and the WhatsApp webhook enabled, then drives it
+with a pool of virtual users for --duration seconds:
+
+- ``chat``: ``POST /chat`` with a ChatPayload (user, coordinates, device status)
+- ``stream``: ``POST /chat/stream``, timing the first event and the full stream
+- ``webhook``: a text message update signed with the app secret on
+  ``POST /webhook``, timing the acknowledgement and the reply reaching the
+  WhatsApp stand-in
+
+Reports throughput, p50/p95/p99 latency and error rate per scenario, the
+app's own per-stage timings (``/internal/metrics``) and upstream traffic.
+
+Usage:
+    uv run python -m national_agentic_ai_hackathon_2025_backend.scripts.load_test
+    uv run python -m national_agentic_ai_hackathon_2025_backend.scripts.load_test --users 200 --concurrency 100 --duration 60 --mix chat=5,stream=2,webhook=3 --model-latency-ms 800 --latency supabase=30
+"""
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+import httpx
+from rich import print
+from rich.table import Table
+
+import national_agentic_ai_hackathon_2025_backend
+from national_agentic_ai_hackathon_2025_backend.agents_workflow.model_fixtures import DEFAULT_FIXTURES_PATH, recorded_messages
+from national_agentic_ai_hackathon_2025_backend.scripts.stand_ins import CITIES, UpstreamStandIns, free_port, parse_latency
+
+PHONE_ID = "100000000000001"
+APP_SECRET = "load-test-secret"
+
+MESSAGES = [
+    "What should I keep in a first aid kit?",
+    "How do I treat a small burn at home?",
+    "Which documents do I need for a hospital appointment?",
+    "My father collapsed and is not breathing properly",
+    "Someone broke into my shop and is threatening people",
+    "Water is entering our house, the whole street is flooding",
+    "There is a fire in my building and smoke everywhere",
+    "Is the nearest hospital open at night?",
+]
+
+GOOD_DEVICE = {"connection": {"downlink": 10.0, "effectiveType": "4g", "rtt": 50}, "battery": {"level": 80, "charging": True}}
+CONSTRAINED_DEVICE = {"connection": {"downlink": 0.4, "effectiveType": "3g", "rtt": 400}, "battery": {"level": 15, "charging": False}}
+
+
+class VirtualUser:
+    def __init__(self, index: int, rng: random.Random, constrained_share: float) -> None:
+        self.phone_number = f"92300{index:07d}"
+        self.bsuid = f"PK.{self.phone_number}"  # business-scoped user id
+        self.userid = f"load-user-{index}"
+        _, lat, lng = CITIES[index % len(CITIES)]
+        self.latitude = lat + rng.uniform(-0.1, 0.1)
+        self.longitude = lng + rng.uniform(-0.1, 0.1)
+        self.status = CONSTRAINED_DEVICE if rng.random() < constrained_share else GOOD_DEVICE
+        self.lock = asyncio.Lock()  # one conversation turn at a time, like a person
+
+    def chat_payload(self, message: str) -> Dict[str, Any]:
+        return {
+            "user": {"userid": self.userid, "username": f"Load {self.userid}", "phone_number": self.phone_number, "platform": "website"},
+            "message": message,
+            "status": self.status,
+            "coordinates": {"latitude": self.latitude, "longitude": self.longitude},
+        }
+
+    def webhook_update(self, message: str) -> bytes:
+        update = {
+            "object": "whatsapp_business_account",
+            "entry": [{
+                "id": "200000000000001",
+                "changes": [{
+                    "field": "messages",
+                    "value": {
+                        "messaging_product": "whatsapp",
+                        "metadata": {"display_phone_number": "15550000000", "phone_number_id": PHONE_ID},
+                        "contacts": [{"profile": {"name": f"Load {self.userid}"}, "wa_id": self.phone_number, "user_id": self.bsuid}],
+                        "messages": [{
+                            "from": self.phone_number,
+                            "from_user_id": self.bsuid,
+                            "id": f"wamid.{uuid.uuid4().hex}",
+                            "timestamp": str(int(time.time())),
+                            "type": "text",
+                            "text": {"body": message},
+                        }],
+                    },
+                }],
+            }],
+        }
+        return json.dumps(update).encode("utf-8")
+
+
+def sign(body: bytes) -> str:
+    return "sha256=" + hmac.new(APP_SECRET.encode(), body, hashlib.sha256).hexdigest()
+
+
+class Results:
+    def __init__(self) -> None:
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.requests: Dict[str, int] = defaultdict(int)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.error_samples: Dict[str, str] = {}
+
+    def ok(self, stage: str, seconds: float) -> None:
+        self.requests[stage] += 1
+        self.latencies[stage].append(seconds)
+
+    def error(self, stage: str, detail: str) -> None:
+        self.requests[stage] += 1
+        self.errors[stage] += 1
+        self.error_samples.setdefault(stage, detail[:200])
+
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+async def run_chat(client: httpx.AsyncClient, user: VirtualUser, message: str, results: Results) -> None:
+    start = time.perf_counter()
+    response = await client.post("/chat", json=user.chat_payload(message))
+    body = response.json() if response.headers.get("content-type", "").startswith("application/json") else None
+    if response.status_code != 200 or (isinstance(body, dict) and ("error" in body or "validation_error" in body)):
+        results.error("chat", f"HTTP {response.status_code}: {response.text}")
+    else:
+        results.ok("chat", time.perf_counter() - start)
+
+
+async def run_stream(client: httpx.AsyncClient, user: VirtualUser, message: str, results: Results) -> None:
+    start = time.perf_counter()
+    first_event = None
+    last = None
+    async with client.stream("POST", "/chat/stream", json=user.chat_payload(message)) as response:
+        if response.status_code != 200:
+            results.error("stream", f"HTTP {response.status_code}: {(await response.aread()).decode(errors='replace')}")
+            return
+        async for line in response.aiter_lines():
+            if not line.strip():
+                continue
+            if first_event is None:
+                first_event = time.perf_counter() - start
+            last = json.loads(line)
+    if last is None or last.get("event") != "done":
+        results.error("stream", f"stream ended without a done event: {last}")
+        return
+    results.ok("stream.first_event", first_event)
+    results.ok("stream", time.perf_counter() - start)
+
+
+async def run_webhook(
+    client: httpx.AsyncClient, user: VirtualUser, message: str, results: Results, stand_ins: UpstreamStandIns, reply_timeout: float
+) -> None:
+    body = user.webhook_update(message)
+    start = time.perf_counter()
+    response = await client.post("/webhook", content=body, headers={"Content-Type": "application/json", "X-Hub-Signature-256": sign(body)})
+    if response.status_code != 200:
+        results.error("webhook", f"HTTP {response.status_code}: {response.text}")
+        return
+    results.ok("webhook", time.perf_counter() - start)
+    replied_at = await stand_ins.wait_for_reply((user.phone_number, user.bsuid), start, reply_timeout)
+    if replied_at is None:
+        results.error("webhook.reply", f"no WhatsApp reply to {user.phone_number} within {reply_timeout}s")
+    else:
+        results.ok("webhook.reply", replied_at - start)
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight or 1)
+    unknown = set(mix) - {"chat", "stream", "webhook"}
+    if unknown:
+        raise SystemExit(f"Unknown scenarios in --mix: {', '.join(sorted(unknown))}")
+    return mix
+
+
+async def start_app(port: int, env: Dict[str, str], log_path: str, workers: int) -> asyncio.subprocess.Process:
+    package_parent = os.path.dirname(os.path.dirname(national_agentic_ai_hackathon_2025_backend.__file__))
+    log = open(log_path, "w", encoding="utf-8")
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "uvicorn", "national_agentic_ai_hackathon_2025_backend.main:app",
+        "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning", "--workers", str(workers),
+        cwd=package_parent, env={**os.environ, **env}, stdout=log, stderr=log,
+    )
+    log.close()
+    return process
+
+
+async def wait_until_healthy(url: str, process: Optional[asyncio.subprocess.Process], timeout: float = 90.0) -> None:
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient(base_url=url) as client:
+        while time.perf_counter() < deadline:
+            if process is not None and process.returncode is not None:
+                raise RuntimeError(f"App exited with code {process.returncode}")
+            try:
+                if (await client.get("/")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.25)
+    raise RuntimeError(f"App at {url} did not become healthy within {timeout:.0f}s")
+
+
+def _ms(seconds: Optional[float]) -> str:
+    return "-" if seconds is None else f"{seconds * 1000:,.0f}"
+
+
+def report(results: Results, elapsed: float, server_metrics: Optional[Dict[str, Any]], stand_ins: UpstreamStandIns, stages: int) -> None:
+    table = Table(title=f"Client side over {elapsed:.1f}s")
+    for column in ("Stage", "Requests", "Throughput (req/s)", "p50 (ms)", "p95 (ms)", "p99 (ms)", "Errors", "Error rate"):
+        table.add_column(column)
+    for stage in sorted(results.requests):
+        latencies = results.latencies[stage]
+        requests = results.requests[stage]
+        table.add_row(
+            stage,
+            str(requests),
+            f"{len(latencies) / elapsed:,.1f}",
+            _ms(percentile(latencies, 0.50)),
+            _ms(percentile(latencies, 0.95)),
+            _ms(percentile(latencies, 0.99)),
+            str(results.errors[stage]),
+            f"{results.errors[stage] / requests:.1%}" if requests else "-",
+        )
+    print(table)
+    for stage, sample in results.error_samples.items():
+        print(f"[red]{stage} error sample:[/red] {sample}")
+
+    if server_metrics:
+        timings = sorted(server_metrics.get("timings", {}).items(), key=lambda item: item[1]["count"], reverse=True)
+        table = Table(title="Server stages (/internal/metrics, sampled percentiles)")
+        for column in ("Stage", "Count", "Avg (ms)", "p50 (ms)", "p95 (ms)", "p99 (ms)", "Max (ms)"):
+            table.add_column(column)
+        for name, timing in timings[:stages]:
+            table.add_row(
+                name, str(timing["count"]), f"{timing['avg_ms']:,.0f}", f"{timing['p50_ms']:,.0f}",
+                f"{timing['p95_ms']:,.0f}", f"{timing['p99_ms']:,.0f}", f"{timing['max_ms']:,.0f}",
+            )
+        print(table)
+        replay_fallbacks = server_metrics.get("counters", {}).get("replay.fallback", 0)
+        if replay_fallbacks:
+            print(f"[yellow]{replay_fallbacks:,.0f} model calls replayed another message's recording (replay.fallback)[/yellow]")
+
+    table = Table(title="Upstream stand-ins")
+    table.add_column("Service")
+    table.add_column("Requests")
+    for service, count in sorted(stand_ins.requests.items()):
+        table.add_row(service, str(count))
+    table.add_row("whatsapp replies", str(sum(len(sent) for sent in stand_ins.replies.values())))
+    table.add_row("emails", str(stand_ins.emails))
+    print(table)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50, help="Distinct virtual users (phone numbers)")
+    parser.add_argument("--concurrency", type=int, default=25, help="Requests in flight at once")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load")
+    parser.add_argument("--mix", default="chat=5,stream=2,webhook=3", help="Scenario weights")
+    parser.add_argument("--constrained-share", type=float, default=0.2, help="Share of users on a constrained device")
+    parser.add_argument("--model-latency-ms", type=float, help="Fixed latency per replayed model call (default: recorded)")
+    parser.add_argument("--model-jitter-ms", type=float, default=0.0)
+    parser.add_argument("--latency", action="append", default=[], metavar="SERVICE=MS", help="Stand-in latency, e.g. supabase=30")
+    parser.add_argument("--fixtures", default=os.environ.get("MODEL_FIXTURES_PATH") or DEFAULT_FIXTURES_PATH)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the app")
+    parser.add_argument("--reply-timeout", type=float, default=30.0, help="Seconds to wait for a WhatsApp reply")
+    parser.add_argument("--request-timeout", type=float, default=60.0)
+    parser.add_argument("--stages", type=int, default=25, help="Server stages to show")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--app-log", default=os.path.join(tempfile.gettempdir(), "load_test_app.log"))
+    parser.add_argument("--output", help="Write raw results and server metrics to this JSON file")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    mix = parse_mix(args.mix)
+    messages = MESSAGES + [m for m in recorded_messages(args.fixtures) if m not in MESSAGES]
+    users = [VirtualUser(index, rng, args.constrained_share) for index in range(args.users)]
+
+    stand_ins = UpstreamStandIns(latency_ms=parse_latency(args.latency))
+    await stand_ins.start()
+    port = free_port()
+    app_url = f"http://127.0.0.1:{port}"
+    env = {
+        **stand_ins.env(),
+        "MODEL_PROVIDER_MODE": "replay",
+        "MODEL_FIXTURES_PATH": args.fixtures,
+        "MODEL_REPLAY_JITTER_MS": str(args.model_jitter_ms),
+        "MODEL_REPLAY_SEED": str(args.seed),
+        # MESSAGES has no fixtures of its own; their replies come from other recordings (counted as replay.fallback)
+        "MODEL_REPLAY_STRICT": "false",
+        "OPENAI_API_KEY": "stand-in",
+        "WHATSAPP_WEBHOOK_ENABLED": "true",
+        "WHATSAPP_PHONE_NO_ID": PHONE_ID,
+        "WHATSAPP_ACCESS_TOKEN": "stand-in",
+        "WHATSAPP_APP_SECRET": APP_SECRET,
+        "WHATSAPP_APP_ID": "",
+        "SERVER_BASE_URL": "",
+        "INTERNAL_API_TOKEN": "",
+    }
+    if args.model_latency_ms is not None:
+        env["MODEL_REPLAY_LATENCY_MS"] = str(args.model_latency_ms)
+
+    process = await start_app(port, env, args.app_log, args.workers)
+    results = Results()
+    server_metrics = None
+    try:
+        await wait_until_healthy(app_url, process)
+        print(f"[green]App up at {app_url} (log: {args.app_log}); {args.concurrency} in flight for {args.duration:.0f}s[/green]")
+
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=app_url, timeout=args.request_timeout, limits=limits) as client:
+            scenarios = list(mix)
+            weights = [mix[name] for name in scenarios]
+            stop_at = time.perf_counter() + args.duration
+
+            async def worker(worker_rng: random.Random) -> None:
+                while time.perf_counter() < stop_at:
+                    user = worker_rng.choice(users)
+                    scenario = worker_rng.choices(scenarios, weights)[0]
+                    message = worker_rng.choice(messages)
+                    async with user.lock:
+                        try:
+                            if scenario == "chat":
+                                await run_chat(client, user, message, results)
+                            elif scenario == "stream":
+                                await run_stream(client, user, message, results)
+                            else:
+                                await run_webhook(client, user, message, results, stand_ins, args.reply_timeout)
+                        except (httpx.HTTPError, ValueError) as e:
+                            results.error(scenario, f"{type(e).__name__}: {e}")
+
+            start = time.perf_counter()
+            await asyncio.gather(*(worker(random.Random(rng.random())) for _ in range(args.concurrency)))
+            elapsed = time.perf_counter() - start
+
+            try:
+                server_metrics = (await client.get("/internal/metrics")).json()
+            except httpx.HTTPError as e:
+                print(f"[yellow]Could not read /internal/metrics: {e}[/yellow]")
+    finally:
+        if process.returncode is None:
+            process.terminate()
+            await process.wait()
+        await stand_ins.stop()
+
+    if args.workers > 1:
+        print("[yellow]Server stages come from whichever worker answered /internal/metrics[/yellow]")
+    report(results, elapsed, server_metrics, stand_ins, args.stages)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "args": vars(args),
+                "elapsed_s": elapsed,
+                "latencies_s": results.latencies,
+                "requests": results.requests,
+                "errors": results.errors,
+                "server_metrics": server_metrics,
+                "upstream_requests": stand_ins.requests,
+            }, f, indent=2)
+        print(f"[blue]Results written to {args.output}[/blue]")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
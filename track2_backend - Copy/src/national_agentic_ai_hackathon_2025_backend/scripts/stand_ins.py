@@ -0,0 +1,474 @@
+"""
+Local stand-ins for the backend's upstreams, for offline load tests.
+
+One HTTP server answers for Supabase PostgREST (``/rest/v1``, in-memory
+tables), Google Maps (``/maps/api``, geocode and distance matrix computed
+from the coordinates) and the WhatsApp Cloud API (``/v<version>/...``, every
+send succeeds). A minimal SMTP server accepts and drops mail. Each stand-in
+can add a fixed latency per request to mimic the real service.
+
+OpenAI is not stood in here: run the app with MODEL_PROVIDER_MODE=replay
+(see agents_workflow/model_fixtures.py).
+
+Run on their own and point a manually started app at them with the printed
+environment, or let scripts/load_test.py start them.
+
+Usage:
+    uv run python -m national_agentic_ai_hackathon_2025_backend.scripts.stand_ins --http-port 9100 --smtp-port 9125
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import socket
+import time
+import uuid
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+import uvicorn
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+from rich import print
+
+# Facilities seeded around these cities: (name, latitude, longitude)
+CITIES = [
+    ("Karachi", 24.8607, 67.0011),
+    ("Lahore", 31.5497, 74.3436),
+    ("Islamabad", 33.6844, 73.0479),
+    ("Peshawar", 34.0151, 71.5249),
+    ("Quetta", 30.1798, 66.9750),
+]
+
+# PostgREST query parameters that are not column filters
+RESERVED_PARAMS = {"select", "limit", "offset", "order", "or", "on_conflict", "columns"}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 6371.0 * 2 * math.asin(math.sqrt(a))
+
+
+def seed_tables(facilities_per_city: int = 40, seed: int = 0) -> Dict[str, List[Dict[str, Any]]]:
+    """Synthetic health and police facilities scattered within ~15 km of each city."""
+    rng = random.Random(seed)
+    tables: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    osm_id = 1
+    for city, lat, lng in CITIES:
+        for table, amenity in (("health_facility", "hospital"), ("police_facility", "police")):
+            for index in range(facilities_per_city):
+                tables[table].append({
+                    "osm_id": osm_id,
+                    "name": f"{city} {amenity.title()} {index + 1}",
+                    "amenity": amenity,
+                    "addr_full": f"Block {index + 1}, {city}",
+                    "contact_number": f"+92300{osm_id:07d}",
+                    "X": round(lng + rng.uniform(-0.15, 0.15), 6),
+                    "Y": round(lat + rng.uniform(-0.15, 0.15), 6),
+                    "available_beds": rng.randint(0, 50) if amenity == "hospital" else None,
+                })
+                osm_id += 1
+    return tables
+
+
+def _coerce(raw: str, current: Any) -> Any:
+    """Parse a filter value the way PostgREST would compare it against ``current``."""
+    if raw == "null":
+        return None
+    if isinstance(current, bool):
+        return raw.lower() == "true"
+    if isinstance(current, (int, float)):
+        try:
+            return float(raw)
+        except ValueError:
+            return raw
+    return raw
+
+
+def _like(pattern: str, value: Any, case_sensitive: bool) -> bool:
+    """PostgreSQL LIKE: ``%`` (or PostgREST's ``*``) and ``_`` are wildcards, ``\\`` escapes the next character."""
+    if value is None:
+        return False
+    regex = []
+    escaped = False
+    for char in pattern:
+        if escaped:
+            regex.append(re.escape(char))
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char in "%*":
+            regex.append(".*")
+        elif char == "_":
+            regex.append(".")
+        else:
+            regex.append(re.escape(char))
+    flags = re.DOTALL if case_sensitive else re.DOTALL | re.IGNORECASE
+    return re.fullmatch("".join(regex), str(value), flags) is not None
+
+
+def _matches(row: Dict[str, Any], column: str, expression: str) -> bool:
+    """Evaluate one PostgREST filter such as ``eq.5``, ``not.is.null`` or ``in.(a,b)``."""
+    negate = expression.startswith("not.")
+    if negate:
+        expression = expression[4:]
+    operator, _, raw = expression.partition(".")
+    current = row.get(column)
+    if operator == "is":
+        result = current is None if raw == "null" else current is (raw == "true")
+    elif operator == "in":
+        values = [v.strip().strip('"') for v in raw.strip("()").split(",")]
+        result = any(current == _coerce(v, current) for v in values)
+    elif operator in ("like", "ilike"):
+        result = _like(raw, current, case_sensitive=operator == "like")
+    else:
+        value = _coerce(raw, current)
+        try:
+            result = {
+                "eq": lambda: current == value,
+                "neq": lambda: current != value,
+                "gt": lambda: current is not None and current > value,
+                "gte": lambda: current is not None and current >= value,
+                "lt": lambda: current is not None and current < value,
+                "lte": lambda: current is not None and current <= value,
+            }[operator]()
+        except (KeyError, TypeError):
+            result = False
+    return not result if negate else result
+
+
+def _matches_or(row: Dict[str, Any], expression: str) -> bool:
+    """``or=(name.ilike.*x*,city.eq.y)``; nested groups are not supported."""
+    for condition in expression.strip("()").split(","):
+        column, _, rest = condition.partition(".")
+        if _matches(row, column, rest):
+            return True
+    return False
+
+
+class UpstreamStandIns:
+    """The stand-in servers, their in-memory state and per-service request counts."""
+
+    def __init__(
+        self,
+        http_port: Optional[int] = None,
+        smtp_port: Optional[int] = None,
+        latency_ms: Optional[Dict[str, float]] = None,
+        facilities_per_city: int = 40,
+    ) -> None:
+        self.http_port = http_port or free_port()
+        self.smtp_port = smtp_port or free_port()
+        self.latency_ms = latency_ms or {}
+        self.tables = seed_tables(facilities_per_city)
+        self.requests: Dict[str, int] = defaultdict(int)
+        # Send times of WhatsApp messages per recipient
+        self.replies: Dict[str, List[float]] = defaultdict(list)
+        self.emails = 0
+        self._next_id = 1
+        self._http: Optional[uvicorn.Server] = None
+        self._smtp: Optional[asyncio.AbstractServer] = None
+        self.app = self._build_app()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.http_port}"
+
+    def env(self) -> Dict[str, str]:
+        """Environment that points the app at these stand-ins."""
+        return {
+            "SUPABASE_URL": self.base_url,
+            "SUPABASE_SERVICE_ROLE_KEY": "stand-in",
+            "GOOGLE_MAPS_BASE_URL": self.base_url,
+            "GOOGLE_API_KEY": "stand-in",
+            "WHATSAPP_API_BASE_URL": self.base_url,
+            "SMTP_HOST": "127.0.0.1",
+            "SMTP_PORT": str(self.smtp_port),
+            "SMTP_STARTTLS": "false",
+            "SENDER_EMAIL": "alerts@stand-in.local",
+            "APP_PASSWORD": "stand-in",
+        }
+
+    async def _delay(self, service: str) -> None:
+        self.requests[service] += 1
+        delay = self.latency_ms.get(service, 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+    def _build_app(self) -> FastAPI:
+        app = FastAPI(docs_url=None, redoc_url=None, openapi_url=None)
+
+        @app.post("/rest/v1/rpc/{function}")
+        async def rpc(function: str):
+            # No SQL here: callers fall back to plain table queries, as without PostGIS
+            await self._delay("supabase")
+            return JSONResponse({"message": f"function {function} is not available"}, status_code=404)
+
+        @app.api_route("/rest/v1/{table}", methods=["GET", "POST", "PATCH", "DELETE"])
+        async def table(table: str, request: Request):
+            await self._delay("supabase")
+            return await self._postgrest(table, request)
+
+        @app.get("/maps/api/geocode/json")
+        async def geocode(latlng: str):
+            await self._delay("google_maps")
+            return self._geocode(latlng)
+
+        @app.get("/maps/api/distancematrix/json")
+        async def distance_matrix(origins: str, destinations: str):
+            await self._delay("google_maps")
+            return self._distance_matrix(origins, destinations)
+
+        @app.post("/{version}/{phone_id}/messages")
+        async def send_message(version: str, phone_id: str, request: Request):
+            await self._delay("whatsapp")
+            body = await self._body(request)
+            to = body.get("to") or body.get("recipient")
+            if body.get("status") == "read":
+                return {"success": True}
+            self.replies[str(to)].append(time.perf_counter())
+            return {
+                "messaging_product": "whatsapp",
+                "contacts": [{"input": to, "wa_id": to}],
+                "messages": [{"id": f"wamid.{uuid.uuid4().hex}"}],
+            }
+
+        @app.api_route("/{version}/{path:path}", methods=["GET", "POST", "DELETE"])
+        async def graph_api(version: str, path: str):
+            await self._delay("whatsapp")
+            return {"success": True, "id": uuid.uuid4().hex}
+
+        return app
+
+    @staticmethod
+    async def _body(request: Request) -> Dict[str, Any]:
+        raw = await request.body()
+        if not raw:
+            return {}
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return dict(await request.form())
+
+    async def _postgrest(self, table: str, request: Request) -> Response:
+        rows = self.tables[table]
+        params = request.query_params
+        filters = [(key, value) for key, value in params.multi_items() if key not in RESERVED_PARAMS]
+        or_filter = params.get("or")
+
+        def selected(row: Dict[str, Any]) -> bool:
+            if or_filter and not _matches_or(row, or_filter):
+                return False
+            return all(_matches(row, column, expression) for column, expression in filters)
+
+        if request.method == "POST":
+            body = await self._body(request)
+            inserted = []
+            for row in body if isinstance(body, list) else [body]:
+                row = dict(row)
+                row.setdefault("id", self._next_id)
+                row.setdefault("created_at", time.strftime("%Y-%m-%dT%H:%M:%S"))
+                self._next_id += 1
+                rows.append(row)
+                inserted.append(row)
+            return self._rows(request, inserted, status_code=201)
+
+        if request.method == "PATCH":
+            updates = await self._body(request)
+            changed = [row for row in rows if selected(row)]
+            for row in changed:
+                row.update(updates)
+            return self._rows(request, changed)
+
+        if request.method == "DELETE":
+            removed = [row for row in rows if selected(row)]
+            self.tables[table] = [row for row in rows if not selected(row)]
+            return self._rows(request, removed)
+
+        result = [row for row in rows if selected(row)]
+        order = params.get("order")
+        if order:
+            for clause in reversed(order.split(",")):
+                column, _, direction = clause.partition(".")
+                result.sort(key=lambda row: (row.get(column) is None, row.get(column)), reverse=direction.startswith("desc"))
+        offset = int(params.get("offset", 0))
+        limit = params.get("limit")
+        result = result[offset:offset + int(limit) if limit else None]
+        return self._rows(request, result)
+
+    @staticmethod
+    def _rows(request: Request, rows: List[Dict[str, Any]], status_code: int = 200) -> Response:
+        if "return=minimal" in request.headers.get("prefer", ""):
+            return Response(status_code=status_code)
+        if "vnd.pgrst.object" in request.headers.get("accept", ""):
+            if len(rows) != 1:
+                return JSONResponse({"message": f"expected one row, found {len(rows)}", "code": "PGRST116"}, status_code=406)
+            return JSONResponse(rows[0], status_code=status_code)
+        return JSONResponse(rows, status_code=status_code)
+
+    def _nearest_city(self, lat: float, lng: float) -> str:
+        return min(CITIES, key=lambda city: haversine_km(lat, lng, city[1], city[2]))[0]
+
+    def _geocode(self, latlng: str) -> Dict[str, Any]:
+        try:
+            lat, lng = (float(part) for part in latlng.split(","))
+        except ValueError:
+            return {"status": "INVALID_REQUEST", "results": []}
+        city = self._nearest_city(lat, lng)
+        return {
+            "status": "OK",
+            "results": [{
+                "formatted_address": f"Main Road, {city}, Pakistan",
+                "place_id": f"stand-in-{lat:.4f}-{lng:.4f}",
+                "geometry": {"location": {"lat": lat, "lng": lng}},
+                "address_components": [
+                    {"long_name": "Main Road", "short_name": "Main Rd", "types": ["route"]},
+                    {"long_name": city, "short_name": city, "types": ["locality", "political"]},
+                    {"long_name": "Pakistan", "short_name": "PK", "types": ["country", "political"]},
+                ],
+            }],
+        }
+
+    def _distance_matrix(self, origins: str, destinations: str) -> Dict[str, Any]:
+        def point(text: str) -> Optional[Tuple[float, float]]:
+            try:
+                lat, lng = (float(part) for part in text.split(","))
+                return lat, lng
+            except ValueError:
+                return None
+
+        origin_points = [point(o) for o in origins.split("|")]
+        destination_points = [point(d) for d in destinations.split("|")]
+        rows = []
+        for origin in origin_points:
+            elements = []
+            for destination in destination_points:
+                if origin is None or destination is None:
+                    elements.append({"status": "NOT_FOUND"})
+                    continue
+                # Road distance ~1.3x the straight line, driven at ~30 km/h
+                metres = int(haversine_km(*origin, *destination) * 1300)
+                seconds = int(metres / 8.3)
+                elements.append({
+                    "status": "OK",
+                    "distance": {"text": f"{metres / 1000:.1f} km", "value": metres},
+                    "duration": {"text": f"{max(seconds // 60, 1)} mins", "value": seconds},
+                })
+            rows.append({"elements": elements})
+        return {
+            "status": "OK",
+            "origin_addresses": origins.split("|"),
+            "destination_addresses": destinations.split("|"),
+            "rows": rows,
+        }
+
+    async def wait_for_reply(self, recipients: Tuple[str, ...], since: float, timeout: float) -> Optional[float]:
+        """
+        perf_counter time of the first WhatsApp message sent to any of
+        ``recipients`` (phone number, business-scoped user id) after ``since``,
+        or None on timeout.
+        """
+        deadline = since + timeout
+        while True:
+            sent = [sent_at for to in recipients for sent_at in self.replies.get(to, ()) if sent_at >= since]
+            if sent:
+                return min(sent)
+            if time.perf_counter() >= deadline:
+                return None
+            await asyncio.sleep(0.02)
+
+    async def _handle_smtp(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Just enough SMTP for smtplib: EHLO, AUTH PLAIN, MAIL, RCPT, DATA, QUIT."""
+
+        async def reply(line: str) -> None:
+            writer.write((line + "\r\n").encode())
+            await writer.drain()
+
+        await self._delay("smtp")
+        await reply("220 stand-in ESMTP")
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.decode(errors="replace").strip()
+                verb = command.split(" ", 1)[0].upper()
+                if verb == "EHLO":
+                    await reply("250-stand-in")
+                    await reply("250 AUTH PLAIN")
+                elif verb == "AUTH":
+                    await reply("235 2.7.0 Authentication successful")
+                elif verb == "DATA":
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    while (await reader.readline()).rstrip(b"\r\n") != b".":
+                        pass
+                    self.emails += 1
+                    await reply("250 OK queued")
+                elif verb == "QUIT":
+                    await reply("221 Bye")
+                    break
+                else:
+                    await reply("250 OK")
+        finally:
+            writer.close()
+
+    async def start(self) -> None:
+        config = uvicorn.Config(self.app, host="127.0.0.1", port=self.http_port, log_level="warning", lifespan="off")
+        self._http = uvicorn.Server(config)
+        self._http_task = asyncio.create_task(self._http.serve())
+        while not self._http.started:
+            if self._http_task.done():
+                self._http_task.result()
+            await asyncio.sleep(0.05)
+        self._smtp = await asyncio.start_server(self._handle_smtp, "127.0.0.1", self.smtp_port)
+
+    async def stop(self) -> None:
+        if self._smtp is not None:
+            self._smtp.close()
+            await self._smtp.wait_closed()
+        if self._http is not None:
+            self._http.should_exit = True
+            await self._http_task
+
+
+def parse_latency(values: List[str]) -> Dict[str, float]:
+    """``["supabase=40", "google_maps=120"]`` -> {"supabase": 40.0, ...}"""
+    latency = {}
+    for value in values:
+        service, _, ms = value.partition("=")
+        latency[service.strip()] = float(ms)
+    return latency
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--http-port", type=int, default=9100)
+    parser.add_argument("--smtp-port", type=int, default=9125)
+    parser.add_argument(
+        "--latency", action="append", default=[], metavar="SERVICE=MS",
+        help="Added latency per request, e.g. --latency supabase=40 (supabase, google_maps, whatsapp, smtp)",
+    )
+    args = parser.parse_args()
+
+    stand_ins = UpstreamStandIns(args.http_port, args.smtp_port, parse_latency(args.latency))
+    await stand_ins.start()
+    print("[green]Stand-ins running. Start the app with:[/green]")
+    for key, value in stand_ins.env().items():
+        print(f"{key}={value}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await stand_ins.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
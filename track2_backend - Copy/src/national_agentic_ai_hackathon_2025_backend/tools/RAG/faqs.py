@@ -1,8 +1,7 @@
-from national_agentic_ai_hackathon_2025_backend.context.global_context import GlobalContext
 from national_agentic_ai_hackathon_2025_backend.config import Config
-from agents import FileSearchTool, RunContextWrapper
+from agents import FileSearchTool
 
-def get_faqs(wrapper: RunContextWrapper[GlobalContext]):
+def get_faqs():
     vector_store_id = Config.get("FAQS_VECTOR_STORE_ID")
     return FileSearchTool(
         vector_store_ids=[vector_store_id],
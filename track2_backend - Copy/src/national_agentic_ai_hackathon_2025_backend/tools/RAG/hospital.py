@@ -1,8 +1,7 @@
-from national_agentic_ai_hackathon_2025_backend.context.global_context import GlobalContext
 from national_agentic_ai_hackathon_2025_backend.config import Config
-from agents import FileSearchTool, RunContextWrapper
+from agents import FileSearchTool
 
-def health_facility_tool(wrapper: RunContextWrapper[GlobalContext]):
+def health_facility_tool():
     vector_store_id = Config.get("HOSPITAL_VECTOR_STORE_ID")
     return FileSearchTool(
         vector_store_ids=[vector_store_id],
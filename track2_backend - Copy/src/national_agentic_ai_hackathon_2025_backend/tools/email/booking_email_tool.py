@@ -3,21 +3,22 @@ Booking Email Tool for the Booking Agent
 Provides email functionality for sending notifications to facilities
 """
 
+import json
 from typing import Dict, Any, Optional
+from agents import FunctionTool, RunContextWrapper
 from national_agentic_ai_hackathon_2025_backend.tools.email.email_service import EmailService
+from national_agentic_ai_hackathon_2025_backend.utils.tracing import Tracer
 from national_agentic_ai_hackathon_2025_backend._debug import Logger
 from national_agentic_ai_hackathon_2025_backend.schemas.booking import Appointment
 
 
-def create_booking_email_tool(context):
+def create_booking_email_tool():
     """
-    Create a booking email tool that can be used by the booking agent
-    
-    Args:
-        context: The context object containing user and global information
+    Create a booking email tool that can be used by the booking agent.
+    Built once per agent definition; it holds no per-request state.
     
     Returns:
-        Dict: Tool configuration for the agent
+        FunctionTool: ``booking_email_tool``, dispatching to send_booking_email
     """
     
     email_service = EmailService()
@@ -184,8 +185,7 @@ def create_booking_email_tool(context):
                 "facility_type": facility_type
             }
     
-    # Return the tool configuration
-    return {
+    config = {
         "type": "function",
         "function": {
             "name": "booking_email_tool",
@@ -256,6 +256,19 @@ def create_booking_email_tool(context):
         }
     }
 
+    @Tracer.traced("tool.booking_email_tool")
+    async def invoke(wrapper: RunContextWrapper, arguments: str) -> Dict[str, Any]:
+        return await send_booking_email(**json.loads(arguments or "{}"))
+
+    # Not strict: appointment_data and facility_data accept fields beyond the listed ones
+    return FunctionTool(
+        name=config["function"]["name"],
+        description=config["function"]["description"],
+        params_json_schema=config["function"]["parameters"],
+        on_invoke_tool=invoke,
+        strict_json_schema=False,
+    )
+
 
 # Standalone function for direct use
 async def send_booking_email(
@@ -0,0 +1,264 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+import numpy as np
+
+from national_agentic_ai_hackathon_2025_backend.config import Config
+from national_agentic_ai_hackathon_2025_backend.utils import geohash
+from national_agentic_ai_hackathon_2025_backend.utils.geo import haversine_km_many, parse_point
+from national_agentic_ai_hackathon_2025_backend.utils.metrics import Metrics
+from national_agentic_ai_hackathon_2025_backend.tools.location.maps_http import is_maps_outage, maps_get, maps_url
+from national_agentic_ai_hackathon_2025_backend.tools.location.road_router import RoadRouter
+from national_agentic_ai_hackathon_2025_backend._debug import Logger
+
+# Distance Matrix accepts at most 25 destinations per request
+MAX_DESTINATIONS_PER_REQUEST = 25
+
+Element = Dict[str, Any]
+
+
+def _destination_key(destination: str) -> str:
+    point = parse_point(destination)
+    if point is not None:
+        return f"{point[0]:.6f},{point[1]:.6f}"
+    return " ".join(destination.lower().split())
+
+
+@dataclass
+class DistanceCacheEntry:
+    address: str
+    element: Element
+    expires_at: float
+
+
+class DistanceCache:
+    """
+    Driving distance and duration per (origin geohash cell, destination).
+    Only OK elements from Google are stored; entries expire after ``ttl_seconds`` and the
+    least recently used is evicted beyond ``max_entries``.
+    """
+
+    def __init__(
+        self,
+        precision: int = 7,
+        ttl_seconds: float = 24 * 3600,
+        max_entries: int = 20000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.precision = precision
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: "OrderedDict[Tuple[str, str], DistanceCacheEntry]" = OrderedDict()
+
+    def _key(self, origin: Tuple[float, float], destination: str) -> Tuple[str, str]:
+        return geohash.encode(origin[0], origin[1], self.precision), _destination_key(destination)
+
+    def get(self, origin: Tuple[float, float], destination: str) -> Optional[DistanceCacheEntry]:
+        key = self._key(origin, destination)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= self.clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, origin: Tuple[float, float], destination: str, address: str, element: Element) -> None:
+        if element.get("status") != "OK" or element.get("source") == "offline":
+            return
+        key = self._key(origin, destination)
+        self._entries[key] = DistanceCacheEntry(address, element, self.clock() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+@dataclass
+class DistanceMatrixResult:
+    destinations: List[str]
+    addresses: List[str]
+    elements: List[Element]
+    pruned: List[str] = field(default_factory=list)
+
+
+@dataclass
+class DistanceMatrixStats:
+    calls: int = 0
+    elements_requested: int = 0
+    elements_pruned: int = 0
+    elements_cached: int = 0
+    elements_sent: int = 0
+    requests: int = 0
+    request_ms_total: float = 0.0
+    calls_fully_cached: int = 0
+    elements_offline: int = 0
+
+
+class DistanceMatrix:
+    """
+    Driving distances from one origin to many destinations, spending as few
+    Distance Matrix elements as possible.
+
+    Destinations given as "lat,lng" are pre-ranked by straight-line distance
+    and only the ``top_k`` closest are considered (0 keeps all); addresses
+    cannot be ranked and are always kept. Cached (origin cell, destination)
+    pairs are answered locally, and the rest are sent in concurrent requests
+    of at most ``chunk_size`` destinations. If Google is down or refuses a
+    request (quota, server error) and a ``router`` is configured, that
+    chunk is answered from the local road network instead.
+    """
+
+    def __init__(
+        self,
+        top_k: int = 0,
+        chunk_size: int = MAX_DESTINATIONS_PER_REQUEST,
+        cache: Optional[DistanceCache] = None,
+        router: Optional[RoadRouter] = None,
+    ) -> None:
+        self.top_k = top_k
+        self.chunk_size = min(chunk_size, MAX_DESTINATIONS_PER_REQUEST)
+        self.cache = cache
+        self.router = router
+        self._stats = DistanceMatrixStats()
+
+    def prerank(self, origin: Tuple[float, float], destinations: List[str]) -> Tuple[List[str], List[str]]:
+        """(kept, pruned): the ``top_k`` nearest coordinate destinations plus every address destination."""
+        points = [(destination, parse_point(destination)) for destination in destinations]
+        located = [(d, point) for d, point in points if point is not None]
+        if not self.top_k or len(located) <= self.top_k:
+            return list(destinations), []
+        coordinates = np.array([point for _, point in located], dtype=np.float64)
+        # Only a coarse cut before the API ranks by road, so the equirectangular approximation will do
+        distances = haversine_km_many(origin[0], origin[1], coordinates[:, 0], coordinates[:, 1], approximate=True)
+        keep = {located[i][0] for i in np.argsort(distances, kind="stable")[:self.top_k].tolist()}
+        kept = [d for d, point in points if point is None or d in keep]
+        pruned = [d for d, point in points if point is not None and d not in keep]
+        return kept, pruned
+
+    async def query(self, origin: Tuple[float, float], destinations: List[str]) -> DistanceMatrixResult:
+        destinations = list(dict.fromkeys(d.strip() for d in destinations if d.strip()))
+        kept, pruned = self.prerank(origin, destinations)
+        addresses: Dict[str, str] = {}
+        elements: Dict[str, Element] = {}
+        for destination in kept:
+            entry = self.cache.get(origin, destination) if self.cache is not None else None
+            if entry is not None:
+                addresses[destination], elements[destination] = entry.address, entry.element
+        misses = [d for d in kept if d not in elements]
+        chunks = [misses[i:i + self.chunk_size] for i in range(0, len(misses), self.chunk_size)]
+        for chunk, (chunk_addresses, chunk_elements) in zip(chunks, await asyncio.gather(*(self._request(origin, c) for c in chunks))):
+            for destination, address, element in zip(chunk, chunk_addresses, chunk_elements):
+                addresses[destination], elements[destination] = address, element
+                if self.cache is not None:
+                    self.cache.put(origin, destination, address, element)
+
+        self._record(len(destinations), len(pruned), len(kept) - len(misses), len(misses))
+        return DistanceMatrixResult(
+            destinations=kept,
+            addresses=[addresses[d] for d in kept],
+            elements=[elements[d] for d in kept],
+            pruned=pruned,
+        )
+
+    async def _request(self, origin: Tuple[float, float], destinations: List[str]) -> Tuple[List[str], List[Element]]:
+        url = maps_url("/maps/api/distancematrix/json") + (
+            f"?origins={origin[0]},{origin[1]}&destinations={quote('|'.join(destinations), safe='|,')}"
+            f"&mode=driving&key={Config.get('GOOGLE_API_KEY')}"
+        )
+        start = time.perf_counter()
+        try:
+            data = await maps_get(url)
+        except Exception as e:
+            if self.router is None or not is_maps_outage(e):
+                raise
+            Logger.warning(f"Distance Matrix unavailable ({type(e).__name__}), routing offline")
+            return await self._route_offline(origin, destinations)
+        elapsed = time.perf_counter() - start
+        self._stats.requests += 1
+        self._stats.request_ms_total += elapsed * 1000
+        Metrics.increment("distance_matrix.requests")
+        Metrics.observe("distance_matrix.request", elapsed)
+        if data.get("status") != "OK" or not data.get("rows"):
+            status = data.get("status", "UNKNOWN_ERROR")
+            if self.router is not None and status != "INVALID_REQUEST":
+                Logger.warning(f"Distance Matrix returned {status}, routing offline")
+                return await self._route_offline(origin, destinations)
+            return list(destinations), [{"status": status} for _ in destinations]
+        return data.get("destination_addresses", list(destinations)), data["rows"][0]["elements"]
+
+    async def _route_offline(self, origin: Tuple[float, float], destinations: List[str]) -> Tuple[List[str], List[Element]]:
+        # Addresses would need geocoding; only "lat,lng" destinations can be routed locally
+        points = [parse_point(d) for d in destinations]
+        routable = [(i, point) for i, point in enumerate(points) if point is not None]
+        elements: List[Element] = [{"status": "NOT_FOUND"} for _ in destinations]
+        # The search is CPU-bound; a thread keeps the event loop responsive while it runs
+        routed = await asyncio.to_thread(self.router.travel_times, origin, [point for _, point in routable])
+        for (i, _), element in zip(routable, routed):
+            elements[i] = element
+        self._stats.elements_offline += len(routable)
+        Metrics.increment("distance_matrix.elements_offline", len(routable))
+        return list(destinations), elements
+
+    def _record(self, requested: int, pruned: int, cached: int, sent: int) -> None:
+        self._stats.calls += 1
+        self._stats.elements_requested += requested
+        self._stats.elements_pruned += pruned
+        self._stats.elements_cached += cached
+        self._stats.elements_sent += sent
+        if sent == 0 and cached:
+            self._stats.calls_fully_cached += 1
+        Metrics.increment("distance_matrix.elements_requested", requested)
+        Metrics.increment("distance_matrix.elements_pruned", pruned)
+        Metrics.increment("distance_matrix.elements_cached", cached)
+        Metrics.increment("distance_matrix.elements_sent", sent)
+
+    def stats(self) -> Dict[str, Any]:
+        """Element and request counters, with the elements and round-trip time saved."""
+        stats = self._stats.__dict__.copy()
+        avg_request_ms = self._stats.request_ms_total / self._stats.requests if self._stats.requests else 0.0
+        saved = self._stats.elements_requested - self._stats.elements_sent
+        stats.update(
+            elements_saved=saved,
+            element_savings_rate=round(saved / self._stats.elements_requested, 4) if self._stats.elements_requested else 0.0,
+            avg_request_ms=round(avg_request_ms, 2),
+            # Calls answered without a request skip a whole round-trip
+            est_latency_saved_ms=round(self._stats.calls_fully_cached * avg_request_ms, 2),
+            cache_size=len(self.cache) if self.cache is not None else 0,
+        )
+        del stats["request_ms_total"]
+        return stats
+
+    @classmethod
+    def get(cls) -> "DistanceMatrix":
+        """
+        Process-wide client from DISTANCE_MATRIX_* settings; the cache is on with
+        DISTANCE_MATRIX_CACHE_ENABLED and the offline fallback with ROAD_ROUTER_GRAPH_PATH.
+        """
+        global _matrix
+        if _matrix is None:
+            cache = None
+            if Config.get_bool("DISTANCE_MATRIX_CACHE_ENABLED"):
+                cache = DistanceCache(
+                    precision=Config.get_int("DISTANCE_MATRIX_CACHE_PRECISION", 7),
+                    ttl_seconds=Config.get_float("DISTANCE_MATRIX_CACHE_TTL_SECONDS", 24 * 3600),
+                    max_entries=Config.get_int("DISTANCE_MATRIX_CACHE_MAX_ENTRIES", 20000),
+                )
+            _matrix = cls(
+                top_k=Config.get_int("DISTANCE_MATRIX_TOP_K", 0),
+                chunk_size=Config.get_int("DISTANCE_MATRIX_CHUNK_SIZE", MAX_DESTINATIONS_PER_REQUEST),
+                cache=cache,
+                router=RoadRouter.get(),
+            )
+        return _matrix
+
+
+_matrix: Optional[DistanceMatrix] = None
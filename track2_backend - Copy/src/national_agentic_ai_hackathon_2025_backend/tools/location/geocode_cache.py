@@ -0,0 +1,252 @@
+import asyncio
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+from national_agentic_ai_hackathon_2025_backend.config import Config
+from national_agentic_ai_hackathon_2025_backend.utils import geohash
+from national_agentic_ai_hackathon_2025_backend.utils.metrics import Metrics
+from national_agentic_ai_hackathon_2025_backend._debug import Logger
+
+# Geocoding statuses that mean "nothing there" rather than "try again later"
+NEGATIVE_STATUSES = ("ZERO_RESULTS",)
+
+
+@dataclass
+class GeocodeEntry:
+    result: Dict[str, Any]
+    negative: bool
+    expires_at: float
+
+
+@dataclass
+class GeocodeCacheStats:
+    hits: int = 0
+    negative_hits: int = 0
+    coalesced: int = 0
+    misses: int = 0
+    stored: int = 0
+    expired: int = 0
+    evicted: int = 0
+    persist_errors: int = 0
+
+
+class GeocodeCache:
+    """
+    Reverse-geocode results keyed by the geohash of the coordinate, so every
+    request from the same ~150 m cell (at the default precision of 7) shares
+    one Google Geocoding call.
+
+    Found addresses live for ``ttl_seconds`` and ZERO_RESULTS answers for
+    ``negative_ttl_seconds``; any other error is never cached. The least
+    recently used entry is evicted beyond ``max_entries``. Concurrent misses
+    for the same cell wait for the first caller's request instead of sending
+    their own. With ``path`` set, entries are written through to a SQLite
+    file and the newest ones reloaded on start; the file is pruned to the
+    ``max_entries`` latest-expiring rows on start and every ``prune_every``
+    writes.
+    """
+
+    def __init__(
+        self,
+        precision: int = 7,
+        ttl_seconds: float = 7 * 24 * 3600,
+        negative_ttl_seconds: float = 3600,
+        max_entries: int = 10000,
+        path: Optional[str] = None,
+        prune_every: int = 500,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.precision = precision
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.max_entries = max_entries
+        self.path = path
+        self.prune_every = prune_every
+        self.clock = clock
+        self._writes = 0
+        self._entries: "OrderedDict[str, GeocodeEntry]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._stats = GeocodeCacheStats()
+        if path:
+            self._load()
+
+    def key(self, lat: float, lng: float) -> str:
+        return geohash.encode(lat, lng, self.precision)
+
+    def lookup(self, lat: float, lng: float) -> Optional[Dict[str, Any]]:
+        """Cached result for the cell containing (lat, lng), or None."""
+        key = self.key(lat, lng)
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= self.clock():
+            del self._entries[key]
+            self._stats.expired += 1
+            entry = None
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        if entry.negative:
+            self._stats.negative_hits += 1
+            Metrics.increment("geocode_cache.negative_hit")
+        else:
+            self._stats.hits += 1
+            Metrics.increment("geocode_cache.hit")
+        return dict(entry.result)
+
+    async def store(self, lat: float, lng: float, result: Dict[str, Any]) -> bool:
+        """Cache a tool result. Returns False if it is an error that should not be cached."""
+        if "error" in result:
+            if result.get("status") not in NEGATIVE_STATUSES:
+                return False
+            negative = True
+        else:
+            negative = False
+        key = self.key(lat, lng)
+        entry = GeocodeEntry(
+            result=dict(result),
+            negative=negative,
+            expires_at=self.clock() + (self.negative_ttl_seconds if negative else self.ttl_seconds),
+        )
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats.evicted += 1
+        self._stats.stored += 1
+        if self.path:
+            try:
+                await asyncio.to_thread(self._persist, key, entry)
+            except Exception as e:
+                Logger.warning(f"Failed to persist geocode cache entry {key}: {e}")
+                self._stats.persist_errors += 1
+        return True
+
+    async def get_or_fetch(
+        self, lat: float, lng: float, fetch: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Cached result for (lat, lng), otherwise ``fetch()``'s result, stored if cacheable."""
+        cached = self.lookup(lat, lng)
+        if cached is not None:
+            return cached
+
+        key = self.key(lat, lng)
+        pending = self._inflight.get(key)
+        if pending is not None:
+            try:
+                # Shielded so a follower's own timeout does not cancel the shared request
+                result = await asyncio.shield(pending)
+                self._stats.coalesced += 1
+                Metrics.increment("geocode_cache.coalesced")
+                return dict(result)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The first caller was cancelled (its deadline ran out), not us: fetch on our own
+
+        self._stats.misses += 1
+        Metrics.increment("geocode_cache.miss")
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await fetch()
+            await self.store(lat, lng, result)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark it retrieved so a miss without followers does not log "exception never retrieved"
+            future.exception()
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters plus hit rate and the number of Google calls saved."""
+        stats = self._stats.__dict__.copy()
+        saved = self._stats.hits + self._stats.negative_hits + self._stats.coalesced
+        lookups = saved + self._stats.misses
+        stats.update(
+            size=len(self._entries),
+            precision=self.precision,
+            saved_calls=saved,
+            hit_rate=round(saved / lookups, 4) if lookups else 0.0,
+        )
+        return stats
+
+    def clear(self) -> None:
+        """Drop every entry, including the persisted ones."""
+        self._entries.clear()
+        if self.path:
+            conn = self._connect()
+            try:
+                conn.execute("DELETE FROM geocode_cache")
+            finally:
+                conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+
+    def _load(self) -> None:
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS geocode_cache ("
+                "key TEXT PRIMARY KEY, result TEXT NOT NULL, negative INTEGER NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._prune(conn)
+            rows = conn.execute(
+                "SELECT key, result, negative, expires_at FROM geocode_cache ORDER BY expires_at DESC LIMIT ?",
+                (self.max_entries,),
+            ).fetchall()
+        finally:
+            conn.close()
+        # Oldest first, so the LRU order starts with the entries closest to expiry
+        for key, result, negative, expires_at in reversed(rows):
+            self._entries[key] = GeocodeEntry(result=json.loads(result), negative=bool(negative), expires_at=expires_at)
+        Logger.info(f"Loaded {len(rows)} geocode cache entries from {self.path}")
+
+    def _persist(self, key: str, entry: GeocodeEntry) -> None:
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO geocode_cache (key, result, negative, expires_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(entry.result), int(entry.negative), entry.expires_at),
+            )
+            self._writes += 1
+            if self._writes % self.prune_every == 0:
+                self._prune(conn)
+        finally:
+            conn.close()
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        """Delete expired rows and all but the ``max_entries`` latest-expiring ones (the ones ``_load`` keeps)."""
+        conn.execute("DELETE FROM geocode_cache WHERE expires_at <= ?", (self.clock(),))
+        conn.execute(
+            "DELETE FROM geocode_cache WHERE key NOT IN "
+            "(SELECT key FROM geocode_cache ORDER BY expires_at DESC LIMIT ?)",
+            (self.max_entries,),
+        )
+
+    @classmethod
+    def get(cls) -> Optional["GeocodeCache"]:
+        """Process-wide cache from GEOCODE_CACHE_* settings, or None when GEOCODE_CACHE_ENABLED is off."""
+        global _cache
+        if _cache is None and Config.get_bool("GEOCODE_CACHE_ENABLED"):
+            _cache = cls(
+                precision=Config.get_int("GEOCODE_CACHE_PRECISION", 7),
+                ttl_seconds=Config.get_float("GEOCODE_CACHE_TTL_SECONDS", 7 * 24 * 3600),
+                negative_ttl_seconds=Config.get_float("GEOCODE_CACHE_NEGATIVE_TTL_SECONDS", 3600),
+                max_entries=Config.get_int("GEOCODE_CACHE_MAX_ENTRIES", 10000),
+                path=Config.get("GEOCODE_CACHE_PATH"),
+            )
+        return _cache
+
+
+_cache: Optional[GeocodeCache] = None
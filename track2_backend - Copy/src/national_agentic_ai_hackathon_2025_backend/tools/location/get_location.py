@@ -1,9 +1,15 @@
 from national_agentic_ai_hackathon_2025_backend.config import Config
+from national_agentic_ai_hackathon_2025_backend.utils.tracing import Tracer
+from national_agentic_ai_hackathon_2025_backend.utils.metrics import Metrics
+from national_agentic_ai_hackathon_2025_backend.tools.location.maps_http import is_maps_outage, maps_get, maps_url
+from national_agentic_ai_hackathon_2025_backend.tools.location.geocode_cache import GeocodeCache
+from national_agentic_ai_hackathon_2025_backend.tools.location.offline_geocoder import OfflineGeocoder
+from national_agentic_ai_hackathon_2025_backend._debug import Logger
 from agents import function_tool, RunContextWrapper
-import requests
 
 @function_tool
-def get_location_info(
+@Tracer.traced("tool.get_location_info")
+async def get_location_info(
     wrapper: RunContextWrapper,
     lat: float,
     lng: float,
@@ -18,13 +24,41 @@ def get_location_info(
     Returns:
         dict: Location information including city, country, and other details
     """
-    url = (
-        f"https://maps.googleapis.com/maps/api/geocode/json?"
-        f"latlng={lat},{lng}&key={Config.get('GOOGLE_API_KEY')}"
-    )
+    offline = OfflineGeocoder.get()
+    if offline is not None and OfflineGeocoder.is_primary():
+        location_info = offline.reverse(lat, lng)
+        if location_info is not None:
+            Metrics.increment("offline_geocoder.primary")
+            return location_info
+
+    try:
+        cache = GeocodeCache.get()
+        if cache is not None:
+            location_info = await cache.get_or_fetch(lat, lng, lambda: reverse_geocode(lat, lng))
+        else:
+            location_info = await reverse_geocode(lat, lng)
+    except Exception as e:
+        fallback = offline.reverse(lat, lng) if offline is not None and is_maps_outage(e) else None
+        if fallback is None:
+            raise
+        Logger.warning(f"Google reverse geocoding unavailable ({type(e).__name__}), using offline boundaries")
+        Metrics.increment("offline_geocoder.fallback")
+        return fallback
+
+    # Quota and server-side errors get the local answer too; ZERO_RESULTS is a real answer
+    if offline is not None and location_info.get("status") not in (None, "OK", "ZERO_RESULTS"):
+        fallback = offline.reverse(lat, lng)
+        if fallback is not None:
+            Metrics.increment("offline_geocoder.fallback")
+            return fallback
+    return location_info
+
+
+async def reverse_geocode(lat: float, lng: float) -> dict:
+    """Google reverse geocoding of (lat, lng), reduced to the fields the agents use."""
+    url = maps_url("/maps/api/geocode/json") + f"?latlng={lat},{lng}&key={Config.get('GOOGLE_API_KEY')}"
     
-    response = requests.get(url)
-    data = response.json()
+    data = await maps_get(url)
     
     if data["status"] != "OK" or not data["results"]:
         return {"error": "Location not found", "status": data["status"]}
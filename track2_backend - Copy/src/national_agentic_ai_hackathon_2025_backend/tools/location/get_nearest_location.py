@@ -1,49 +1,56 @@
-from national_agentic_ai_hackathon_2025_backend.config import Config
-from national_agentic_ai_hackathon_2025_backend.context.coordinates import Coordinates
+from national_agentic_ai_hackathon_2025_backend.context.global_context import GlobalContext
+from national_agentic_ai_hackathon_2025_backend.utils.tracing import Tracer
+from national_agentic_ai_hackathon_2025_backend.tools.location.distance_matrix import DistanceMatrix
 from agents import function_tool, RunContextWrapper
 from typing import List
-import requests
 
 @function_tool
-def get_nearest_place(
-    wrapper: RunContextWrapper[Coordinates],
+@Tracer.traced("tool.get_nearest_place")
+async def get_nearest_place(
+    wrapper: RunContextWrapper[GlobalContext],
     destinations: List[str],
 ):
     """
-    Find the nearest destination from a given origin using the Google Maps Distance Matrix API.
+    Find the nearest destination from the user's location using the Google Maps Distance Matrix API.
 
-    This tool takes an origin location (latitude,longitude as a string) and a set of predefined
-    destination coordinates, and returns the destination that is closest to the origin by driving distance.
+    The origin is the user's shared location (the run context's coordinates). Among the
+    given destinations, this returns the one that is closest to the origin by driving distance.
     The response includes the nearest destination's address, distance, and duration, as well as the full API results.
 
     Args:
-        origin (str): The origin location as a "lat,lng" string.
+        destinations (List[str]): Candidate destinations, as addresses or "lat,lng" strings.
 
     Returns:
-        dict: A dictionary containing the nearest place information and all API results.
+        dict: A dictionary containing the nearest place information and all API results,
+        or an "error" entry if the user's location is unknown or no destination is reachable.
     """
-    origin = f"{wrapper.context.latitude}, {wrapper.context.longitude}"
- 
-    dest_str = "|".join(destinations)
-
-    url = (
-        f"https://maps.googleapis.com/maps/api/distancematrix/json?"
-        f"origins={origin}&destinations={dest_str}&mode=driving&key={Config.get('GOOGLE_API_KEY')}"
-    )
-
-    response = requests.get(url)
-    data = response.json()
+    coordinates = wrapper.context.coordinates
+    if coordinates is None:
+        return {"error": "User location is not available"}
+    origin = (coordinates.latitude, coordinates.longitude)
+    result = await DistanceMatrix.get().query(origin, destinations)
 
     # Extract nearest location
-    elements = data["rows"][0]["elements"]
-    min_index = min(range(len(elements)), key=lambda i: elements[i]["distance"]["value"])
+    reachable = [i for i, element in enumerate(result.elements) if element.get("status") == "OK"]
+    if not reachable:
+        statuses = sorted({element.get("status", "UNKNOWN_ERROR") for element in result.elements})
+        return {"error": "No reachable destination", "statuses": statuses}
+    min_index = min(reachable, key=lambda i: result.elements[i]["distance"]["value"])
 
     nearest = {
-        "destination": data["destination_addresses"][min_index],
-        "distance_text": elements[min_index]["distance"]["text"],
-        "distance_value_m": elements[min_index]["distance"]["value"],
-        "duration_text": elements[min_index]["duration"]["text"],
-        "duration_value_s": elements[min_index]["duration"]["value"],
+        "destination": result.addresses[min_index],
+        "distance_text": result.elements[min_index]["distance"]["text"],
+        "distance_value_m": result.elements[min_index]["distance"]["value"],
+        "duration_text": result.elements[min_index]["duration"]["text"],
+        "duration_value_s": result.elements[min_index]["duration"]["value"],
+    }
+    all_results = {
+        "origin_addresses": [f"{origin[0]}, {origin[1]}"],
+        "destination_addresses": result.addresses,
+        "rows": [{"elements": result.elements}],
+        "status": "OK",
     }
-    print({"nearest_place": nearest})
-    return {"nearest_place": nearest, "all_results": data}
\ No newline at end of file
+    if result.pruned:
+        # Too far by straight-line distance to be the nearest; never sent to the API
+        all_results["pruned_destinations"] = result.pruned
+    return {"nearest_place": nearest, "all_results": all_results}
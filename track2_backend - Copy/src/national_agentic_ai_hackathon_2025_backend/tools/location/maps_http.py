@@ -0,0 +1,151 @@
+import asyncio
+import json
+import random
+from typing import Optional
+import aiohttp
+from national_agentic_ai_hackathon_2025_backend.config import Config
+from national_agentic_ai_hackathon_2025_backend.utils.deadline import Deadline, DeadlineExceeded
+from national_agentic_ai_hackathon_2025_backend.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from national_agentic_ai_hackathon_2025_backend.utils.metrics import Metrics
+from national_agentic_ai_hackathon_2025_backend._debug import Logger
+
+
+class MapsUnavailableError(Exception):
+    """Google Maps answered with a server error."""
+
+
+class MapsResponseTooLarge(Exception):
+    """The response body exceeded GOOGLE_MAPS_MAX_RESPONSE_BYTES."""
+
+
+def _is_maps_failure(error: BaseException) -> bool:
+    # Only outages count against the breaker; bad input is the caller's problem. A timeout cut short by
+    # the request deadline is raised as DeadlineExceeded instead, which the breaker doesn't record at all
+    return isinstance(error, (aiohttp.ClientConnectionError, asyncio.TimeoutError, MapsUnavailableError))
+
+
+def _is_retryable(error: BaseException) -> bool:
+    return _is_maps_failure(error)
+
+
+def is_maps_outage(error: BaseException) -> bool:
+    """True if Google Maps is down or too slow (including an open breaker or no time left to wait), as opposed to a bad request."""
+    return _is_maps_failure(error) or isinstance(error, (CircuitOpenError, DeadlineExceeded))
+
+
+def maps_url(path: str) -> str:
+    """Google Maps API URL for ``path``; GOOGLE_MAPS_BASE_URL points it elsewhere (a local stand-in in load tests)."""
+    return (Config.get("GOOGLE_MAPS_BASE_URL") or "https://maps.googleapis.com").rstrip("/") + path
+
+
+class MapsClient:
+    """
+    Shared async HTTP client for the Google Maps APIs.
+
+    One aiohttp session per event loop keeps connections alive across tool
+    calls (at most GOOGLE_MAPS_MAX_CONNECTIONS). Every attempt runs through
+    the ``google_maps`` circuit breaker with a timeout capped by the request
+    deadline; connection errors, timeouts and 5xx answers are retried up to
+    GOOGLE_MAPS_RETRIES times with full-jitter backoff, as long as the
+    deadline leaves room. Bodies over GOOGLE_MAPS_MAX_RESPONSE_BYTES are
+    rejected without being read in full.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 50,
+        timeout_seconds: float = 10.0,
+        connect_timeout_seconds: float = 3.0,
+        retries: int = 2,
+        backoff_base_seconds: float = 0.2,
+        backoff_max_seconds: float = 2.0,
+        max_response_bytes: int = 1 << 20,
+    ) -> None:
+        self.max_connections = max_connections
+        self.timeout_seconds = timeout_seconds
+        self.connect_timeout_seconds = connect_timeout_seconds
+        self.retries = retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.max_response_bytes = max_response_bytes
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            # Sessions are bound to the loop that created them (matters for scripts that call asyncio.run twice)
+            connector = aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=30, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(connector=connector, raise_for_status=False)
+            self._loop = loop
+        return self._session
+
+    async def get_json(self, url: str) -> dict:
+        """GET a Google Maps API URL and return the JSON body."""
+        breaker = CircuitBreaker.get("google_maps", is_failure=_is_maps_failure)
+        attempt = 0
+        while True:
+            try:
+                with breaker.guard():
+                    return await self._fetch(url)
+            except Exception as e:
+                if not _is_retryable(e) or attempt >= self.retries:
+                    raise
+                delay = random.uniform(0, min(self.backoff_max_seconds, self.backoff_base_seconds * 2 ** attempt))
+                remaining = Deadline.remaining()
+                if remaining is not None and remaining <= delay:
+                    raise
+                attempt += 1
+                Metrics.increment("google_maps.retries")
+                Logger.warning(f"Google Maps request failed ({type(e).__name__}: {e}), retry {attempt} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    async def _fetch(self, url: str) -> dict:
+        total = Deadline.timeout(self.timeout_seconds)
+        timeout = aiohttp.ClientTimeout(total=total, connect=min(self.connect_timeout_seconds, total))
+        try:
+            async with self._get_session().get(url, timeout=timeout) as response:
+                if response.status >= 500:
+                    raise MapsUnavailableError(f"Google Maps returned HTTP {response.status}")
+                if response.content_length is not None and response.content_length > self.max_response_bytes:
+                    raise MapsResponseTooLarge(f"Google Maps response of {response.content_length} bytes")
+                body = bytearray()
+                async for chunk in response.content.iter_chunked(64 * 1024):
+                    body += chunk
+                    if len(body) > self.max_response_bytes:
+                        raise MapsResponseTooLarge(f"Google Maps response over {self.max_response_bytes} bytes")
+        except asyncio.TimeoutError:
+            if total < self.timeout_seconds and Deadline.expired():
+                # Our budget ran out before GOOGLE_MAPS_TIMEOUT_SECONDS did
+                Metrics.increment("deadline.exceeded.google_maps")
+                raise DeadlineExceeded(f"Google Maps did not answer within the remaining {total:.1f}s") from None
+            raise
+        return json.loads(body)
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    @classmethod
+    def get(cls) -> "MapsClient":
+        """Process-wide client configured from GOOGLE_MAPS_* settings."""
+        global _client
+        if _client is None:
+            _client = cls(
+                max_connections=Config.get_int("GOOGLE_MAPS_MAX_CONNECTIONS", 50),
+                timeout_seconds=Config.get_float("GOOGLE_MAPS_TIMEOUT_SECONDS", 10.0),
+                connect_timeout_seconds=Config.get_float("GOOGLE_MAPS_CONNECT_TIMEOUT_SECONDS", 3.0),
+                retries=Config.get_int("GOOGLE_MAPS_RETRIES", 2),
+                backoff_base_seconds=Config.get_float("GOOGLE_MAPS_BACKOFF_SECONDS", 0.2),
+                max_response_bytes=Config.get_int("GOOGLE_MAPS_MAX_RESPONSE_BYTES", 1 << 20),
+            )
+        return _client
+
+
+_client: Optional[MapsClient] = None
+
+
+async def maps_get(url: str) -> dict:
+    """GET a Google Maps API URL through the shared MapsClient and return the JSON body."""
+    return await MapsClient.get().get_json(url)
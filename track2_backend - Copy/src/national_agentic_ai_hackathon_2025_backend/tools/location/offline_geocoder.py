@@ -0,0 +1,216 @@
+import json
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from national_agentic_ai_hackathon_2025_backend.config import Config
+from national_agentic_ai_hackathon_2025_backend._debug import Logger
+
+Ring = Sequence[Sequence[float]]
+Edge = Tuple[float, float, float, float]
+
+# Administrative levels from coarse to fine. ADM0..ADM4 in HDX/OCHA, GADM and
+# geoBoundaries data map onto these in order (Pakistan's COD-AB layout)
+DEFAULT_LEVELS = ("country", "province", "division", "district", "tehsil")
+
+_ADM_FIELD = re.compile(r"^(?:ADM(\d)_EN|NAME_(\d))$")
+_ADM_TYPE = re.compile(r"^ADM(\d)$")
+
+
+@dataclass
+class Region:
+    """One administrative area: its names from the country down to its own level, and its boundary."""
+
+    level: int
+    names: Dict[str, str]
+    bbox: Tuple[float, float, float, float]
+    band_height: float = 0.0
+    bands: List[List[Edge]] = field(default_factory=list)
+
+    def contains(self, lng: float, lat: float) -> bool:
+        min_lng, min_lat, max_lng, max_lat = self.bbox
+        if not (min_lng <= lng <= max_lng and min_lat <= lat <= max_lat):
+            return False
+        band = min(int((lat - min_lat) / self.band_height), len(self.bands) - 1)
+        # Even-odd ray casting over the edges that overlap this latitude band;
+        # holes and MultiPolygon parts need no special handling under even-odd
+        inside = False
+        for x1, y1, x2, y2 in self.bands[band]:
+            if (y1 > lat) != (y2 > lat) and lng < x1 + (lat - y1) * (x2 - x1) / (y2 - y1):
+                inside = not inside
+        return inside
+
+
+def _build_region(level: int, names: Dict[str, str], rings: List[Ring]) -> Optional[Region]:
+    edges: List[Edge] = []
+    for ring in rings:
+        for (x1, y1, *_), (x2, y2, *_) in zip(ring, list(ring[1:]) + [ring[0]]):
+            if y1 != y2:
+                edges.append((x1, y1, x2, y2))
+    if not edges:
+        return None
+    min_lng = min(min(e[0], e[2]) for e in edges)
+    max_lng = max(max(e[0], e[2]) for e in edges)
+    min_lat = min(min(e[1], e[3]) for e in edges)
+    max_lat = max(max(e[1], e[3]) for e in edges)
+    # About sqrt(n) bands keeps each band to roughly sqrt(n) edges
+    band_count = max(1, int(math.sqrt(len(edges))))
+    band_height = (max_lat - min_lat) / band_count or 1.0
+    bands: List[List[Edge]] = [[] for _ in range(band_count)]
+    for edge in edges:
+        low, high = sorted((edge[1], edge[3]))
+        first = min(int((low - min_lat) / band_height), band_count - 1)
+        last = min(int((high - min_lat) / band_height), band_count - 1)
+        for band in range(first, last + 1):
+            bands[band].append(edge)
+    return Region(level, names, (min_lng, min_lat, max_lng, max_lat), band_height, bands)
+
+
+def _feature_names(properties: Dict[str, Any], levels: Sequence[str]) -> Tuple[Optional[int], Dict[str, str]]:
+    """Own level index and the names of this level and its parents, from the common admin-boundary schemas."""
+    if properties.get("level") in levels and properties.get("name"):
+        level = levels.index(properties["level"])
+        names = {key: value for key, value in properties.items() if key in levels and isinstance(value, str)}
+        names[properties["level"]] = properties["name"]
+        return level, names
+
+    names: Dict[str, str] = {}
+    level: Optional[int] = None
+    for key, value in properties.items():
+        match = _ADM_FIELD.match(key)
+        if match and value:
+            index = int(match.group(1) or match.group(2))
+            if index < len(levels):
+                names[levels[index]] = str(value)
+                level = index if level is None else max(level, index)
+    shape_type = _ADM_TYPE.match(str(properties.get("shapeType", "")))
+    if shape_type and properties.get("shapeName") and int(shape_type.group(1)) < len(levels):
+        level = int(shape_type.group(1))
+        names[levels[level]] = properties["shapeName"]
+    return level, names
+
+
+def _rings(geometry: Dict[str, Any]) -> List[Ring]:
+    if geometry.get("type") == "Polygon":
+        return list(geometry["coordinates"])
+    if geometry.get("type") == "MultiPolygon":
+        return [ring for polygon in geometry["coordinates"] for ring in polygon]
+    return []
+
+
+class OfflineGeocoder:
+    """
+    Local reverse geocoder over administrative boundary polygons.
+
+    Regions are loaded from GeoJSON files (one per level or all levels in
+    one) and bucketed into a uniform grid of ``cell_degrees`` cells by
+    bounding box. Each region's edges are further split into latitude bands,
+    so a point-in-polygon test only crosses the edges near the query point.
+    A lookup returns the same fields as ``get_location_info`` (city,
+    state_province, country, ...) built from every region containing the
+    point, with ``source`` set to "offline".
+    """
+
+    def __init__(
+        self,
+        regions: Iterable[Region],
+        levels: Sequence[str] = DEFAULT_LEVELS,
+        cell_degrees: float = 0.25,
+        country: Optional[str] = None,
+        country_code: Optional[str] = None,
+    ) -> None:
+        self.regions = list(regions)
+        self.levels = tuple(levels)
+        self.cell_degrees = cell_degrees
+        self.country = country
+        self.country_code = country_code
+        self._grid: Dict[Tuple[int, int], List[Region]] = {}
+        for region in self.regions:
+            min_lng, min_lat, max_lng, max_lat = region.bbox
+            for x in range(self._cell(min_lng), self._cell(max_lng) + 1):
+                for y in range(self._cell(min_lat), self._cell(max_lat) + 1):
+                    self._grid.setdefault((x, y), []).append(region)
+
+    def _cell(self, degrees: float) -> int:
+        return math.floor(degrees / self.cell_degrees)
+
+    @classmethod
+    def from_geojson(cls, paths: Iterable[str], levels: Sequence[str] = DEFAULT_LEVELS, **kwargs) -> "OfflineGeocoder":
+        regions: List[Region] = []
+        for path in paths:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            features = data.get("features", [data] if data.get("type") == "Feature" else [])
+            skipped = 0
+            for feature in features:
+                level, names = _feature_names(feature.get("properties") or {}, levels)
+                region = _build_region(level, names, _rings(feature.get("geometry") or {})) if level is not None else None
+                if region is None:
+                    skipped += 1
+                    continue
+                regions.append(region)
+            Logger.info(f"Loaded {len(features) - skipped} boundary features from {path} ({skipped} skipped)")
+        return cls(regions, levels, **kwargs)
+
+    def containing(self, lat: float, lng: float) -> List[Region]:
+        """Regions containing the point, coarse to fine."""
+        candidates = self._grid.get((self._cell(lng), self._cell(lat)), ())
+        return sorted((r for r in candidates if r.contains(lng, lat)), key=lambda r: r.level)
+
+    def reverse(self, lat: float, lng: float) -> Optional[Dict[str, Any]]:
+        """Location info for (lat, lng) in the ``get_location_info`` shape, or None outside every region."""
+        regions = self.containing(lat, lng)
+        if not regions:
+            return None
+        names: Dict[str, str] = {}
+        for region in regions:
+            names.update(region.names)
+
+        location_info: Dict[str, Any] = {
+            "formatted_address": ", ".join(
+                names[level] for level in reversed(self.levels) if level in names and level != "country"
+            ),
+            "geometry": {"lat": lat, "lng": lng},
+            "source": "offline",
+        }
+        city = names.get("city") or names.get("district") or names.get("tehsil")
+        if city:
+            location_info["city"] = city
+        if "province" in names:
+            location_info["state_province"] = names["province"]
+        for level in ("division", "district", "tehsil"):
+            if level in names:
+                location_info[level] = names[level]
+        country = names.get("country") or self.country
+        if country:
+            location_info["country"] = country
+            location_info["formatted_address"] = ", ".join(filter(None, [location_info["formatted_address"], country]))
+        if self.country_code:
+            location_info["country_code"] = self.country_code
+        return location_info
+
+    @classmethod
+    def get(cls) -> Optional["OfflineGeocoder"]:
+        """Process-wide geocoder from OFFLINE_GEOCODER_PATH (comma-separated GeoJSON files), or None when unset."""
+        global _geocoder
+        if _geocoder is None:
+            paths = [p.strip() for p in (Config.get("OFFLINE_GEOCODER_PATH") or "").split(",") if p.strip()]
+            if not paths:
+                return None
+            levels = [l.strip() for l in Config.get("OFFLINE_GEOCODER_LEVELS", ",".join(DEFAULT_LEVELS)).split(",")]
+            _geocoder = cls.from_geojson(
+                paths,
+                levels=levels,
+                cell_degrees=Config.get_float("OFFLINE_GEOCODER_CELL_DEGREES", 0.25),
+                country=Config.get("OFFLINE_GEOCODER_COUNTRY", "Pakistan"),
+                country_code=Config.get("OFFLINE_GEOCODER_COUNTRY_CODE", "PK"),
+            )
+        return _geocoder
+
+    @classmethod
+    def is_primary(cls) -> bool:
+        """OFFLINE_GEOCODER_MODE=primary answers from local boundaries first; the default only falls back to them."""
+        return Config.get("OFFLINE_GEOCODER_MODE", "fallback").strip().lower() == "primary"
+
+
+_geocoder: Optional[OfflineGeocoder] = None
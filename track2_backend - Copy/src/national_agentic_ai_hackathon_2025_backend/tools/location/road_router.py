@@ -0,0 +1,349 @@
+import bz2
+import gzip
+import heapq
+import math
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from national_agentic_ai_hackathon_2025_backend.config import Config
+from national_agentic_ai_hackathon_2025_backend.utils.geo import haversine_km, haversine_km_many
+from national_agentic_ai_hackathon_2025_backend._debug import Logger
+
+# Free-flow car speeds (km/h) per OSM highway class, used when a way has no usable maxspeed
+SPEED_PROFILE_KMH: Dict[str, float] = {
+    "motorway": 90, "motorway_link": 50,
+    "trunk": 70, "trunk_link": 40,
+    "primary": 50, "primary_link": 35,
+    "secondary": 40, "secondary_link": 30,
+    "tertiary": 35, "tertiary_link": 25,
+    "unclassified": 30, "residential": 25,
+    "living_street": 10, "service": 15, "road": 25,
+}
+
+Element = Dict[str, Any]
+
+
+def _open(path: str):
+    if path.endswith(".bz2"):
+        return bz2.open(path, "rb")
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def _way_speed(tags: Dict[str, str], speeds: Dict[str, float]) -> Optional[float]:
+    speed = speeds.get(tags.get("highway", ""))
+    if speed is None:
+        return None
+    maxspeed = tags.get("maxspeed", "").split()
+    if maxspeed and maxspeed[0].isdigit():
+        # Posted limits are an upper bound; free-flow city traffic rarely reaches them
+        speed = min(float(maxspeed[0]) * (1.609 if maxspeed[-1] == "mph" else 1.0), speed * 1.5)
+    return speed
+
+
+def _way_direction(tags: Dict[str, str]) -> int:
+    """1 forward only, -1 backward only, 0 both ways."""
+    oneway = tags.get("oneway", "")
+    if oneway in ("yes", "true", "1"):
+        return 1
+    if oneway == "-1":
+        return -1
+    if oneway == "no":
+        return 0
+    return 1 if tags.get("junction") in ("roundabout", "circular") or tags.get("highway") == "motorway" else 0
+
+
+@dataclass
+class RoadGraph:
+    """
+    Directed road graph in compressed sparse row form: the edges leaving node
+    ``u`` are ``targets[offsets[u]:offsets[u + 1]]`` with their travel time in
+    ``seconds`` and length in ``metres``.
+    """
+
+    lat: np.ndarray
+    lng: np.ndarray
+    offsets: np.ndarray
+    targets: np.ndarray
+    seconds: np.ndarray
+    metres: np.ndarray
+
+    @property
+    def node_count(self) -> int:
+        return len(self.lat)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    @classmethod
+    def from_edges(cls, lat: Sequence[float], lng: Sequence[float], edges: Iterable[Tuple[int, int, float, float]]) -> "RoadGraph":
+        """Graph from (source, target, seconds, metres) edges, keeping only the largest connected component."""
+        edge_array = np.array(list(edges), dtype=np.float64).reshape(-1, 4)
+        sources, targets = edge_array[:, 0].astype(np.int64), edge_array[:, 1].astype(np.int64)
+
+        # Union-find over undirected connectivity; islands would make snapped points unreachable
+        parent = list(range(len(lat)))
+
+        def find(x: int) -> int:
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        for u, v in zip(sources.tolist(), targets.tolist()):
+            ru, rv = find(u), find(v)
+            if ru != rv:
+                parent[ru] = rv
+        roots = np.array([find(x) for x in range(len(lat))], dtype=np.int64)
+        used = np.zeros(len(lat), dtype=bool)
+        used[sources] = used[targets] = True
+        largest = np.bincount(roots[used]).argmax()
+        keep = used & (roots == largest)
+
+        renumber = np.full(len(lat), -1, dtype=np.int64)
+        renumber[keep] = np.arange(int(keep.sum()))
+        mask = keep[sources]
+        sources, targets, edge_array = renumber[sources[mask]], renumber[targets[mask]], edge_array[mask]
+        order = np.argsort(sources, kind="stable")
+        offsets = np.zeros(int(keep.sum()) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=int(keep.sum())), out=offsets[1:])
+        return cls(
+            lat=np.asarray(lat, dtype=np.float64)[keep],
+            lng=np.asarray(lng, dtype=np.float64)[keep],
+            offsets=offsets,
+            targets=targets[order].astype(np.int32),
+            seconds=edge_array[order, 2].astype(np.float32),
+            metres=edge_array[order, 3].astype(np.float32),
+        )
+
+    @classmethod
+    def from_osm_xml(cls, path: str, speeds: Dict[str, float] = SPEED_PROFILE_KMH) -> "RoadGraph":
+        """Build from an OSM XML extract (.osm, .osm.bz2 or .osm.gz) of drivable highways."""
+        coordinates: Dict[int, Tuple[float, float]] = {}
+        ways: List[Tuple[List[int], float, int]] = []
+        with _open(path) as f:
+            for _, element in ET.iterparse(f, events=("end",)):
+                if element.tag == "node":
+                    coordinates[int(element.get("id"))] = (float(element.get("lat")), float(element.get("lon")))
+                elif element.tag == "way":
+                    tags = {tag.get("k"): tag.get("v") for tag in element.iter("tag")}
+                    speed = _way_speed(tags, speeds)
+                    if speed and tags.get("access") not in ("no", "private"):
+                        ways.append(([int(nd.get("ref")) for nd in element.iter("nd")], speed, _way_direction(tags)))
+                if element.tag in ("node", "way", "relation"):
+                    element.clear()
+
+        index: Dict[int, int] = {}
+        lat: List[float] = []
+        lng: List[float] = []
+
+        def node(osm_id: int) -> int:
+            if osm_id not in index:
+                index[osm_id] = len(lat)
+                lat.append(coordinates[osm_id][0])
+                lng.append(coordinates[osm_id][1])
+            return index[osm_id]
+
+        edges: List[Tuple[int, int, float, float]] = []
+        for refs, speed, direction in ways:
+            refs = [ref for ref in refs if ref in coordinates]
+            for a, b in zip(refs, refs[1:]):
+                metres = haversine_km(*coordinates[a], *coordinates[b]) * 1000
+                seconds = metres / (speed / 3.6)
+                u, v = node(a), node(b)
+                if direction >= 0:
+                    edges.append((u, v, seconds, metres))
+                if direction <= 0:
+                    edges.append((v, u, seconds, metres))
+        Logger.info(f"Read {len(ways)} drivable ways, {len(lat)} nodes and {len(edges)} edges from {path}")
+        return cls.from_edges(lat, lng, edges)
+
+    def save(self, path: str) -> None:
+        np.savez_compressed(
+            path, lat=self.lat, lng=self.lng, offsets=self.offsets,
+            targets=self.targets, seconds=self.seconds, metres=self.metres,
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "RoadGraph":
+        with np.load(path) as data:
+            return cls(**{name: data[name] for name in ("lat", "lng", "offsets", "targets", "seconds", "metres")})
+
+
+def _format_distance(metres: float) -> str:
+    return f"{metres / 1000:.1f} km" if metres >= 1000 else f"{int(round(metres))} m"
+
+
+def _format_duration(seconds: float) -> str:
+    minutes = max(1, int(round(seconds / 60)))
+    if minutes < 60:
+        return f"{minutes} min" if minutes == 1 else f"{minutes} mins"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours} hour{'s' if hours > 1 else ''} {minutes} mins"
+
+
+class RoadRouter:
+    """
+    One-to-many driving times over a local RoadGraph, for when the Distance
+    Matrix API is unavailable.
+
+    Points are snapped to the nearest graph node within ``max_snap_km``
+    (through a grid of ``cell_degrees`` cells) and the gap is covered at
+    ``access_speed_kmh``. The search is A* guided by the straight-line time
+    to the nearest target at the graph's top speed (which never
+    overestimates), stopping once every target is settled or ``max_seconds``
+    is exceeded. Results use Distance Matrix element shapes.
+    """
+
+    def __init__(
+        self,
+        graph: RoadGraph,
+        max_snap_km: float = 2.0,
+        access_speed_kmh: float = 15.0,
+        max_seconds: float = 2 * 3600,
+        cell_degrees: float = 0.01,
+    ) -> None:
+        self.graph = graph
+        self.max_snap_km = max_snap_km
+        self.access_speed_kmh = access_speed_kmh
+        self.max_seconds = max_seconds
+        self.cell_degrees = cell_degrees
+        # Plain lists: per-element indexing is several times faster than on numpy arrays in the search loop
+        self._offsets = graph.offsets.tolist()
+        self._targets = graph.targets.tolist()
+        self._seconds = graph.seconds.tolist()
+        self._metres = graph.metres.tolist()
+        self._lat = graph.lat.tolist()
+        self._lng = graph.lng.tolist()
+        speeds = graph.metres / np.maximum(graph.seconds, 1e-6)
+        self._max_speed_ms = float(speeds.max()) if len(speeds) else 1.0
+        cells = np.floor(np.stack([graph.lat, graph.lng], axis=1) / cell_degrees).astype(np.int64)
+        order = np.lexsort((cells[:, 1], cells[:, 0]))
+        self._grid: Dict[Tuple[int, int], np.ndarray] = {}
+        if len(order):
+            keys = cells[order]
+            splits = np.flatnonzero(np.any(np.diff(keys, axis=0) != 0, axis=1)) + 1
+            for group in np.split(order, splits):
+                self._grid[(int(cells[group[0], 0]), int(cells[group[0], 1]))] = group
+
+    def snap(self, lat: float, lng: float) -> Optional[Tuple[int, float]]:
+        """(node, metres) of the nearest graph node within ``max_snap_km``, or None."""
+        cy, cx = math.floor(lat / self.cell_degrees), math.floor(lng / self.cell_degrees)
+        reach = max(1, math.ceil(self.max_snap_km / (111.0 * self.cell_degrees * max(0.1, math.cos(math.radians(lat))))))
+        for ring in range(reach + 1):
+            groups = [
+                self._grid[(y, x)]
+                for y in range(cy - ring, cy + ring + 1)
+                for x in range(cx - ring, cx + ring + 1)
+                if max(abs(y - cy), abs(x - cx)) == ring and (y, x) in self._grid
+            ]
+            if not groups:
+                continue
+            # The nearest node in this ring may still lose to one a ring further out; check one more ring
+            candidates = np.concatenate(groups + [
+                self._grid[(y, x)]
+                for y in range(cy - ring - 1, cy + ring + 2)
+                for x in range(cx - ring - 1, cx + ring + 2)
+                if max(abs(y - cy), abs(x - cx)) == ring + 1 and (y, x) in self._grid
+            ])
+            metres = haversine_km_many(
+                lat, lng, self.graph.lat[candidates], self.graph.lng[candidates], approximate=True
+            ) * 1000
+            best = int(np.argmin(metres))
+            if metres[best] > self.max_snap_km * 1000:
+                return None
+            return int(candidates[best]), float(metres[best])
+        return None
+
+    def _search(self, source: int, goals: Dict[int, Tuple[float, float]]) -> Dict[int, Tuple[float, float]]:
+        """(seconds, metres) from ``source`` to each reachable goal node."""
+        offsets, targets, seconds, lengths = self._offsets, self._targets, self._seconds, self._metres
+        node_lat, node_lng = self._lat, self._lng
+        points = list(goals.values())
+        # Planar distance with longitude scaled by the cosine of the highest latitude involved
+        # (plus a degree of slack) never exceeds the great-circle distance near the query, and
+        # 1% off covers the rest. A fixed metric heuristic is consistent, so popped nodes are final
+        lng_scale = math.cos(math.radians(min(89.0, max(abs(lat) for lat, _ in points + [(node_lat[source], 0.0)]) + 1.0)))
+        to_seconds = 111195.0 * 0.99 / self._max_speed_ms
+
+        def heuristic(node: int) -> float:
+            lat, lng = node_lat[node], node_lng[node]
+            nearest = min((lat - g_lat) ** 2 + ((lng - g_lng) * lng_scale) ** 2 for g_lat, g_lng in points)
+            return math.sqrt(nearest) * to_seconds
+
+        remaining = set(goals)
+        found: Dict[int, Tuple[float, float]] = {}
+        best = {source: 0.0}
+        metres = {source: 0.0}
+        heap = [(heuristic(source), 0.0, source)]
+        while heap and remaining:
+            f, g, u = heapq.heappop(heap)
+            if f > self.max_seconds:
+                break
+            if g > best[u]:
+                continue
+            if u in remaining:
+                found[u] = (g, metres[u])
+                remaining.discard(u)
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                candidate = g + seconds[i]
+                if candidate < best.get(v, math.inf):
+                    best[v] = candidate
+                    metres[v] = metres[u] + lengths[i]
+                    heapq.heappush(heap, (candidate + heuristic(v), candidate, v))
+        return found
+
+    def travel_times(self, origin: Tuple[float, float], destinations: List[Tuple[float, float]]) -> List[Element]:
+        """Distance Matrix style elements from ``origin`` to each destination."""
+        start = self.snap(*origin)
+        if start is None:
+            return [{"status": "NOT_FOUND"} for _ in destinations]
+        access_ms = self.access_speed_kmh / 3.6
+        snapped = [self.snap(*destination) for destination in destinations]
+        goals = {s[0]: (self._lat[s[0]], self._lng[s[0]]) for s in snapped if s is not None}
+        reached = self._search(start[0], goals)
+
+        elements: List[Element] = []
+        for snap in snapped:
+            if snap is None:
+                elements.append({"status": "NOT_FOUND"})
+                continue
+            if snap[0] not in reached:
+                elements.append({"status": "ZERO_RESULTS"})
+                continue
+            seconds, metres = reached[snap[0]]
+            off_road = start[1] + snap[1]
+            metres += off_road
+            seconds += off_road / access_ms
+            elements.append({
+                "status": "OK",
+                "distance": {"text": _format_distance(metres), "value": int(round(metres))},
+                "duration": {"text": _format_duration(seconds), "value": int(round(seconds))},
+                "source": "offline",
+            })
+        return elements
+
+    @classmethod
+    def get(cls) -> Optional["RoadRouter"]:
+        """Process-wide router over ROAD_ROUTER_GRAPH_PATH (built by scripts/build_road_graph.py), or None when unset."""
+        global _router
+        if _router is None:
+            path = Config.get("ROAD_ROUTER_GRAPH_PATH")
+            if not path:
+                return None
+            graph = RoadGraph.load(path)
+            Logger.info(f"Loaded road graph with {graph.node_count} nodes and {graph.edge_count} edges from {path}")
+            _router = cls(
+                graph,
+                max_snap_km=Config.get_float("ROAD_ROUTER_MAX_SNAP_KM", 2.0),
+                access_speed_kmh=Config.get_float("ROAD_ROUTER_ACCESS_SPEED_KMH", 15.0),
+                max_seconds=Config.get_float("ROAD_ROUTER_MAX_SECONDS", 2 * 3600),
+            )
+        return _router
+
+
+_router: Optional[RoadRouter] = None
@@ -1,3 +1,4 @@
+from functools import lru_cache
 
 def _generate_random_id(length: int = 6) -> str:
     """Generate a random alphanumeric ID."""
@@ -21,19 +22,17 @@ def _get_date_and_time(dt_str: str) -> tuple[str, str]:
 def _get_current_time():
     """Internal: current datetime in Karachi timezone as ISO string."""
     from datetime import datetime
+    return datetime.now(_karachi_tz()).isoformat()
+
+@lru_cache(maxsize=1)
+def _karachi_tz():
+    """Internal: the Asia/Karachi tzinfo, loaded once (this runs for every agent prompt)."""
     import pytz
-    karachi_tz = pytz.timezone("Asia/Karachi")
-    return datetime.now(karachi_tz).isoformat()
+    return pytz.timezone("Asia/Karachi")
 
 
-def should_enable_degraded_mode(status) -> bool:
-    """
-    Decide whether degraded mode should be enabled based on
-    network and battery thresholds.
-    """
-    if status is None:
-        return False
-        
+def _read_device_status(status) -> tuple:
+    """Internal: (downlink, effective_type, rtt, battery level, charging) from a DeviceStatus model or dict."""
     # Handle both dict and Pydantic model objects
     if hasattr(status, 'connection'):
         # Pydantic model object
@@ -53,6 +52,18 @@ def should_enable_degraded_mode(status) -> bool:
         rtt = connection.get("rtt", 9999)              # ms
         level = battery.get("level", 100)              # %
         charging = battery.get("charging", False)
+    return downlink, effective_type, rtt, level, charging
+
+
+def should_enable_degraded_mode(status) -> bool:
+    """
+    Decide whether degraded mode should be enabled based on
+    network and battery thresholds.
+    """
+    if status is None:
+        return False
+
+    downlink, effective_type, rtt, level, charging = _read_device_status(status)
 
     # ---- Battery Rules ----
     if level < 10:
@@ -71,4 +82,24 @@ def should_enable_degraded_mode(status) -> bool:
         return True
 
     # ---- Default ----
-    return False
\ No newline at end of file
+    return False
+
+
+def is_constrained_device(status) -> bool:
+    """
+    Softer check than should_enable_degraded_mode: the device can still use
+    the full workflow, but a slow connection or low battery makes a faster
+    reply worth more than the strongest model.
+    """
+    if status is None:
+        return False
+
+    downlink, effective_type, rtt, level, charging = _read_device_status(status)
+
+    if level < 30 and not charging:
+        return True
+    if effective_type in ["slow-2g", "2g", "3g"]:
+        return True
+    if rtt > 150 or downlink < 5:
+        return True
+    return False
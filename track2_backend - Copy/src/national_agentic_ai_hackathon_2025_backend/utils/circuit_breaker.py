@@ -0,0 +1,223 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+from national_agentic_ai_hackathon_2025_backend.config import Config
+from national_agentic_ai_hackathon_2025_backend.utils.deadline import DeadlineExceeded
+from national_agentic_ai_hackathon_2025_backend.utils.metrics import Metrics
+from national_agentic_ai_hackathon_2025_backend._debug import Logger
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Per-dependency defaults; each can be overridden with BREAKER_<NAME>_<SETTING>
+BREAKER_DEFAULTS: Dict[str, Dict[str, float]] = {
+    "openai": {"slow_call_seconds": 20.0},
+    "supabase": {"slow_call_seconds": 3.0},
+    "google_maps": {"slow_call_seconds": 5.0},
+    "smtp": {"slow_call_seconds": 10.0, "min_calls": 3},
+}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose breaker is open."""
+
+    def __init__(self, name: str) -> None:
+        super().__init__(f"Circuit breaker '{name}' is open")
+        self.name = name
+
+
+class CircuitBreaker:
+    """
+    Rolling-window circuit breaker for one external dependency.
+
+    Every call is recorded with its outcome and duration. Once the window
+    holds at least ``min_calls`` calls and the failure rate or the slow-call
+    rate reaches its threshold, the breaker opens and calls fail fast with
+    CircuitOpenError. After ``open_seconds`` it lets ``half_open_calls``
+    probe calls through: a successful probe closes it, a failed one re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window_seconds: float = 60.0,
+        min_calls: int = 5,
+        failure_rate: float = 0.5,
+        slow_call_seconds: Optional[float] = None,
+        slow_call_rate: float = 0.8,
+        open_seconds: float = 30.0,
+        half_open_calls: int = 1,
+        is_failure: Callable[[BaseException], bool] = lambda e: True,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self.is_failure = is_failure
+        self.clock = clock
+
+        self._calls: deque = deque()  # (timestamp, failed, slow)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    # ---------- State ----------
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and self.clock() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    @property
+    def is_open(self) -> bool:
+        """True while calls are being rejected (half-open still lets probes through)."""
+        return self.state == OPEN
+
+    def allow(self) -> bool:
+        """Reserve permission for one call."""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and self._probes < self.half_open_calls:
+                self._probes += 1
+                return True
+        Metrics.increment(f"breaker.{self.name}.rejected")
+        return False
+
+    def record(self, seconds: float, error: Optional[BaseException] = None) -> None:
+        failed = error is not None and self.is_failure(error)
+        slow = self.slow_call_seconds is not None and seconds >= self.slow_call_seconds
+        with self._lock:
+            now = self.clock()
+            state = self._current_state()
+            if state == HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+                if failed or slow:
+                    self._trip(now)
+                else:
+                    self._reset()
+                return
+
+            self._calls.append((now, failed, slow))
+            self._prune(now)
+            if state == CLOSED and len(self._calls) >= self.min_calls:
+                failures = sum(1 for _, f, _ in self._calls if f)
+                slow_calls = sum(1 for _, _, s in self._calls if s)
+                if failures / len(self._calls) >= self.failure_rate or slow_calls / len(self._calls) >= self.slow_call_rate:
+                    self._trip(now)
+
+    def _release(self) -> None:
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+
+    def _trip(self, now: float) -> None:
+        if self._state != OPEN:
+            Logger.warning(f"Circuit breaker '{self.name}' opened")
+            Metrics.increment(f"breaker.{self.name}.opened")
+        self._state = OPEN
+        self._opened_at = now
+        self._probes = 0
+
+    def _reset(self) -> None:
+        Logger.success(f"Circuit breaker '{self.name}' closed")
+        self._state = CLOSED
+        self._calls.clear()
+        self._probes = 0
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        while self._calls and self._calls[0][0] < cutoff:
+            self._calls.popleft()
+
+    # ---------- Guarding calls ----------
+    @contextmanager
+    def guard(self):
+        """Run the enclosed call under the breaker; raises CircuitOpenError if it is open."""
+        if not self.allow():
+            raise CircuitOpenError(self.name)
+        start = time.perf_counter()
+        try:
+            yield
+        except DeadlineExceeded:
+            # Neither does running out of the caller's budget; don't count it as a failure or a slow call
+            self._release()
+            raise
+        except Exception as e:
+            self.record(time.perf_counter() - start, e)
+            raise
+        except BaseException:
+            # Cancellation says nothing about the dependency; just free the probe slot
+            self._release()
+            raise
+        self.record(time.perf_counter() - start)
+
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        with self.guard():
+            return func(*args, **kwargs)
+
+    async def call_async(self, func: Callable, *args, **kwargs) -> Any:
+        with self.guard():
+            return await func(*args, **kwargs)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            state = self._current_state()
+            self._prune(self.clock())
+            calls = len(self._calls)
+            failures = sum(1 for _, f, _ in self._calls if f)
+            slow_calls = sum(1 for _, _, s in self._calls if s)
+            return {
+                "state": state,
+                "calls_in_window": calls,
+                "failure_rate": round(failures / calls, 3) if calls else 0.0,
+                "slow_call_rate": round(slow_calls / calls, 3) if calls else 0.0,
+                "opened_seconds_ago": round(self.clock() - self._opened_at, 1) if state != CLOSED else None,
+            }
+
+    # ---------- Registry ----------
+    @classmethod
+    def get(cls, name: str, is_failure: Optional[Callable[[BaseException], bool]] = None) -> "CircuitBreaker":
+        """Return the process-wide breaker for a dependency, configured from BREAKER_<NAME>_* settings."""
+        breaker = _breakers.get(name)
+        if breaker is None:
+            defaults = BREAKER_DEFAULTS.get(name, {})
+            prefix = f"BREAKER_{name.upper()}_"
+            breaker = cls(
+                name,
+                window_seconds=Config.get_float(prefix + "WINDOW_SECONDS", defaults.get("window_seconds", 60.0)),
+                min_calls=Config.get_int(prefix + "MIN_CALLS", int(defaults.get("min_calls", 5))),
+                failure_rate=Config.get_float(prefix + "FAILURE_RATE", defaults.get("failure_rate", 0.5)),
+                slow_call_seconds=Config.get_float(prefix + "SLOW_CALL_SECONDS", defaults.get("slow_call_seconds", 10.0)),
+                slow_call_rate=Config.get_float(prefix + "SLOW_CALL_RATE", defaults.get("slow_call_rate", 0.8)),
+                open_seconds=Config.get_float(prefix + "OPEN_SECONDS", defaults.get("open_seconds", 30.0)),
+            )
+            _breakers[name] = breaker
+        if is_failure is not None:
+            breaker.is_failure = is_failure
+        return breaker
+
+    @classmethod
+    def snapshot_all(cls) -> Dict[str, Dict[str, Any]]:
+        """State of every breaker, including known dependencies not called yet."""
+        for name in BREAKER_DEFAULTS:
+            cls.get(name)
+        return {name: breaker.snapshot() for name, breaker in _breakers.items()}
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
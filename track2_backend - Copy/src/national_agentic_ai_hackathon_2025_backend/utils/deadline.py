@@ -0,0 +1,99 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Optional, TypeVar
+from national_agentic_ai_hackathon_2025_backend.config import Config
+from national_agentic_ai_hackathon_2025_backend.utils.metrics import Metrics
+
+T = TypeVar("T")
+
+DEFAULT_REQUEST_DEADLINE_SECONDS = 30.0
+
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """The request's time budget ran out before this step finished."""
+
+
+class Deadline:
+    """
+    Request deadline carried in a context variable.
+
+    The bot entry point opens a scope for the whole request and WorkFlow
+    narrows it per stage; nested scopes can only shorten the deadline.
+    Agent runs await through ``wait_for`` and blocking tools take their
+    timeout from ``timeout``, so nothing outlives the caller's budget.
+    """
+
+    @classmethod
+    @contextmanager
+    def scope(cls, seconds: Optional[float]):
+        """Limit the enclosed block to ``seconds`` (None or <= 0 keeps the current deadline)."""
+        current = _deadline.get()
+        deadline = current
+        if seconds is not None and seconds > 0:
+            candidate = time.monotonic() + seconds
+            deadline = candidate if current is None else min(current, candidate)
+        token = _deadline.set(deadline)
+        try:
+            yield deadline
+        finally:
+            try:
+                _deadline.reset(token)
+            except ValueError:
+                _deadline.set(current)
+
+    @classmethod
+    def for_request(cls):
+        """Scope for one inbound message, sized by REQUEST_DEADLINE_SECONDS."""
+        return cls.scope(Config.get_float("REQUEST_DEADLINE_SECONDS", DEFAULT_REQUEST_DEADLINE_SECONDS))
+
+    @classmethod
+    def for_route(cls, route: str):
+        """Scope for one workflow stage, sized by DEADLINE_<ROUTE>_SECONDS if set."""
+        return cls.scope(Config.get_float(f"DEADLINE_{route.upper()}_SECONDS", 0.0))
+
+    @classmethod
+    def remaining(cls) -> Optional[float]:
+        """Seconds left, or None when no deadline is set."""
+        deadline = _deadline.get()
+        if deadline is None:
+            return None
+        return deadline - time.monotonic()
+
+    @classmethod
+    def expired(cls) -> bool:
+        remaining = cls.remaining()
+        return remaining is not None and remaining <= 0
+
+    @classmethod
+    def timeout(cls, default: float) -> float:
+        """Timeout for a blocking call: ``default`` capped by the remaining budget."""
+        remaining = cls.remaining()
+        if remaining is None:
+            return default
+        if remaining <= 0:
+            raise DeadlineExceeded("Request deadline already passed")
+        return min(default, remaining)
+
+    @classmethod
+    async def wait_for(cls, awaitable: Awaitable[T], stage: str = "request") -> T:
+        """Await ``awaitable`` within the remaining budget, cancelling it when the budget runs out."""
+        remaining = cls.remaining()
+        if remaining is None:
+            return await awaitable
+        if remaining <= 0:
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+            Metrics.increment(f"deadline.exceeded.{stage}")
+            raise DeadlineExceeded(f"No time left for {stage}")
+        try:
+            return await asyncio.wait_for(awaitable, remaining)
+        except asyncio.TimeoutError:
+            if not cls.expired():
+                # A timeout raised by the awaited call itself, not ours
+                raise
+            Metrics.increment(f"deadline.exceeded.{stage}")
+            raise DeadlineExceeded(f"{stage} did not finish within {remaining:.1f}s") from None
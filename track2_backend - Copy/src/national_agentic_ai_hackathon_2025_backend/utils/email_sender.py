@@ -2,6 +2,7 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from national_agentic_ai_hackathon_2025_backend.config import Config
+from national_agentic_ai_hackathon_2025_backend.utils.circuit_breaker import CircuitBreaker
 from national_agentic_ai_hackathon_2025_backend._debug import Logger
 from typing import List, Optional
 
@@ -30,10 +31,16 @@ def send_email(receiver_email: str, subject: str, body: str) -> bool:
 
     # Send the email
     try:
-        with smtplib.SMTP("smtp.gmail.com", 587) as server:
-            server.starttls()
-            server.login(sender_email, app_password)
-            server.sendmail(sender_email, receiver_email, message.as_string())
+        with CircuitBreaker.get("smtp").guard():
+            with smtplib.SMTP(
+                Config.get("SMTP_HOST") or "smtp.gmail.com",
+                Config.get_int("SMTP_PORT", 587),
+                timeout=Config.get_float("SMTP_TIMEOUT_SECONDS", 10.0),
+            ) as server:
+                if Config.get_bool("SMTP_STARTTLS", True):
+                    server.starttls()
+                server.login(sender_email, app_password)
+                server.sendmail(sender_email, receiver_email, message.as_string())
         Logger.success("✅ Email sent successfully!")
         return True
     except Exception as e:
@@ -0,0 +1,87 @@
+import math
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = EARTH_RADIUS_KM * math.pi / 180
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two points in kilometres."""
+    dlat = math.radians(lat2 - lat1)
+    dlng = math.radians(lng2 - lng1)
+    a = math.sin(dlat / 2) ** 2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(1.0, a)))
+
+
+def haversine_km_radians(
+    lat: Union[float, np.ndarray],
+    lng: Union[float, np.ndarray],
+    lats: np.ndarray,
+    lngs: np.ndarray,
+    cos_lats: Optional[np.ndarray] = None,
+    approximate: bool = False,
+) -> np.ndarray:
+    """
+    Distances in kilometres from one origin (scalars) or m origins (1-d
+    arrays, giving an m x n result) to n points, all in radians. Pass
+    ``cos_lats`` when the points are queried repeatedly. ``approximate``
+    projects onto a plane scaled by cos(origin latitude): no trigonometry
+    per point, within 0.1% of the great-circle distance across a city but
+    off by ~2% over a thousand kilometres, so it is for coarse
+    pre-filtering, not final ranking.
+    """
+    if np.ndim(lat):
+        lat = np.asarray(lat, dtype=np.float64)[:, None]
+        lng = np.asarray(lng, dtype=np.float64)[:, None]
+    dlat = lats - lat
+    dlng = lngs - lng
+    if approximate:
+        # Take the short way round so the antimeridian is not 2 pi wide
+        dlng = np.abs(dlng)
+        x = np.minimum(dlng, 2 * np.pi - dlng) * np.cos(lat)
+        return EARTH_RADIUS_KM * np.sqrt(x * x + dlat * dlat)
+    if cos_lats is None:
+        cos_lats = np.cos(lats)
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat) * cos_lats * np.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def haversine_km_many(
+    lat: Union[float, np.ndarray],
+    lng: Union[float, np.ndarray],
+    lats: np.ndarray,
+    lngs: np.ndarray,
+    approximate: bool = False,
+) -> np.ndarray:
+    """:func:`haversine_km_radians` for coordinates in degrees."""
+    return haversine_km_radians(
+        np.radians(lat), np.radians(lng),
+        np.radians(np.asarray(lats, dtype=np.float64)), np.radians(np.asarray(lngs, dtype=np.float64)),
+        approximate=approximate,
+    )
+
+
+def parse_point(text: str) -> Optional[Tuple[float, float]]:
+    """(lat, lng) from a "lat,lng" string, or None if it is an address or out of range."""
+    parts = text.split(",")
+    if len(parts) != 2:
+        return None
+    try:
+        lat, lng = float(parts[0]), float(parts[1])
+    except ValueError:
+        return None
+    if not (-90.0 <= lat <= 90.0 and -180.0 <= lng <= 180.0):
+        return None
+    return lat, lng
+
+
+def bounding_box_offsets(latitude: float, radius_km: float) -> Tuple[float, float]:
+    """(lat, lng) half-widths in degrees of a box containing every point within ``radius_km``."""
+    lat_offset = radius_km / KM_PER_DEGREE
+    # A degree of longitude shrinks with cos(latitude); use the box edge nearest the pole
+    cos_lat = math.cos(math.radians(min(90.0, abs(latitude) + lat_offset)))
+    if cos_lat < 1e-6:
+        return lat_offset, 180.0
+    return lat_offset, min(180.0, radius_km / (KM_PER_DEGREE * cos_lat))
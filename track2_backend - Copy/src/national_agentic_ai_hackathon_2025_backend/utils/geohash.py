@@ -0,0 +1,46 @@
+from typing import Tuple
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def encode(lat: float, lng: float, precision: int = 7) -> str:
+    """
+    Geohash of a coordinate with ``precision`` characters. Nearby points share
+    a prefix; a 7-character cell is about 153 m x 153 m at the equator, 6 is
+    about 1.2 km x 0.6 km, 8 is about 38 m x 19 m.
+    """
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bits, value, even = 0, 0, True
+    while len(chars) < precision:
+        interval, coordinate = (lng_range, lng) if even else (lat_range, lat)
+        mid = (interval[0] + interval[1]) / 2
+        if coordinate >= mid:
+            value = (value << 1) | 1
+            interval[0] = mid
+        else:
+            value <<= 1
+            interval[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+
+def decode(geohash: str) -> Tuple[float, float]:
+    """Centre (lat, lng) of a geohash cell."""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        value = _BASE32.index(char)
+        for shift in range(4, -1, -1):
+            interval = lng_range if even else lat_range
+            mid = (interval[0] + interval[1]) / 2
+            if value >> shift & 1:
+                interval[0] = mid
+            else:
+                interval[1] = mid
+            even = not even
+    return (lat_range[0] + lat_range[1]) / 2, (lng_range[0] + lng_range[1]) / 2
@@ -0,0 +1,119 @@
+import random
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict
+
+
+class Metrics:
+    """Process-local counters and latency histograms."""
+
+    # Upper bounds (milliseconds) of the latency histogram buckets
+    LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+    # Raw observations kept per stage (uniform reservoir sample) for percentiles
+    RESERVOIR_SIZE = 2048
+
+    _random = random.Random(0)
+
+    _counters: Dict[str, float] = defaultdict(float)
+    _timings: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def increment(cls, name: str, value: float = 1) -> None:
+        """Add value to the named counter."""
+        cls._counters[name] += value
+
+    @classmethod
+    def observe(cls, name: str, seconds: float) -> None:
+        """Record one latency observation (in seconds) for the named stage."""
+        ms = seconds * 1000
+        timing = cls._timings.get(name)
+        if timing is None:
+            timing = {
+                "count": 0,
+                "total_ms": 0.0,
+                "min_ms": ms,
+                "max_ms": ms,
+                "buckets": [0] * (len(cls.LATENCY_BUCKETS_MS) + 1),
+                "samples": [],
+            }
+            cls._timings[name] = timing
+
+        timing["count"] += 1
+        timing["total_ms"] += ms
+        timing["min_ms"] = min(timing["min_ms"], ms)
+        timing["max_ms"] = max(timing["max_ms"], ms)
+        if len(timing["samples"]) < cls.RESERVOIR_SIZE:
+            timing["samples"].append(ms)
+        else:
+            slot = cls._random.randrange(timing["count"])
+            if slot < cls.RESERVOIR_SIZE:
+                timing["samples"][slot] = ms
+        for index, bound in enumerate(cls.LATENCY_BUCKETS_MS):
+            if ms <= bound:
+                timing["buckets"][index] += 1
+                break
+        else:
+            timing["buckets"][-1] += 1
+
+    @classmethod
+    @contextmanager
+    def timer(cls, name: str):
+        """Time the wrapped block; only successful completions are observed."""
+        start = time.perf_counter()
+        yield
+        cls.observe(name, time.perf_counter() - start)
+
+    @classmethod
+    def record_usage(cls, name: str, usage) -> None:
+        """Accumulate token usage (agents SDK ``Usage``) under the given prefix."""
+        if usage is None:
+            return
+        cls.increment(f"{name}.requests", getattr(usage, "requests", 0) or 0)
+        cls.increment(f"{name}.input_tokens", getattr(usage, "input_tokens", 0) or 0)
+        cls.increment(f"{name}.output_tokens", getattr(usage, "output_tokens", 0) or 0)
+        cls.increment(f"{name}.total_tokens", getattr(usage, "total_tokens", 0) or 0)
+        details = getattr(usage, "input_tokens_details", None)
+        cls.increment(f"{name}.cached_tokens", getattr(details, "cached_tokens", 0) or 0)
+
+    @classmethod
+    def get_counter(cls, name: str) -> float:
+        return cls._counters.get(name, 0)
+
+    @classmethod
+    def percentile(cls, name: str, fraction: float) -> float:
+        """
+        Latency percentile (ms), interpolated between the stage's sampled
+        observations: exact up to RESERVOIR_SIZE observations, a uniform
+        sample of them beyond that.
+        """
+        timing = cls._timings.get(name)
+        if not timing or not timing["samples"]:
+            return 0.0
+        ordered = sorted(timing["samples"])
+        position = fraction * (len(ordered) - 1)
+        lower = int(position)
+        upper = min(lower + 1, len(ordered) - 1)
+        return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+    @classmethod
+    def snapshot(cls) -> Dict[str, Any]:
+        """Return a JSON-serialisable copy of all counters and timings."""
+        timings = {}
+        for name, timing in cls._timings.items():
+            timings[name] = {
+                "count": timing["count"],
+                "avg_ms": round(timing["total_ms"] / timing["count"], 2) if timing["count"] else 0.0,
+                "min_ms": round(timing["min_ms"], 2),
+                "max_ms": round(timing["max_ms"], 2),
+                "p50_ms": round(cls.percentile(name, 0.50), 2),
+                "p95_ms": round(cls.percentile(name, 0.95), 2),
+                "p99_ms": round(cls.percentile(name, 0.99), 2),
+                "buckets": dict(zip([*map(str, cls.LATENCY_BUCKETS_MS), "inf"], timing["buckets"])),
+            }
+        return {"counters": dict(cls._counters), "timings": timings}
+
+    @classmethod
+    def reset(cls) -> None:
+        cls._counters.clear()
+        cls._timings.clear()
@@ -0,0 +1,48 @@
+import math
+import re
+import zlib
+from typing import Dict, Iterable
+
+_PUNCTUATION = re.compile(r"[^\w\s]+", re.UNICODE)
+_WHITESPACE = re.compile(r"\s+")
+_REPEATED_CHARS = re.compile(r"(.)\1{2,}")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, drop punctuation, squash repeated letters ("helppp") and whitespace."""
+    text = (text or "").lower()
+    text = _PUNCTUATION.sub(" ", text)
+    text = _REPEATED_CHARS.sub(r"\1\1", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def char_ngrams(text: str, n_min: int = 2, n_max: int = 4) -> Iterable[str]:
+    """Yield character n-grams of each word, padded with word boundaries."""
+    for word in text.split():
+        padded = f" {word} "
+        for n in range(n_min, n_max + 1):
+            for i in range(len(padded) - n + 1):
+                yield padded[i:i + n]
+
+
+def hashed_features(text: str, dim: int = 2 ** 14, n_min: int = 2, n_max: int = 4) -> Dict[int, float]:
+    """
+    Sparse, L2-normalised bag of hashed character n-grams for an already
+    normalised string. crc32 keeps indices stable across processes.
+    """
+    features: Dict[int, float] = {}
+    for gram in char_ngrams(text, n_min, n_max):
+        index = zlib.crc32(gram.encode("utf-8")) % dim
+        features[index] = features.get(index, 0.0) + 1.0
+    norm = math.sqrt(sum(v * v for v in features.values()))
+    if norm:
+        for index in features:
+            features[index] /= norm
+    return features
+
+
+def sparse_dot(a: Dict[int, float], b: Dict[int, float]) -> float:
+    """Dot product of two sparse vectors (cosine similarity for normalised inputs)."""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(value * b.get(index, 0.0) for index, value in a.items())
@@ -0,0 +1,249 @@
+import asyncio
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+from national_agentic_ai_hackathon_2025_backend.config import Config
+from national_agentic_ai_hackathon_2025_backend.utils.metrics import Metrics
+from national_agentic_ai_hackathon_2025_backend._debug import Logger
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_time: float
+    duration_ms: float = 0.0
+    status: str = "ok"
+    error: Optional[str] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": round(self.start_time, 6),
+            "duration_ms": round(self.duration_ms, 2),
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+@dataclass
+class Trace:
+    trace_id: str
+    request_id: str
+    spans: List[Span] = field(default_factory=list)
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        root = self.spans[-1] if self.spans else None
+        return {
+            "trace_id": self.trace_id,
+            "request_id": self.request_id,
+            "name": root.name if root else None,
+            "duration_ms": round(root.duration_ms, 2) if root else 0.0,
+            "status": root.status if root else None,
+            "attributes": self.attributes,
+            "spans": [span.to_dict() for span in sorted(self.spans, key=lambda s: s.start_time)],
+        }
+
+
+class InMemoryExporter:
+    """Keeps the most recent finished traces in a ring buffer."""
+
+    def __init__(self, capacity: int = 200) -> None:
+        self._traces: deque = deque(maxlen=capacity)
+
+    def export(self, trace: Dict[str, Any]) -> None:
+        self._traces.append(trace)
+
+    def recent(self, limit: int = 50) -> List[Dict[str, Any]]:
+        return list(self._traces)[-limit:][::-1]
+
+    def find(self, trace_id: str) -> Optional[Dict[str, Any]]:
+        for trace in self._traces:
+            if trace_id in (trace["trace_id"], trace["request_id"]):
+                return trace
+        return None
+
+
+class JsonLinesExporter(InMemoryExporter):
+    """Appends each finished trace to a JSON lines file (and keeps a ring buffer for /internal/traces)."""
+
+    def __init__(self, path: str, capacity: int = 200) -> None:
+        super().__init__(capacity)
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def export(self, trace: Dict[str, Any]) -> None:
+        super().export(trace)
+        line = json.dumps(trace, default=str)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+class NullExporter:
+    def export(self, trace: Dict[str, Any]) -> None:
+        pass
+
+    def recent(self, limit: int = 50) -> List[Dict[str, Any]]:
+        return []
+
+    def find(self, trace_id: str) -> Optional[Dict[str, Any]]:
+        return None
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def _reset(var: ContextVar, token, previous) -> None:
+    # An async generator closed from another task (e.g. a dropped stream) runs
+    # its cleanup in a different Context, where the token cannot be used.
+    try:
+        var.reset(token)
+    except ValueError:
+        var.set(previous)
+
+
+class Tracer:
+    """
+    Span-based request tracing.
+
+    ``trace`` opens the root span for one inbound message and ``span`` /
+    ``traced`` open child spans; the active span is tracked in a context
+    variable so it follows the request across awaits and tasks. Every span's
+    duration is observed as ``span.<name>`` in Metrics, and each finished
+    trace is handed to the configured exporter.
+    """
+
+    @classmethod
+    @contextmanager
+    def trace(cls, name: str, request_id: Optional[str] = None, **attributes):
+        """Open the root span for one request. Nested calls just open a child span."""
+        if _current_trace.get() is not None:
+            with cls.span(name, **attributes) as span:
+                yield span
+            return
+
+        trace = Trace(trace_id=uuid.uuid4().hex, request_id=request_id or uuid.uuid4().hex[:12])
+        trace_token = _current_trace.set(trace)
+        try:
+            with cls.span(name, **attributes) as span:
+                yield span
+        finally:
+            _reset(_current_trace, trace_token, None)
+            try:
+                cls.get_exporter().export(trace.to_dict())
+            except Exception as e:
+                Logger.error(f"{__name__}> trace -> Failed to export trace {trace.trace_id}: {e}")
+
+    @classmethod
+    @contextmanager
+    def span(cls, name: str, **attributes):
+        """Time the wrapped block as a span of the current trace and record its outcome."""
+        trace = _current_trace.get()
+        parent = _current_span.get()
+        span = Span(
+            name=name,
+            trace_id=trace.trace_id if trace else "",
+            span_id=uuid.uuid4().hex[:16],
+            parent_id=parent.span_id if parent else None,
+            start_time=time.time(),
+            attributes=attributes,
+        )
+        span_token = _current_span.set(span)
+        start = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "cancelled" if isinstance(e, (GeneratorExit, asyncio.CancelledError)) else "error"
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _reset(_current_span, span_token, parent)
+            elapsed = time.perf_counter() - start
+            span.duration_ms = elapsed * 1000
+            Metrics.observe(f"span.{name}", elapsed)
+            if span.status != "ok":
+                Metrics.increment(f"span.{name}.{span.status}")
+            if trace is not None:
+                trace.spans.append(span)
+
+    @classmethod
+    def traced(cls, name: Optional[str] = None) -> Callable:
+        """Decorator that runs a sync or async function inside a span (default name: its qualified name)."""
+        def decorator(func: Callable) -> Callable:
+            span_name = name or func.__qualname__
+
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    with cls.span(span_name):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with cls.span(span_name):
+                    return func(*args, **kwargs)
+            return wrapper
+
+        return decorator
+
+    @classmethod
+    def annotate(cls, **attributes) -> None:
+        """Attach attributes to the current span."""
+        span = _current_span.get()
+        if span is not None:
+            span.attributes.update(attributes)
+
+    @classmethod
+    def annotate_trace(cls, **attributes) -> None:
+        """Attach attributes (e.g. case_id, route) to the whole trace."""
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.attributes.update(attributes)
+
+    @classmethod
+    def current_request_id(cls) -> Optional[str]:
+        trace = _current_trace.get()
+        return trace.request_id if trace else None
+
+    @classmethod
+    def get_exporter(cls):
+        """Return the process-wide exporter configured by TRACE_EXPORTER (memory, jsonl or none)."""
+        global _exporter
+        if _exporter is None:
+            kind = Config.get("TRACE_EXPORTER", "memory").lower()
+            capacity = Config.get_int("TRACE_BUFFER_SIZE", 200)
+            if kind == "jsonl":
+                _exporter = JsonLinesExporter(Config.get("TRACE_FILE", "traces.jsonl"), capacity)
+            elif kind == "none":
+                _exporter = NullExporter()
+            else:
+                _exporter = InMemoryExporter(capacity)
+        return _exporter
+
+    @classmethod
+    def set_exporter(cls, exporter) -> None:
+        global _exporter
+        _exporter = exporter
+
+
+_exporter = None
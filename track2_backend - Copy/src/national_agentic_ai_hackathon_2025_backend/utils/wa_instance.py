@@ -7,6 +7,30 @@ from national_agentic_ai_hackathon_2025_backend._debug import Logger
 # Global variable to hold the WhatsApp instance
 wa = None
 
+
+class _BaseURLTransport(httpx.AsyncBaseTransport):
+    """Sends every Graph API request to another host (a local stand-in in load tests)."""
+
+    def __init__(self, base_url: str) -> None:
+        self.base_url = httpx.URL(base_url)
+        self.inner = httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        request.url = request.url.copy_with(scheme=self.base_url.scheme, host=self.base_url.host, port=self.base_url.port)
+        return await self.inner.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+
+def _graph_api_session():
+    """HTTP session for pywa; WHATSAPP_API_BASE_URL replaces graph.facebook.com when set."""
+    base_url = Config.get("WHATSAPP_API_BASE_URL")
+    if not base_url:
+        return None
+    Logger.warning(f"WhatsApp Cloud API requests go to {base_url}")
+    return httpx.AsyncClient(transport=_BaseURLTransport(base_url))
+
 def create_wa_instance():
     """Create a new WhatsApp instance with current config values"""
     global wa
@@ -34,7 +58,7 @@ def create_wa_instance():
             webhook_endpoint="/webhook",
             webhook_challenge_delay=30,
             skip_duplicate_updates=True,
-            # session=httpx.Client()
+            session=_graph_api_session(),
         )
     except Exception as e:
         Logger.error(f"Error creating WhatsApp instance: {e}")